@@ -0,0 +1,218 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Processes in the shared edge-scanning pool; a run never uses more than this many
+POOL_WORKERS = os.cpu_count() or 1
+
+# Pooled runs allowed at once; each run holds shared-memory copies of its arrays while it waits
+MAX_POOLED_RUNS = 2
+
+# Shared-memory arrays attached by a worker process, keyed by run (its tuple of block names)
+_attached = OrderedDict()
+
+# Process pool shared by every pooled run, started on first use
+_executor = None
+_executor_lock = threading.Lock()
+_pooled_runs = threading.BoundedSemaphore(MAX_POOLED_RUNS)
+
+
+def shared_executor():
+    """The module-level edge-scanning process pool, started on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+        return _executor
+
+
+def shutdown_executor():
+    """Stop the shared process pool; the next pooled run starts a fresh one"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def cheapest_outgoing(components, sources, targets, weights, lo, hi):
+    """
+    Cheapest edge leaving each component among edge rows lo..hi-1.
+
+    Ties are broken by row so every component agrees on one total order of
+    the edges, which keeps the rounds free of cycles.
+
+    Args:
+        components: component label of every dense node
+        sources, targets: dense endpoints of every edge
+        weights: weight of every edge
+        lo, hi: row range to scan
+
+    Returns:
+        (labels, rows, weights): one entry per component with an outgoing edge in the range
+    """
+    cu = components[sources[lo:hi]]
+    cv = components[targets[lo:hi]]
+    crossing = np.flatnonzero(cu != cv)
+    rows = crossing + lo
+    labels = np.concatenate([cu[crossing], cv[crossing]])
+    rows = np.concatenate([rows, rows])
+    row_weights = weights[rows]
+    return _first_per_label(labels, rows, row_weights)
+
+
+def _first_per_label(labels, rows, row_weights):
+    """Keep the lightest (weight, row) candidate for each label"""
+    order = np.lexsort((rows, row_weights, labels))
+    labels = labels[order]
+    first = np.ones(len(labels), dtype=bool)
+    first[1:] = labels[1:] != labels[:-1]
+    keep = order[first]
+    return labels[first], rows[keep], row_weights[keep]
+
+
+def _attach_run(names, num_edges, num_nodes):
+    """
+    (sources, targets, weights, components) views of a run's shared-memory blocks.
+
+    Pool processes outlive runs, so only the blocks of the MAX_POOLED_RUNS most
+    recently seen runs stay attached; older ones are closed here.
+    """
+    run = _attached.get(names)
+    if run is None:
+        blocks = [shared_memory.SharedMemory(name=name) for name in names]
+        dtypes = (np.int64, np.int64, np.float64, np.int64)
+        counts = (num_edges, num_edges, num_edges, num_nodes)
+        arrays = [np.ndarray(count, dtype=dtype, buffer=shm.buf)
+                  for shm, dtype, count in zip(blocks, dtypes, counts)]
+        run = _attached[names] = (blocks, arrays)
+        while len(_attached) > MAX_POOLED_RUNS:
+            stale_blocks, stale_arrays = _attached.popitem(last=False)[1]
+            del stale_arrays[:]
+            for shm in stale_blocks:
+                shm.close()
+    _attached.move_to_end(names)
+    return run[1]
+
+
+def _chunk_cheapest(names, num_edges, num_nodes, lo, hi):
+    """Worker entry point: cheapest_outgoing over shared-memory arrays"""
+    sources, targets, weights, components = _attach_run(names, num_edges, num_nodes)
+    return cheapest_outgoing(components, sources, targets, weights, lo, hi)
+
+
+def _shared_copy(array, blocks):
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    blocks.append(shm)
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    shared[:] = array
+    return shm.name, shared
+
+
+def _find(parent, x):
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+
+def boruvka_rounds(sources, targets, weights, num_nodes, workers=1, chunk_size=None):
+    """
+    Boruvka's algorithm over dense node indices, one round at a time.
+
+    Each round every component picks its cheapest outgoing edge; the edge
+    rows are scanned in chunks, in the shared process pool over shared-memory
+    copies of the arrays when workers > 1. The pool is started once and reused
+    across calls, and at most MAX_POOLED_RUNS calls use it at a time (further
+    callers wait for a slot). The picked edges are then contracted and the
+    next round starts from the merged components.
+
+    Args:
+        sources, targets: dense endpoints (0..num_nodes-1) of every edge
+        weights: weight of every edge
+        num_nodes: number of dense nodes
+        workers: edge chunks scanned in parallel per round, capped at
+            POOL_WORKERS; 1 scans in this process
+        chunk_size: edges per task (default: split evenly across workers)
+
+    Yields:
+        rows: array of edge rows added to the spanning forest in that round
+    """
+    sources = np.ascontiguousarray(sources, dtype=np.int64)
+    targets = np.ascontiguousarray(targets, dtype=np.int64)
+    weights = np.ascontiguousarray(weights, dtype=np.float64)
+    num_edges = len(weights)
+    workers = min(workers, POOL_WORKERS)
+    if chunk_size is None:
+        chunk_size = max(1, -(-num_edges // max(1, workers)))
+    bounds = [(lo, min(lo + chunk_size, num_edges)) for lo in range(0, num_edges, chunk_size)]
+
+    blocks = []
+    executor = None
+    pooled = workers > 1 and num_edges > 0
+    if pooled:
+        _pooled_runs.acquire()
+    try:
+        if pooled:
+            names = []
+            for array in (sources, targets, weights):
+                name, _ = _shared_copy(array, blocks)
+                names.append(name)
+            component_name, components = _shared_copy(np.arange(num_nodes, dtype=np.int64), blocks)
+            names = tuple(names) + (component_name,)
+            executor = shared_executor()
+        else:
+            components = np.arange(num_nodes, dtype=np.int64)
+
+        parent = list(range(num_nodes))
+        while True:
+            if executor is not None:
+                futures = [executor.submit(_chunk_cheapest, names, num_edges, num_nodes, lo, hi)
+                           for lo, hi in bounds]
+                parts = [future.result() for future in futures]
+            else:
+                parts = [cheapest_outgoing(components, sources, targets, weights, lo, hi)
+                         for lo, hi in bounds]
+
+            if not parts or not any(len(labels) for labels, _, _ in parts):
+                break
+            labels, rows, _ = _first_per_label(*(np.concatenate(column) for column in zip(*parts)))
+
+            # Contract: both components of a shared pick choose the same row, so dedupe first
+            added = []
+            for row in np.unique(rows).tolist():
+                root_u = _find(parent, int(components[sources[row]]))
+                root_v = _find(parent, int(components[targets[row]]))
+                if root_u != root_v:
+                    parent[root_v] = root_u
+                    added.append(row)
+
+            relabel = np.arange(num_nodes, dtype=np.int64)
+            for label in labels.tolist():
+                relabel[label] = _find(parent, label)
+            components[:] = relabel[components]
+
+            yield np.array(added, dtype=np.int64)
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+        if pooled:
+            _pooled_runs.release()
+
+
+def boruvka_mst(sources, targets, weights, num_nodes, workers=1, chunk_size=None):
+    """
+    Minimum spanning forest by Boruvka's algorithm.
+
+    Returns:
+        rows: edge rows of the spanning forest, in the order they were added
+    """
+    rounds = list(boruvka_rounds(sources, targets, weights, num_nodes, workers, chunk_size))
+    if not rounds:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(rounds)
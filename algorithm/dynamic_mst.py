@@ -0,0 +1,385 @@
+NEGATIVE_INFINITY = float('-inf')
+
+
+class LinkCutTree:
+    """
+    Link-cut tree over integer node slots with path-maximum queries.
+
+    Every node carries a weight; path_max(x, y) returns the slot holding the
+    largest weight on the tree path between x and y. MST edges are stored as
+    their own slots between their two endpoint vertices, and vertices carry
+    -inf, so a path maximum is always an edge.
+    """
+    def __init__(self):
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.flip = []
+        self.weight = []
+        self.best = []
+
+    def add_node(self, weight=NEGATIVE_INFINITY):
+        """Create an isolated node and return its slot"""
+        slot = len(self.weight)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.flip.append(False)
+        self.weight.append(weight)
+        self.best.append(slot)
+        return slot
+
+    def set_weight(self, x, weight):
+        """Change a node's weight and refresh the aggregates above it"""
+        self._access(x)
+        self.weight[x] = weight
+        self._update(x)
+
+    def _is_splay_root(self, x):
+        p = self.parent[x]
+        return p < 0 or (self.left[p] != x and self.right[p] != x)
+
+    def _push(self, x):
+        if self.flip[x]:
+            self.left[x], self.right[x] = self.right[x], self.left[x]
+            for child in (self.left[x], self.right[x]):
+                if child >= 0:
+                    self.flip[child] = not self.flip[child]
+            self.flip[x] = False
+
+    def _update(self, x):
+        weight, best = self.weight, self.best
+        top = x
+        for child in (self.left[x], self.right[x]):
+            if child >= 0 and weight[best[child]] > weight[top]:
+                top = best[child]
+        best[x] = top
+
+    def _rotate(self, x):
+        left, right, parent = self.left, self.right, self.parent
+        p = parent[x]
+        g = parent[p]
+        if not self._is_splay_root(p):
+            if left[g] == p:
+                left[g] = x
+            else:
+                right[g] = x
+        parent[x] = g
+
+        if left[p] == x:
+            left[p] = right[x]
+            if right[x] >= 0:
+                parent[right[x]] = p
+            right[x] = p
+        else:
+            right[p] = left[x]
+            if left[x] >= 0:
+                parent[left[x]] = p
+            left[x] = p
+        parent[p] = x
+        self._update(p)
+        self._update(x)
+
+    def _splay(self, x):
+        # Push pending flips from the splay root down to x before rotating
+        path = [x]
+        while not self._is_splay_root(path[-1]):
+            path.append(self.parent[path[-1]])
+        for node in reversed(path):
+            self._push(node)
+
+        while not self._is_splay_root(x):
+            p = self.parent[x]
+            if not self._is_splay_root(p):
+                g = self.parent[p]
+                if (self.left[g] == p) == (self.left[p] == x):
+                    self._rotate(p)
+                else:
+                    self._rotate(x)
+            self._rotate(x)
+
+    def _access(self, x):
+        last = -1
+        y = x
+        while y >= 0:
+            self._splay(y)
+            self.right[y] = last
+            self._update(y)
+            last = y
+            y = self.parent[y]
+        self._splay(x)
+
+    def make_root(self, x):
+        """Re-root x's represented tree at x"""
+        self._access(x)
+        self.flip[x] = not self.flip[x]
+
+    def find_root(self, x):
+        """Root of the represented tree containing x"""
+        self._access(x)
+        while True:
+            self._push(x)
+            if self.left[x] < 0:
+                break
+            x = self.left[x]
+        self._splay(x)
+        return x
+
+    def connected(self, x, y):
+        return x == y or self.find_root(x) == self.find_root(y)
+
+    def link(self, x, y):
+        """Add a tree edge between x and y, which must be in different trees"""
+        self.make_root(x)
+        self.parent[x] = y
+
+    def cut(self, x, y):
+        """Remove the tree edge between adjacent nodes x and y"""
+        self.make_root(x)
+        self._access(y)
+        self.left[y] = -1
+        self.parent[x] = -1
+        self._update(y)
+
+    def path_max(self, x, y):
+        """Slot with the largest weight on the path between connected nodes x and y"""
+        self.make_root(x)
+        self._access(y)
+        return self.best[y]
+
+
+class DynamicMST:
+    """
+    Minimum spanning forest maintained under edge insertions, weight updates
+    and deletions.
+
+    Tree edges live in a link-cut tree, so an insertion or a weight decrease
+    costs amortized O(log V): the new edge replaces the heaviest edge on the
+    cycle it closes (cycle property) when it is lighter. Removing a tree edge
+    (deletion or weight increase) needs the lightest replacement edge across
+    the cut. Tree and non-tree edges are indexed by endpoint, so the two sides
+    of the cut are explored in lockstep until the smaller one is exhausted and
+    only the non-tree edges incident to it are examined: O(S + its non-tree
+    degree) for a smaller side of S vertices, rather than a scan of every
+    non-tree edge. (Polylogarithmic deletion, as in Holm et al., needs a
+    level structure that this class does not maintain.)
+    """
+    def __init__(self, edges, mst_edge_ids):
+        """
+        Args:
+            edges: iterable of (edge_id, source, target, weight) for the whole graph
+            mst_edge_ids: ids of the edges forming the initial spanning forest
+        """
+        self.tree = LinkCutTree()
+        self.vertex_slot = {}
+        self.edges = {}
+        self.edge_slot = {}
+        self.slot_edge = {}
+        self.tree_adjacency = {}
+        self.non_tree_adjacency = {}
+        self.total_weight = 0
+        self.next_edge_id = 0
+
+        tree_ids = set(mst_edge_ids)
+        for edge_id, source, target, weight in edges:
+            self.edges[edge_id] = (source, target, weight)
+            self.next_edge_id = max(self.next_edge_id, edge_id + 1)
+            if edge_id in tree_ids and self._can_link(source, target):
+                self._link_edge(edge_id)
+            else:
+                self._add_non_tree(edge_id)
+
+    def _vertex(self, node_id):
+        slot = self.vertex_slot.get(node_id)
+        if slot is None:
+            slot = self.tree.add_node()
+            self.vertex_slot[node_id] = slot
+        return slot
+
+    def _can_link(self, source, target):
+        return source != target and not self.tree.connected(self._vertex(source), self._vertex(target))
+
+    def _link_edge(self, edge_id):
+        source, target, weight = self.edges[edge_id]
+        slot = self.tree.add_node(weight)
+        self.edge_slot[edge_id] = slot
+        self.slot_edge[slot] = edge_id
+        self.tree.link(slot, self._vertex(source))
+        self.tree.link(slot, self._vertex(target))
+        self._index(self.tree_adjacency, edge_id)
+        self.total_weight += weight
+
+    def _cut_edge(self, edge_id):
+        source, target, weight = self.edges[edge_id]
+        slot = self.edge_slot.pop(edge_id)
+        del self.slot_edge[slot]
+        self.tree.cut(slot, self._vertex(source))
+        self.tree.cut(slot, self._vertex(target))
+        self._unindex(self.tree_adjacency, edge_id)
+        self.total_weight -= weight
+
+    def _index(self, adjacency, edge_id):
+        source, target, _ = self.edges[edge_id]
+        adjacency.setdefault(source, set()).add(edge_id)
+        adjacency.setdefault(target, set()).add(edge_id)
+
+    def _unindex(self, adjacency, edge_id):
+        source, target, _ = self.edges[edge_id]
+        for node_id in (source, target):
+            incident = adjacency[node_id]
+            incident.discard(edge_id)
+            if not incident:
+                del adjacency[node_id]
+
+    def _add_non_tree(self, edge_id):
+        self._index(self.non_tree_adjacency, edge_id)
+
+    def _remove_non_tree(self, edge_id):
+        self._unindex(self.non_tree_adjacency, edge_id)
+
+    def _tree_vertices(self, node_id):
+        """Generator walking the forest from node_id, yielding each reached vertex once"""
+        seen = {node_id}
+        stack = [node_id]
+        while stack:
+            x = stack.pop()
+            yield x
+            for edge_id in self.tree_adjacency.get(x, ()):
+                a, b, _ = self.edges[edge_id]
+                y = b if a == x else a
+                if y not in seen:
+                    seen.add(y)
+                    stack.append(y)
+
+    def _smaller_side(self, source, target):
+        """Vertices of the smaller of source's and target's trees, found by walking both in lockstep"""
+        walks = [self._tree_vertices(source), self._tree_vertices(target)]
+        sides = [set(), set()]
+        while True:
+            for walk, side in zip(walks, sides):
+                vertex = next(walk, None)
+                if vertex is None:
+                    return side
+                side.add(vertex)
+
+    def _offer(self, edge_id, changes):
+        """Place an edge that is not in the forest: link it, swap it into a cycle, or keep it aside"""
+        source, target, weight = self.edges[edge_id]
+        if source == target:
+            self._add_non_tree(edge_id)
+            return
+
+        u, v = self._vertex(source), self._vertex(target)
+        if not self.tree.connected(u, v):
+            self._link_edge(edge_id)
+            changes['added'].append(edge_id)
+            return
+
+        # Cycle property: the heaviest edge on the closed cycle leaves the forest
+        heaviest = self.slot_edge[self.tree.path_max(u, v)]
+        if weight < self.edges[heaviest][2]:
+            self._cut_edge(heaviest)
+            self._add_non_tree(heaviest)
+            self._link_edge(edge_id)
+            changes['removed'].append(heaviest)
+            changes['added'].append(edge_id)
+        else:
+            self._add_non_tree(edge_id)
+
+    def _reconnect(self, source, target, max_weight, changes):
+        """Link the lightest non-tree edge lighter than max_weight that rejoins source and target's trees"""
+        # Every non-tree edge lies within one tree, so one leaving the smaller side crosses the cut
+        side = self._smaller_side(source, target)
+        best = None
+        for node_id in side:
+            for edge_id in self.non_tree_adjacency.get(node_id, ()):
+                a, b, weight = self.edges[edge_id]
+                if (a in side) != (b in side) and (weight, edge_id) < (best or (max_weight, -1)):
+                    best = (weight, edge_id)
+        if best is None:
+            return False
+
+        edge_id = best[1]
+        self._remove_non_tree(edge_id)
+        self._link_edge(edge_id)
+        changes['added'].append(edge_id)
+        return True
+
+    def _new_changes(self):
+        return {'added': [], 'removed': []}
+
+    def insert_edge(self, source, target, weight, edge_id=None):
+        """
+        Add a new edge and update the forest.
+
+        Returns:
+            changes: dict with the edge ids 'added' to and 'removed' from the forest,
+                     plus the 'edge_id' assigned to the new edge
+        """
+        if edge_id is None:
+            edge_id = self.next_edge_id
+        if edge_id in self.edges:
+            raise ValueError(f"Edge {edge_id} already exists")
+        self.next_edge_id = max(self.next_edge_id, edge_id + 1)
+        self.edges[edge_id] = (source, target, weight)
+
+        changes = self._new_changes()
+        changes['edge_id'] = edge_id
+        self._offer(edge_id, changes)
+        return changes
+
+    def update_weight(self, edge_id, weight):
+        """Change an edge's weight and update the forest; returns the added/removed edge ids"""
+        if edge_id not in self.edges:
+            raise ValueError(f"Unknown edge {edge_id}")
+        source, target, old_weight = self.edges[edge_id]
+        changes = self._new_changes()
+
+        if edge_id not in self.edge_slot:
+            # A lighter non-tree edge may now beat the heaviest edge on its cycle
+            self._remove_non_tree(edge_id)
+            self.edges[edge_id] = (source, target, weight)
+            self._offer(edge_id, changes)
+            return changes
+
+        self.edges[edge_id] = (source, target, weight)
+        self.total_weight += weight - old_weight
+        self.tree.set_weight(self.edge_slot[edge_id], weight)
+        if weight <= old_weight:
+            # A lighter tree edge keeps the forest minimal
+            return changes
+
+        # A heavier tree edge stays only if no lighter edge crosses its cut
+        self._cut_edge(edge_id)
+        if self._reconnect(source, target, weight, changes):
+            changes['removed'].append(edge_id)
+            self._add_non_tree(edge_id)
+        else:
+            self._link_edge(edge_id)
+        return changes
+
+    def delete_edge(self, edge_id):
+        """Remove an edge from the graph; returns the added/removed edge ids"""
+        if edge_id not in self.edges:
+            raise ValueError(f"Unknown edge {edge_id}")
+        source, target, _ = self.edges[edge_id]
+        changes = self._new_changes()
+
+        if edge_id in self.edge_slot:
+            self._cut_edge(edge_id)
+            changes['removed'].append(edge_id)
+            self._reconnect(source, target, float('inf'), changes)
+        else:
+            self._remove_non_tree(edge_id)
+        del self.edges[edge_id]
+        return changes
+
+    def mst_edge_ids(self):
+        return list(self.edge_slot)
+
+    def summary(self):
+        return {
+            'total_weight': self.total_weight,
+            'mst_edge_count': len(self.edge_slot),
+            'edge_count': len(self.edges)
+        }
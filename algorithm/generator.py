@@ -0,0 +1,171 @@
+import numpy as np
+
+from algorithm.layout import connected_components, csr_slots
+
+# Synthetic network layouts understood by road_network
+NETWORK_KINDS = ('grid', 'geometric')
+
+
+def hilbert_index(x, y, order):
+    """
+    Position of integer cells (x, y) along a Hilbert curve over a 2^order square.
+
+    Consecutive positions are always neighbouring cells, so sorting by it keeps
+    spatially close nodes close in the ordering.
+    """
+    x = np.array(x, dtype=np.int64)
+    y = np.array(y, dtype=np.int64)
+    index = np.zeros(len(x), dtype=np.int64)
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        index += s * s * ((3 * rx) ^ ry)
+        # Rotate the quadrant so the curve inside it starts and ends at the right corners
+        flip = ~ry
+        mirror = flip & rx
+        x[mirror] = s - 1 - x[mirror]
+        y[mirror] = s - 1 - y[mirror]
+        x[flip], y[flip] = y[flip], x[flip]
+        s >>= 1
+    return index
+
+
+def spatial_order(coordinates, order=16):
+    """Node permutation following a Hilbert curve through the coordinates"""
+    low = coordinates.min(axis=0)
+    extent = max(float(np.ptp(coordinates, axis=0).max()), 1e-9)
+    cells = ((coordinates - low) / extent * ((1 << order) - 1)).astype(np.int64)
+    return np.argsort(hilbert_index(cells[:, 0], cells[:, 1], order), kind='stable')
+
+
+def grid_edges(num_nodes, rng, jitter=0.3, keep=0.6, diagonal=0.05):
+    """
+    Perturbed street grid over a near-square lattice.
+
+    Every node but the first links to its left or upper neighbour at random,
+    which always forms a spanning tree; the remaining lattice streets are kept
+    with probability keep and a few diagonals are added, so the network is
+    connected but irregular.
+
+    Returns:
+        (sources, targets, coordinates)
+    """
+    width = max(1, int(np.ceil(np.sqrt(num_nodes))))
+    nodes = np.arange(num_nodes, dtype=np.int64)
+    column = nodes % width
+    row = nodes // width
+    coordinates = np.column_stack([column, row]).astype(np.float64)
+    coordinates += rng.uniform(-jitter, jitter, coordinates.shape)
+
+    # Tree parent of every node: left on the first row, up in the first column, else either
+    takes_left = np.where(row == 0, True, np.where(column == 0, False, rng.random(num_nodes) < 0.5))
+    takes_left[0] = False
+
+    right = nodes[(column + 1 < width) & (nodes + 1 < num_nodes)]
+    down = nodes[nodes + width < num_nodes]
+    right_kept = takes_left[right + 1] | (rng.random(len(right)) < keep)
+    down_kept = ~takes_left[down + width] | (rng.random(len(down)) < keep)
+
+    corner = nodes[(column + 1 < width) & (nodes + width + 1 < num_nodes)]
+    corner = corner[rng.random(len(corner)) < diagonal]
+
+    sources = np.concatenate([right[right_kept], down[down_kept], corner])
+    targets = np.concatenate([right[right_kept] + 1, down[down_kept] + width, corner + width + 1])
+    return sources, targets, coordinates
+
+
+def geometric_edges(num_nodes, rng, degree=3.0):
+    """
+    Random geometric graph: uniform points at unit density joined to every
+    point within the radius that gives the requested mean degree.
+
+    Candidate pairs come from a grid of radius-sized cells, each point scanning
+    its own cell and four forward neighbours. Consecutive points along a
+    Hilbert curve that fall in different components are then linked, which
+    connects the network with short edges only.
+
+    Returns:
+        (sources, targets, coordinates)
+    """
+    side = np.sqrt(num_nodes)
+    coordinates = rng.uniform(0.0, side, (num_nodes, 2))
+    radius = np.sqrt(degree / np.pi)
+
+    cells = np.floor(coordinates / radius).astype(np.int64)
+    columns = int(cells[:, 0].max()) + 1
+    rows = int(cells[:, 1].max()) + 1
+    cell = cells[:, 1] * columns + cells[:, 0]
+    by_cell = np.argsort(cell, kind='stable')
+    offsets = np.zeros(columns * rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cell, minlength=columns * rows), out=offsets[1:])
+
+    sources = []
+    targets = []
+    for dx, dy in ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+        nx = cells[:, 0] + dx
+        ny = cells[:, 1] + dy
+        valid = np.flatnonzero((nx >= 0) & (nx < columns) & (ny < rows))
+        neighbour_cells = ny[valid] * columns + nx[valid]
+        counts = offsets[neighbour_cells + 1] - offsets[neighbour_cells]
+        u = np.repeat(valid, counts)
+        v = by_cell[csr_slots(offsets, neighbour_cells)]
+        close = np.linalg.norm(coordinates[u] - coordinates[v], axis=1) <= radius
+        if dx == 0 and dy == 0:
+            close &= u < v
+        sources.append(u[close])
+        targets.append(v[close])
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+
+    labels = connected_components(sources, targets, num_nodes)
+    path = spatial_order(coordinates)
+    bridges = np.flatnonzero(labels[path[:-1]] != labels[path[1:]])
+    sources = np.concatenate([sources, path[bridges]])
+    targets = np.concatenate([targets, path[bridges + 1]])
+    return sources, targets, coordinates
+
+
+def road_network(num_nodes, seed=0, kind='grid'):
+    """
+    Seeded synthetic road network with Euclidean edge weights.
+
+    Nodes are numbered along a Hilbert curve and edges are sorted by their
+    lower endpoint, so any prefix of the edge list (such as the visualization
+    subset) covers one compact region of the network.
+
+    Args:
+        num_nodes: number of intersections
+        seed: random seed; the same (num_nodes, seed, kind) always gives the same network
+        kind: 'grid' (perturbed street grid) or 'geometric' (random geometric graph)
+
+    Returns:
+        (sources, targets, weights, coordinates): dense endpoints 0..num_nodes-1,
+        lengths rounded to 6 decimals, and (num_nodes, 2) node positions
+    """
+    if kind not in NETWORK_KINDS:
+        raise ValueError(f"Unknown network kind: {kind}")
+    if num_nodes < 2:
+        raise ValueError("A road network needs at least 2 nodes")
+
+    rng = np.random.default_rng(seed)
+    if kind == 'grid':
+        sources, targets, coordinates = grid_edges(num_nodes, rng)
+    else:
+        sources, targets, coordinates = geometric_edges(num_nodes, rng)
+
+    # Relabel nodes along the Hilbert curve and list edges from each node in turn
+    path = spatial_order(coordinates)
+    relabel = np.empty(num_nodes, dtype=np.int64)
+    relabel[path] = np.arange(num_nodes, dtype=np.int64)
+    coordinates = coordinates[path]
+    u = relabel[sources]
+    v = relabel[targets]
+    sources = np.minimum(u, v)
+    targets = np.maximum(u, v)
+    order = np.lexsort((targets, sources))
+    sources = sources[order]
+    targets = targets[order]
+
+    weights = np.round(np.linalg.norm(coordinates[sources] - coordinates[targets], axis=1), 6)
+    return sources, targets, weights, coordinates
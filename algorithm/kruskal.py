@@ -22,24 +22,30 @@ class UnionFind:
             self.rank[px] += 1
         return True
 
-def kruskal_mst_with_steps(edges, num_nodes):
+def kruskal_mst_with_steps(edges):
     """
     Implements Kruskal's algorithm with step-by-step tracking for visualization.
     
     Args:
-        edges: List of edges, each edge is (edge_id, source, target, weight)
-        num_nodes: Number of nodes in the graph
+        edges: EdgeTable with parallel ids, sources, targets and weights arrays
         
     Returns:
         steps: List of steps, each step is (edge_id, source, target, weight, status)
                status can be 'checking', 'accepted', or 'rejected'
         mst_edges: List of edges in the MST
     """
+    # Dense node indices 0..V-1 for the Union-Find, original ids for the output
+    node_index = edges.node_index()
+    node_ids = node_index.node_ids.tolist()
+    
     # Sort edges by weight
-    sorted_edges = sorted(edges, key=lambda x: x[3])
+    sorted_edges = sorted(
+        zip(edges.ids.tolist(), node_index.sources.tolist(), node_index.targets.tolist(), edges.weights.tolist()),
+        key=lambda x: x[3]
+    )
     
     # Initialize Union-Find data structure
-    uf = UnionFind(num_nodes)
+    uf = UnionFind(len(node_index))
     
     # Initialize result containers
     mst_edges = []
@@ -47,8 +53,9 @@ def kruskal_mst_with_steps(edges, num_nodes):
     total_weight = 0
     
     # Process each edge
-    for edge in sorted_edges:
-        edge_id, source, target, weight = edge
+    for edge_id, u, v, weight in sorted_edges:
+        source, target = node_ids[u], node_ids[v]
+        edge = (edge_id, source, target, weight)
         
         # Record checking step
         steps.append({
@@ -61,7 +68,7 @@ def kruskal_mst_with_steps(edges, num_nodes):
         })
         
         # Check if edge creates a cycle
-        if uf.union(source, target):
+        if uf.union(u, v):
             # Edge accepted into MST
             mst_edges.append(edge)
             total_weight += weight
@@ -0,0 +1,211 @@
+import numpy as np
+
+
+def connected_components(sources, targets, num_nodes):
+    """
+    Component label of every node, by min-label hooking and pointer jumping.
+
+    Args:
+        sources, targets: dense endpoints (0..num_nodes-1) of every edge
+        num_nodes: number of dense nodes
+
+    Returns:
+        labels: for every node, the smallest node index in its component
+    """
+    labels = np.arange(num_nodes, dtype=np.int64)
+    while True:
+        previous = labels.copy()
+        # Hook every root onto the smallest label seen across its edges
+        low = np.minimum(labels[sources], labels[targets])
+        np.minimum.at(labels, labels[sources], low)
+        np.minimum.at(labels, labels[targets], low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def csr_slots(offsets, nodes):
+    """Concatenated CSR slot indices of every node in nodes, in order"""
+    begins = offsets[nodes]
+    counts = offsets[nodes + 1] - begins
+    total = int(counts.sum())
+    return np.repeat(begins - np.cumsum(counts) + counts, counts) + np.arange(total)
+
+
+def bfs_hops(offsets, neighbors, start, num_nodes):
+    """
+    Unweighted shortest-path distances from start, one vectorized frontier per level.
+
+    Returns:
+        hops: distance of every node from start, -1 where unreachable
+    """
+    hops = np.full(num_nodes, -1, dtype=np.int64)
+    hops[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    level = 0
+    while len(frontier):
+        level += 1
+        reached = np.unique(neighbors[csr_slots(offsets, frontier)])
+        frontier = reached[hops[reached] < 0]
+        hops[frontier] = level
+    return hops
+
+
+def pivot_mds(offsets, neighbors, nodes, num_pivots=50, seed=0):
+    """
+    Pivot MDS layout (Brandes & Pich) of one connected component.
+
+    Graph distances from a few far-apart pivot nodes are double-centered and
+    projected onto their two principal axes, which places road networks close
+    to their geographic shape in O(pivots * (V + E)).
+
+    Args:
+        offsets, neighbors: CSR adjacency over dense node indices
+        nodes: dense indices of the component's nodes
+        num_pivots: number of pivot nodes
+        seed: seed for the first pivot
+
+    Returns:
+        coordinates: (len(nodes), 2) array aligned with nodes
+    """
+    if len(nodes) <= 2:
+        return np.column_stack([np.arange(len(nodes), dtype=np.float64), np.zeros(len(nodes))])
+
+    num_nodes = len(offsets) - 1
+    rng = np.random.default_rng(seed)
+    num_pivots = min(num_pivots, len(nodes))
+    distances = np.empty((num_pivots, len(nodes)), dtype=np.float64)
+
+    # Max-min pivot selection spreads the pivots across the component
+    pivot = int(nodes[rng.integers(len(nodes))])
+    closest = np.full(len(nodes), np.inf)
+    for i in range(num_pivots):
+        distances[i] = bfs_hops(offsets, neighbors, pivot, num_nodes)[nodes]
+        closest = np.minimum(closest, distances[i])
+        pivot = int(nodes[np.argmax(closest)])
+
+    squared = distances ** 2
+    centered = -0.5 * (squared - squared.mean(axis=1, keepdims=True)
+                       - squared.mean(axis=0, keepdims=True) + squared.mean())
+    _, vectors = np.linalg.eigh(centered @ centered.T)
+    return centered.T @ vectors[:, [-1, -2]]
+
+
+def component_layout(offsets, neighbors, sources, targets, num_nodes, num_pivots=50, seed=0):
+    """
+    Lay out every connected component with pivot MDS and pack them in rows.
+
+    Each component is scaled so its area grows with its node count, then
+    components are placed largest first on shelves of a square-ish canvas.
+
+    Returns:
+        coordinates: (num_nodes, 2) array indexed by dense node index
+    """
+    coordinates = np.zeros((num_nodes, 2), dtype=np.float64)
+    labels = connected_components(sources, targets, num_nodes)
+    order = np.argsort(labels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    components = sorted(np.split(order, boundaries), key=len, reverse=True)
+
+    boxes = []
+    for nodes in components:
+        local = pivot_mds(offsets, neighbors, nodes, num_pivots, seed)
+        local -= local.min(axis=0)
+        extent = local.max()
+        if extent > 0:
+            local *= np.sqrt(len(nodes)) / extent
+        boxes.append((nodes, local, local.max(axis=0) + 1.0))
+
+    # Shelf packing onto a canvas roughly as wide as the largest component or sqrt(total area)
+    total_area = sum(float(size[0] * size[1]) for _, _, size in boxes)
+    canvas_width = max(float(boxes[0][2][0]), np.sqrt(total_area)) if boxes else 0.0
+    x = y = shelf_height = 0.0
+    for nodes, local, size in boxes:
+        if x > 0 and x + size[0] > canvas_width:
+            x = 0.0
+            y += shelf_height
+            shelf_height = 0.0
+        coordinates[nodes] = local + (x, y)
+        x += size[0]
+        shelf_height = max(shelf_height, size[1])
+    return coordinates
+
+
+def normalize_edge_length(coordinates, sources, targets):
+    """Scale a layout so its median edge length is 1"""
+    lengths = np.linalg.norm(coordinates[sources] - coordinates[targets], axis=1)
+    lengths = lengths[lengths > 0]
+    if not len(lengths):
+        return coordinates
+    return (coordinates - coordinates.min(axis=0)) / np.median(lengths)
+
+
+def force_layout(sources, targets, initial, iterations=50, max_clusters=256, chunk_size=2048):
+    """
+    Fruchterman-Reingold refinement with grid-clustered far-field repulsion.
+
+    Springs pull every edge towards unit length. Repulsion is approximated
+    Barnes-Hut style by clustering the nodes on a grid (at most max_clusters
+    occupied cells), and every node is pushed by each cluster's centroid in
+    proportion to its node count. Both forces are vectorized, so an
+    iteration costs O(V * clusters + E). A softening term keeps a node's own
+    cluster from exerting unbounded force. The temperature that caps
+    per-iteration moves cools linearly to zero.
+
+    Args:
+        sources, targets: dense endpoints of every edge
+        initial: (V, 2) starting coordinates, e.g. from pivot MDS
+        iterations: number of refinement steps
+        max_clusters: upper bound on far-field clusters per step
+        chunk_size: nodes per block of the node-cluster force matrix
+
+    Returns:
+        coordinates: (V, 2) array with median edge length 1
+    """
+    positions = normalize_edge_length(np.array(initial, dtype=np.float64), sources, targets)
+    num_nodes = len(positions)
+    if num_nodes < 2 or iterations <= 0:
+        return positions
+
+    extent = float(np.ptp(positions, axis=0).max()) or 1.0
+    start_temperature = 0.05 * extent
+    for step in range(iterations):
+        temperature = start_temperature * (1.0 - step / iterations)
+
+        # Far-field clusters: grid cells sized for about num_nodes / max_clusters nodes each
+        width, height = np.maximum(np.ptp(positions, axis=0), 1e-9)
+        cell = max(np.sqrt(width * height * 4.0 / min(max_clusters, num_nodes)), 1.0)
+        cells = np.floor((positions - positions.min(axis=0)) / cell).astype(np.int64)
+        keys = cells[:, 0] * (int(cells[:, 1].max()) + 1) + cells[:, 1]
+        _, cluster = np.unique(keys, return_inverse=True)
+        cluster = cluster.reshape(-1)
+        mass = np.bincount(cluster).astype(np.float64)
+        centroids = np.column_stack([
+            np.bincount(cluster, weights=positions[:, 0]),
+            np.bincount(cluster, weights=positions[:, 1])
+        ]) / mass[:, None]
+        softening = (0.5 * cell) ** 2
+
+        displacement = np.zeros_like(positions)
+        for lo in range(0, num_nodes, chunk_size):
+            delta = positions[lo:lo + chunk_size, None, :] - centroids[None, :, :]
+            strength = mass / ((delta ** 2).sum(axis=2) + softening)
+            displacement[lo:lo + chunk_size] = (delta * strength[:, :, None]).sum(axis=1)
+
+        # Springs: force grows with the square of the length along each edge
+        delta = positions[sources] - positions[targets]
+        length = np.linalg.norm(delta, axis=1)
+        pull = delta * length[:, None]
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(sources, weights=pull[:, axis], minlength=num_nodes)
+            displacement[:, axis] += np.bincount(targets, weights=pull[:, axis], minlength=num_nodes)
+
+        moves = np.linalg.norm(displacement, axis=1)
+        scale = np.minimum(moves, temperature) / np.maximum(moves, 1e-12)
+        positions += displacement * scale[:, None]
+
+    return normalize_edge_length(positions, sources, targets)
@@ -1,12 +1,11 @@
 import heapq
 
-def prim_mst_with_steps(edges, num_nodes):
+def prim_mst_with_steps(edges):
     """
     Implements Prim's algorithm with step-by-step tracking for visualization.
     
     Args:
-        edges: List of edges, each edge is (edge_id, source, target, weight)
-        num_nodes: Number of nodes in the graph
+        edges: EdgeTable with parallel ids, sources, targets and weights arrays
         
     Returns:
         steps: List of steps, each step is (edge_id, source, target, weight, status)
@@ -14,12 +13,18 @@ def prim_mst_with_steps(edges, num_nodes):
         mst_edges: List of edges in the MST
         total_weight: Total weight of the MST
     """
-    from collections import defaultdict
+    if len(edges) == 0:
+        return {'steps': [], 'mst_edges': [], 'total_weight': 0}
+
+    # Dense node indices 0..V-1 for the search, original ids for the output
+    node_index = edges.node_index()
+    node_ids = node_index.node_ids.tolist()
+    num_nodes = len(node_index)
 
     # Build adjacency list
-    graph = defaultdict(list)
-    for edge in edges:
-        edge_id, u, v, w = edge
+    graph = [[] for _ in range(num_nodes)]
+    for edge_id, u, v, w in zip(edges.ids.tolist(), node_index.sources.tolist(),
+                                node_index.targets.tolist(), edges.weights.tolist()):
         graph[u].append((w, edge_id, u, v))
         graph[v].append((w, edge_id, v, u))
     
@@ -29,7 +34,7 @@ def prim_mst_with_steps(edges, num_nodes):
     mst_edges = []
     total_weight = 0
 
-    # Start from node 0 (you could generalize it)
+    # Start from dense node 0 (you could generalize it)
     visited[0] = True
     for w, edge_id, u, v in graph[0]:
         heapq.heappush(min_heap, (w, edge_id, u, v))
@@ -40,8 +45,8 @@ def prim_mst_with_steps(edges, num_nodes):
         # Record checking step
         steps.append({
             'edge_id': edge_id,
-            'source': u,
-            'target': v,
+            'source': node_ids[u],
+            'target': node_ids[v],
             'weight': weight,
             'status': 'checking',
             'total_weight': total_weight
@@ -53,13 +58,13 @@ def prim_mst_with_steps(edges, num_nodes):
         
         # Accept this edge
         visited[v] = True
-        mst_edges.append((edge_id, u, v, weight))
+        mst_edges.append((edge_id, node_ids[u], node_ids[v], weight))
         total_weight += weight
         
         steps.append({
             'edge_id': edge_id,
-            'source': u,
-            'target': v,
+            'source': node_ids[u],
+            'target': node_ids[v],
             'weight': weight,
             'status': 'accepted',
             'total_weight': total_weight
@@ -1,11 +1,33 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, g, render_template, jsonify, request
 from flask_cors import CORS
 import os
 import json
 import time
-from collections import defaultdict
+import threading
+import uuid
+from collections import OrderedDict
+import cProfile
 import heapq
+import io
+import itertools
+import math
 import random
+import struct
+import tempfile
+import numpy as np
+from algorithm.boruvka import boruvka_mst
+from algorithm.dynamic_mst import DynamicMST
+from algorithm.generator import NETWORK_KINDS, road_network
+from algorithm.layout import component_layout, force_layout, normalize_edge_length
+from edge_table import BINARY_RECORD, DenseUnionFind, EdgeTable
+from graph_tiles import TILE_MAX_NODES, GraphTiles
+from mst_jobs import MSTJobQueue
+from result_store import MSTResultStore
+from stage_timing import StageTimer, stage_local, timed_stage
+from step_engines import (
+    KRUSKAL_ENGINES, PRIM_ENGINES, STEP_STATUS_CODES, TRACE_KEYFRAME_INTERVAL, StepStream, boruvka_steps,
+    boruvka_mst_with_steps, collect_steps, full_kruskal_mst, keyframe_steps, traced_result
+)
 
 app = Flask(__name__)
 CORS(app)
@@ -19,149 +41,573 @@ DATASETS = {
     'generated': 'Generated Graph'  # Special marker for randomly generated graphs
 }
 
-class UnionFind:
-    """Optimized Union-Find data structure with path compression and union by rank"""
-    def __init__(self):
-        self.parent = {}
-        self.rank = defaultdict(int)
-        self.size = defaultdict(lambda: 1)
-    
-    def find(self, x):
-        """Find with path compression"""
-        if x not in self.parent:
-            self.parent[x] = x
-            return x
-        
-        # Path compression
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
-    
-    def union(self, x, y):
-        """Union by rank with path compression"""
-        px, py = self.find(x), self.find(y)
-        if px == py:
-            return False
+# Number of leading edges rendered and animated in the browser
+VISUALIZATION_EDGE_LIMIT = 10000
+
+# Number of steps serialized per chunk on the streaming endpoints
+STREAM_BATCH_SIZE = 256
+
+# Compact step encoding served with ?format=binary: a header (step count, MST edge
+# count, total weight) followed by column arrays of running totals (float64),
+# edge ids (uint32), MST edge ids (uint32) and status codes (uint8). Keyframe
+# steps carry their rejection count in the edge id column.
+BINARY_STEPS_HEADER = struct.Struct('<IId')
+
+# Default memory budget for the external-memory (out-of-core) Kruskal mode
+EXTERNAL_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Rough peak bytes per edge while a chunk is parsed into Python lists and sorted
+EXTERNAL_BYTES_PER_EDGE = 160
+
+# Rough bytes per distinct node held for the whole run: the sorted node-id array, the
+# temporary copy made when a chunk's ids are merged into it, and the Union-Find
+EXTERNAL_BYTES_PER_NODE = 96
+
+# Default worker processes for the parallel Boruvka engine (?workers= overrides it, capped at
+# the shared pool's size); 1 until benchmarks.boruvka_scaling measures a speedup on the host
+BORUVKA_WORKERS = 1
+
+# Precomputed force layout sidecar, recomputed when the dataset's content hash changes
+LAYOUT_SUFFIX = '.layout.npz'
+LAYOUT_ITERATIONS = 50
+
+# Pixels per unit edge length when /get_graph_data sends layout coordinates
+LAYOUT_EDGE_LENGTH = 30
+
+# Synthetic road networks requested as /<route>/generated?size=N are written here once per (kind, size, seed)
+GENERATED_DIR = 'database/generated'
+GENERATED_MAX_NODES = 5000000
+
+# Endpoints whose requests are broken down into stage timings for /metrics and Server-Timing
+METRICS_ENDPOINTS = {'get_graph_data', 'run_kruskal', 'run_prims', 'run_boruvka'}
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# ?profile=1 on a timed endpoint writes a cProfile dump of that request here
+PROFILE_DIR = 'profiles'
+
+# Maximum number of parsed datasets kept in memory at once
+GRAPH_CACHE_SIZE = 4
+
+# Text datasets are read and parsed in blocks of about this many bytes
+TEXT_BLOCK_BYTES = 16 * 1024 * 1024
+
+# Leading bytes of a text block sampled to detect its column layout
+COLUMN_SAMPLE_BYTES = 8192
+
+# Positions of (source, target, weight) by column count:
+# 'edge_id source target weight' (the bundled datasets) or 'source target weight'
+TEXT_COLUMNS = {
+    4: (1, 2, 3),
+    3: (0, 1, 2)
+}
+
+# Typed (source, target, weight) row parsed from a text dataset
+TEXT_RECORD = np.dtype([
+    ('source', '<i8'),
+    ('target', '<i8'),
+    ('weight', '<f8')
+])
+
+# Bumped whenever parsing changes, so stored results and layouts of older parses are recomputed
+DATASET_PARSER_VERSION = 2
+
+# Binary dataset sidecar: fixed-size header followed by fixed-width edge records
+BINARY_SUFFIX = '.bin'
+BINARY_MAGIC = b'RNMSTBIN'
+BINARY_VERSION = 2
+BINARY_FLAG_SORTED = 1
+BINARY_HEADER = struct.Struct('<8sIIQQ32x')  # magic, version, flags, num_edges, total_lines
+def graph_to_json(graph, layout=None):
+    """Convert a {'nodes', 'edges': EdgeTable} graph into the frontend JSON shape, with x/y from a precomputed layout"""
+    node_ids = np.asarray(graph['nodes'])
+    if layout is None:
+        nodes = [{'id': node_id} for node_id in node_ids.tolist()]
+    else:
+        layout_ids, coordinates = layout
+        positions = coordinates[np.searchsorted(layout_ids, node_ids)] * LAYOUT_EDGE_LENGTH
+        nodes = [
+            {'id': node_id, 'x': x, 'y': y}
+            for node_id, (x, y) in zip(node_ids.tolist(), np.round(positions, 2).tolist())
+        ]
+    return {
+        'nodes': nodes,
+        'edges': graph['edges'].to_dicts()
+    }
+
+def result_to_json(result):
+    """Convert an MST result whose mst_edges is an EdgeTable into the frontend JSON shape"""
+    json_result = dict(result)
+    json_result['mst_edges'] = result['mst_edges'].to_dicts()
+    json_result['total_weight'] = float(result['total_weight'])
+    return json_result
+
+def encode_steps_binary(result):
+    """Pack an MST result and its steps into the compact column layout described by BINARY_STEPS_HEADER"""
+    steps = result['steps']
+    count = len(steps)
+    totals = np.fromiter((step['total_weight'] for step in steps), dtype='<f8', count=count)
+    edge_ids = np.fromiter((step['edge_id'] if 'edge_id' in step else step['rejected'] for step in steps),
+                           dtype='<u4', count=count)
+    statuses = np.fromiter((STEP_STATUS_CODES[step['status']] for step in steps), dtype='u1', count=count)
+    mst_edge_ids = result['mst_edges'].ids.astype('<u4')
+    
+    # Widest columns first so every typed-array view in the browser stays aligned
+    header = BINARY_STEPS_HEADER.pack(count, len(mst_edge_ids), float(result['total_weight']))
+    return b''.join([header, totals.tobytes(), edge_ids.tobytes(), mst_edge_ids.tobytes(), statuses.tobytes()])
+
+def result_response(result):
+    """Render an MST result as JSON, or in the compact binary encoding when ?format=binary"""
+    with timed_stage('serialize'):
+        if request.args.get('format') == 'binary':
+            return Response(encode_steps_binary(result), mimetype='application/octet-stream')
+        return jsonify(result_to_json(result))
+
+def detect_text_columns(lines):
+    """Column positions of (source, target, weight), from the most common field count among sample lines"""
+    counts = [len(line.split()) for line in lines]
+    counts = [count for count in counts if count >= 3]
+    if not counts:
+        return TEXT_COLUMNS[3]
+    layout = max(set(counts), key=counts.count)
+    return TEXT_COLUMNS[4] if layout >= 4 else TEXT_COLUMNS[3]
+
+def parse_edge_lines(lines, first_line=0, columns=None):
+    """Parse edge lines one at a time into an EdgeTable using line numbers as edge ids; returns (edges, line_count)"""
+    lines = list(lines)
+    if columns is None:
+        columns = detect_text_columns(lines)
+    ids = []
+    sources = []
+    targets = []
+    weights = []
+    total_lines = 0
+    
+    for i, line in enumerate(lines, first_line):
+        total_lines += 1
+        parts = line.strip().split()
+        if len(parts) > max(columns):
+            source, target, weight = (float(parts[column]) for column in columns)
             
-        # Union by rank
-        if self.rank[px] < self.rank[py]:
-            px, py = py, px
-        self.parent[py] = px
-        self.size[px] += self.size[py]
-        
-        if self.rank[px] == self.rank[py]:
-            self.rank[px] += 1
-        return True
-
-def read_graph_data(dataset_path, max_edges=10000):
-    """Read and parse graph data from file"""
-    nodes = set()
-    edges = []
+            ids.append(i)  # Use line number as edge ID
+            sources.append(int(source))
+            targets.append(int(target))
+            weights.append(weight)
     
-    with open(dataset_path, 'r') as f:
-        for i, line in enumerate(f):
-            if i >= max_edges:  # Limit edges for initial visualization
-                break
-                
-            parts = line.strip().split()
-            if len(parts) >= 3:
-                source, target, weight = map(float, parts[:3])
-                source = int(source)
-                target = int(target)
-                
-                nodes.add(source)
-                nodes.add(target)
-                edges.append({
-                    'id': i,  # Use line number as edge ID
-                    'source': source,
-                    'target': target,
-                    'distance': weight
-                })
-    
-    # Convert nodes to list of dictionaries
-    nodes = [{'id': node_id} for node_id in nodes]
+    return EdgeTable(ids, sources, targets, weights), total_lines
+
+def parse_edge_block(block, first_line=0, columns=None):
+    """
+    Parse a block of whole text lines (bytes) into an EdgeTable with NumPy's
+    C tokenizer; returns (edges, line_count).
+
+    Edge ids are line numbers. A block with blank, short or malformed lines
+    falls back to parse_edge_lines, so ids stay aligned with the file.
+    """
+    if columns is None:
+        columns = detect_text_columns(block[:COLUMN_SAMPLE_BYTES].splitlines())
+    line_count = block.count(b'\n') + (1 if block and not block.endswith(b'\n') else 0)
+    if not line_count:
+        return EdgeTable([], [], [], []), 0
     
-    print(f"Graph loaded: {len(nodes)} nodes, {len(edges)} edges")
+    try:
+        records = np.loadtxt(io.BytesIO(block), dtype=TEXT_RECORD, usecols=columns, ndmin=1)
+    except ValueError:
+        records = None
+    if records is None or len(records) != line_count:
+        return parse_edge_lines(block.splitlines(), first_line, columns)
+    
+    return EdgeTable(
+        np.arange(first_line, first_line + line_count, dtype=np.int64),
+        records['source'],
+        records['target'],
+        records['weight']
+    ), line_count
+
+def iter_text_blocks(f, block_bytes=TEXT_BLOCK_BYTES):
+    """Read a binary file object in blocks of about block_bytes, each ending on a line boundary"""
+    while True:
+        block = f.read(block_bytes)
+        if not block:
+            return
+        if not block.endswith(b'\n'):
+            block += f.readline()
+        yield block
+
+def parse_graph_file(dataset_path):
+    """Parse every edge of a text dataset into an EdgeTable, block by block"""
+    print(f"Parsing {dataset_path}...")
+    start_time = time.time()
+    
+    tables = [EdgeTable([], [], [], [])]
+    total_lines = 0
+    columns = TEXT_COLUMNS[3]
+    with open(dataset_path, 'rb') as f:
+        for block in iter_text_blocks(f):
+            if not total_lines:
+                columns = detect_text_columns(block[:COLUMN_SAMPLE_BYTES].splitlines())
+            edges, line_count = parse_edge_block(block, total_lines, columns)
+            tables.append(edges)
+            total_lines += line_count
+    edges = EdgeTable.concat(tables) if len(tables) > 1 else tables[0]
+    
+    elapsed = time.time() - start_time
+    layout = 'edge_id source target weight' if columns == TEXT_COLUMNS[4] else 'source target weight'
+    print(f"Parsed {len(edges)} edges in {elapsed:.2f} seconds "
+          f"({len(edges) / max(elapsed, 1e-9):,.0f} rows/sec, columns: {layout})")
     
     return {
-        'nodes': nodes,
+        'edges': edges,
+        'total_lines': total_lines,
+        'sorted_by_weight': False,
+        'subsets': {}
+    }
+
+def read_graph_head(dataset_path, max_edges=VISUALIZATION_EDGE_LIMIT):
+    """Parse only the first max_edges lines of a dataset, leaving the rest of the file unread"""
+    with open(dataset_path, 'rb') as f:
+        edges, _ = parse_edge_block(b''.join(itertools.islice(f, max_edges)))
+    return {
+        'nodes': edges.node_ids(),
         'edges': edges
     }
 
-def kruskal_mst_with_steps(edges):
-    """Advanced implementation of Kruskal's algorithm optimized for large datasets"""
-    print("Starting Kruskal's Algorithm...")
+def binary_path_for(dataset_path):
+    """Path of the binary sidecar for a text dataset"""
+    return os.path.splitext(dataset_path)[0] + BINARY_SUFFIX
+
+def layout_path_for(dataset_path):
+    """Path of the precomputed layout sidecar for a dataset"""
+    return os.path.splitext(dataset_path)[0] + LAYOUT_SUFFIX
+
+def resolve_dataset_file(dataset_path):
+    """Prefer the binary sidecar when it exists and is at least as new as the text file"""
+    binary_path = binary_path_for(dataset_path)
+    if not os.path.exists(binary_path):
+        return dataset_path
+    if os.path.exists(dataset_path) and os.stat(binary_path).st_mtime_ns < os.stat(dataset_path).st_mtime_ns:
+        print(f"Ignoring stale binary dataset {binary_path}")
+        return dataset_path
+    with open(binary_path, 'rb') as f:
+        header = f.read(BINARY_HEADER.size)
+    if os.path.exists(dataset_path) and (len(header) < BINARY_HEADER.size or
+                                         BINARY_HEADER.unpack(header)[1] != BINARY_VERSION):
+        print(f"Ignoring outdated binary dataset {binary_path}; rerun convert_datasets.py")
+        return dataset_path
+    return binary_path
+
+def write_binary_dataset(graph, binary_path, sort_by_weight=False):
+    """Write a parsed dataset to a binary sidecar, optionally pre-sorted by weight"""
+    edges = graph['edges']
+    records = np.empty(len(edges), dtype=BINARY_RECORD)
+    records['id'] = edges.ids
+    records['source'] = edges.sources
+    records['target'] = edges.targets
+    records['weight'] = edges.weights
+    if sort_by_weight:
+        records = records[np.argsort(records['weight'], kind='stable')]
+    
+    flags = BINARY_FLAG_SORTED if sort_by_weight else 0
+    with open(binary_path, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, len(records), graph['total_lines']))
+        records.tofile(f)
+
+def write_text_dataset(edges, text_path, block_rows=100000):
+    """Write edges as 'edge_id source target weight' lines, the layout of the bundled datasets"""
+    line = '%d %d %d %.6f\n'
+    with open(text_path, 'w') as f:
+        for lo in range(0, len(edges), block_rows):
+            hi = min(lo + block_rows, len(edges))
+            rows = zip(edges.ids[lo:hi].tolist(), edges.sources[lo:hi].tolist(),
+                       edges.targets[lo:hi].tolist(), edges.weights[lo:hi].tolist())
+            f.write((line * (hi - lo)) % tuple(itertools.chain.from_iterable(rows)))
+
+def read_binary_header(binary_path):
+    """(flags, num_edges, total_lines) of a binary sidecar, validating its magic and version"""
+    with open(binary_path, 'rb') as f:
+        header = f.read(BINARY_HEADER.size)
+    if len(header) < BINARY_HEADER.size:
+        raise ValueError(f"Truncated binary dataset: {binary_path}")
+    
+    magic, version, flags, num_edges, total_lines = BINARY_HEADER.unpack(header)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary dataset format: {binary_path}")
+    return flags, num_edges, total_lines
+
+def load_binary_records(binary_path):
+    """(flags, records) of a binary sidecar, with the records memory-mapped rather than read"""
+    flags, num_edges, _ = read_binary_header(binary_path)
+    if num_edges:
+        return flags, np.memmap(binary_path, dtype=BINARY_RECORD, mode='r',
+                                offset=BINARY_HEADER.size, shape=(num_edges,))
+    return flags, np.empty(0, dtype=BINARY_RECORD)
+
+def load_binary_dataset(binary_path):
+    """Memory-map a binary sidecar; the EdgeTable columns are views into the mapped file"""
     start_time = time.time()
+    flags, _, total_lines = read_binary_header(binary_path)
+    records = load_binary_records(binary_path)[1]
+    edges = EdgeTable(records['id'], records['source'], records['target'], records['weight'])
+    if flags & BINARY_FLAG_SORTED:
+        # Records were stably sorted by weight from file (id) order, so no sort is needed
+        edges._weight_order = np.arange(len(edges), dtype=np.int64)
+    print(f"Mapped {len(edges)} edges from {binary_path} in {time.time() - start_time:.4f} seconds")
     
-    # Initialize Union-Find data structure
-    uf = UnionFind()
+    return {
+        'edges': edges,
+        'total_lines': total_lines,
+        'sorted_by_weight': bool(flags & BINARY_FLAG_SORTED),
+        'subsets': {}
+    }
+
+def load_graph_file(dataset_path):
+    """Load a dataset from its binary sidecar when fresh, otherwise parse the text file"""
+    resolved_path = resolve_dataset_file(dataset_path)
+    if resolved_path != dataset_path:
+        return load_binary_dataset(resolved_path)
+    return parse_graph_file(dataset_path)
+
+class RequestMetrics:
+    """Prometheus-style stage-time histograms plus request and response-byte counters per route"""
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.histograms = {}  # (route, stage) -> [count per bucket..., sum, count]
+        self.requests = {}  # (route, status) -> count
+        self.bytes_out = {}  # route -> bytes
     
-    # Create min-heap of edges sorted by weight
-    edge_heap = [(edge['distance'], edge['id'], edge) for edge in edges]
-    heapq.heapify(edge_heap)
+    def _observe(self, key, seconds):
+        histogram = self.histograms.setdefault(key, [0] * (len(self.buckets) + 2))
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                histogram[i] += 1
+        histogram[-2] += seconds
+        histogram[-1] += 1
     
-    mst_edges = []
-    total_weight = 0
-    steps = []
-    edges_processed = 0
-    
-    # Process edges in order of increasing weight
-    while edge_heap and len(mst_edges) < len(set(e['source'] for e in edges) | set(e['target'] for e in edges)) - 1:
-        weight, edge_id, edge = heapq.heappop(edge_heap)
-        edges_processed += 1
-        
-        source = edge['source']
-        target = edge['target']
-        
-        # Add checking step
-        steps.append({
-            'edge_id': edge_id,
-            'weight': weight,
-            'status': 'checking',
-            'total_weight': total_weight
-        })
+    def observe(self, route, timer, status, bytes_out):
+        """Record one finished request"""
+        with self.lock:
+            for stage, seconds in timer.stages.items():
+                self._observe((route, stage), seconds)
+            self._observe((route, 'total'), timer.total())
+            self.requests[(route, status)] = self.requests.get((route, status), 0) + 1
+            self.bytes_out[route] = self.bytes_out.get(route, 0) + bytes_out
+    
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = [
+            '# HELP mst_request_stage_seconds Exclusive time spent in each stage of a request',
+            '# TYPE mst_request_stage_seconds histogram'
+        ]
+        with self.lock:
+            for (route, stage), histogram in sorted(self.histograms.items()):
+                labels = f'route="{route}",stage="{stage}"'
+                for bound, count in zip(self.buckets, histogram):
+                    lines.append(f'mst_request_stage_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'mst_request_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram[-1]}')
+                lines.append(f'mst_request_stage_seconds_sum{{{labels}}} {histogram[-2]:.6f}')
+                lines.append(f'mst_request_stage_seconds_count{{{labels}}} {histogram[-1]}')
+            
+            lines += ['# HELP mst_requests_total Timed requests by route and status',
+                      '# TYPE mst_requests_total counter']
+            for (route, status), count in sorted(self.requests.items()):
+                lines.append(f'mst_requests_total{{route="{route}",status="{status}"}} {count}')
+            
+            lines += ['# HELP mst_response_bytes_total Response body bytes sent by route',
+                      '# TYPE mst_response_bytes_total counter']
+            for route, count in sorted(self.bytes_out.items()):
+                lines.append(f'mst_response_bytes_total{{route="{route}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+class GraphCache:
+    """Size-bounded LRU cache of parsed datasets, invalidated when a file's mtime or size changes"""
+    def __init__(self, max_entries=GRAPH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, dataset_path):
+        """Return the parsed dataset, parsing the file only if it is missing or stale"""
+        # Key on whichever file will actually be loaded so converting a dataset invalidates it
+        resolved_path = resolve_dataset_file(dataset_path)
+        stat = os.stat(resolved_path)
+        key = (dataset_path, resolved_path, stat.st_mtime_ns, stat.st_size)
         
-        # Check if edge creates a cycle using Union-Find
-        if uf.union(source, target):
-            # Edge accepted - add to MST
-            mst_edges.append(edge)
-            total_weight += weight
-            steps.append({
-                'edge_id': edge_id,
-                'weight': weight,
-                'status': 'accepted',
-                'total_weight': total_weight
-            })
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        
+        # Parse outside the lock so other datasets can still be served; the edge table's
+        # indexes are built by the first request that needs each one and then kept with it
+        with timed_stage('parse'):
+            graph = load_graph_file(dataset_path)
+        
+        with self.lock:
+            # Drop older versions of the same file
+            for stale_key in [k for k in self.entries if k[0] == dataset_path and k != key]:
+                del self.entries[stale_key]
+            
+            self.entries[key] = graph
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        
+        return graph
+    
+    def stats(self):
+        """Return hit/miss/eviction counters and the currently cached files"""
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self.entries),
+                'max_entries': self.max_entries,
+                'datasets': [key[0] for key in self.entries]
+            }
+
+graph_cache = GraphCache()
+
+mst_store = MSTResultStore(VISUALIZATION_EDGE_LIMIT, DATASET_PARSER_VERSION)
+
+def read_graph_data(dataset_path, max_edges=VISUALIZATION_EDGE_LIMIT):
+    """Read graph data for the first max_edges lines of a dataset file"""
+    graph = graph_cache.get(dataset_path)
+    
+    with graph_cache.lock:
+        subset = graph['subsets'].get(max_edges)
+    if subset is not None:
+        return subset
+    
+    # Edge ids are line numbers, so the subset is a prefix of the parsed edges
+    with timed_stage('index'):
+        if graph['sorted_by_weight']:
+            # Pre-sorted binary files scatter the prefix; restore file order for the subset
+            rows = np.flatnonzero(graph['edges'].ids < max_edges)
+            edges = graph['edges'].take(rows[np.argsort(graph['edges'].ids[rows], kind='stable')])
         else:
-            # Edge rejected - would create cycle
-            steps.append({
-                'edge_id': edge_id,
-                'weight': weight,
-                'status': 'rejected',
-                'total_weight': total_weight
-            })
+            edges = graph['edges'].head(max_edges)
+            edges = edges.take(edges.ids < max_edges)
+        nodes = edges.node_ids()
+        edges.adjacency()
     
-    end_time = time.time()
-    print(f"Kruskal's Algorithm completed in {end_time - start_time:.2f} seconds")
-    print(f"Edges processed: {edges_processed}")
-    print(f"MST edges: {len(mst_edges)}, Total weight: {total_weight:.2f}")
-    print("="*50 + "\n")
+    print(f"Graph loaded: {len(nodes)} nodes, {len(edges)} edges")
     
-    return {
-        'mst_edges': mst_edges,
-        'total_weight': total_weight,
-        'steps': steps
+    subset = {
+        'nodes': nodes,
+        'edges': edges
     }
+    with graph_cache.lock:
+        graph['subsets'][max_edges] = subset
+    return subset
+
+def read_all_edges(dataset_path):
+    """Return every edge of a dataset with its node and row indexes already built"""
+    return graph_cache.get(dataset_path)['edges']
+
+class DatasetLocks:
+    """One lock per dataset path, so slow work on one dataset never blocks another"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.locks = {}
+    
+    def __call__(self, dataset_path):
+        with self.lock:
+            return self.locks.setdefault(dataset_path, threading.Lock())
+
+tiles_locks = DatasetLocks()
+layout_locks = DatasetLocks()
+
+def layout_content_hash(dataset_path):
+    """Content hash of the file the dataset actually loads from (its binary sidecar when fresh), which keys its layout"""
+    return mst_store.content_hash(resolve_dataset_file(dataset_path))
+
+def load_graph_layout(layout_path, content_hash, node_ids):
+    """Coordinates from a layout sidecar, or None when it is missing or was computed for other data"""
+    try:
+        with np.load(layout_path) as saved:
+            if str(saved['content_hash']) != content_hash or not np.array_equal(saved['node_ids'], node_ids):
+                return None
+            return saved['coordinates']
+    except (OSError, KeyError, ValueError):
+        return None
+
+def save_graph_layout(layout_path, content_hash, node_ids, coordinates):
+    """Write a layout sidecar through a temporary file so a concurrent reader never sees a partial layout"""
+    fd, temporary_path = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(layout_path) or '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, content_hash=content_hash, node_ids=node_ids, coordinates=coordinates)
+        os.replace(temporary_path, layout_path)
+    except OSError as e:
+        print(f"Could not save layout {layout_path}: {str(e)}")
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+def compute_graph_layout(edges):
+    """(node_ids, coordinates) of a pivot MDS layout of an edge table refined by force_layout"""
+    node_index = edges.node_index()
+    adjacency = edges.adjacency()
+    initial = component_layout(adjacency.offsets, adjacency.neighbors,
+                               node_index.sources, node_index.targets, len(node_index))
+    return node_index.node_ids, force_layout(node_index.sources, node_index.targets, initial, LAYOUT_ITERATIONS)
+
+def read_graph_layout(dataset_path):
+    """
+    Return (node_ids, coordinates) of a force-directed layout of the whole dataset.
 
-# Add a function to generate random graphs
-def generate_random_graph(min_nodes=8, max_nodes=20):
-    """Generate a random graph with given parameters"""
+    The layout is computed once (pivot MDS, then force_layout refinement) and
+    saved next to the dataset, keyed by the content hash of the loaded file, so
+    later runs and other processes only read it back; convert_datasets.py
+    precomputes it. Only requests for the same dataset wait on a computation.
+    """
+    graph = graph_cache.get(dataset_path)
+    with layout_locks(dataset_path), timed_stage('layout'):
+        if 'layout' in graph:
+            return graph['layout']
+        
+        edges = graph['edges']
+        node_index = edges.node_index()
+        content_hash = layout_content_hash(dataset_path)
+        layout_path = layout_path_for(dataset_path)
+        coordinates = load_graph_layout(layout_path, content_hash, node_index.node_ids)
+        
+        if coordinates is None:
+            start_time = time.time()
+            _, coordinates = compute_graph_layout(edges)
+            print(f"Laid out {len(node_index)} nodes in {time.time() - start_time:.2f} seconds")
+            
+            save_graph_layout(layout_path, content_hash, node_index.node_ids, coordinates)
+        
+        graph['layout'] = (node_index.node_ids, coordinates)
+        return graph['layout']
+
+def read_graph_tiles(dataset_path):
+    """Return the level-of-detail tiles of a whole dataset, built on the precomputed layout"""
+    graph = graph_cache.get(dataset_path)
+    with tiles_locks(dataset_path):
+        if 'tiles' not in graph:
+            _, coordinates = read_graph_layout(dataset_path)
+            graph['tiles'] = GraphTiles(graph['edges'], coordinates)
+        return graph['tiles']
+
+def generate_random_graph(min_nodes=8, max_nodes=20, seed=None):
+    """Generate a small random graph for step-by-step display; the same seed gives the same graph"""
     print(f"\n{'='*50}")
     print(f"Generating random graph with {min_nodes}-{max_nodes} nodes")
     start_time = time.time()
+    rng = random.Random(seed)
     
     # Generate a random number of nodes
-    num_nodes = random.randint(min_nodes, max_nodes)
+    num_nodes = rng.randint(min_nodes, max_nodes)
     nodes = list(range(1, num_nodes + 1))
     
     # Create a basic connected structure (spanning tree) to ensure graph is connected
@@ -170,7 +616,7 @@ def generate_random_graph(min_nodes=8, max_nodes=20):
     
     # First connect all nodes in a path to ensure basic connectivity
     for i in range(len(nodes) - 1):
-        weight = round(random.uniform(1.0, 50.0), 2)
+        weight = round(rng.uniform(1.0, 50.0), 2)
         edges.append({
             'id': edge_id,
             'source': nodes[i],
@@ -178,28 +624,30 @@ def generate_random_graph(min_nodes=8, max_nodes=20):
             'distance': weight
         })
         edge_id += 1
+    pairs = {(e['source'], e['target']) for e in edges}
     
     # Add some random edges to create cycles (ensuring at least one cycle)
     min_extra_edges = max(1, num_nodes // 4)  # At least 1 extra edge to create a cycle
     max_extra_edges = num_nodes // 2 + min_extra_edges
-    num_extra_edges = random.randint(min_extra_edges, max_extra_edges)
+    num_extra_edges = rng.randint(min_extra_edges, max_extra_edges)
     
     for _ in range(num_extra_edges):
-        source = random.choice(nodes)
-        target = random.choice(nodes)
+        source = rng.choice(nodes)
+        target = rng.choice(nodes)
         
         # Ensure we're not creating a self-loop or duplicate edge
-        while source == target or any(e['source'] == source and e['target'] == target for e in edges):
-            source = random.choice(nodes)
-            target = random.choice(nodes)
+        while source == target or (source, target) in pairs:
+            source = rng.choice(nodes)
+            target = rng.choice(nodes)
         
-        weight = round(random.uniform(1.0, 50.0), 2)
+        weight = round(rng.uniform(1.0, 50.0), 2)
         edges.append({
             'id': edge_id,
             'source': source,
             'target': target,
             'distance': weight
         })
+        pairs.add((source, target))
         edge_id += 1
     
     end_time = time.time()
@@ -208,102 +656,104 @@ def generate_random_graph(min_nodes=8, max_nodes=20):
     print("="*50 + "\n")
     
     return {
-        'nodes': [{'id': node} for node in nodes],
-        'edges': edges
+        'nodes': np.array(nodes, dtype=np.int64),
+        'edges': EdgeTable.from_dicts(edges)
     }
 
-def prim_mst_with_steps(edges):
-    """Implementation of Prim's algorithm with step tracking for visualization"""
-    print("Starting Prim's Algorithm...")
-    start_time = time.time()
-    
-    # Build adjacency list
-    graph = defaultdict(list)
-    nodes = set()
-    
-    for edge in edges:
-        source = edge['source']
-        target = edge['target']
-        weight = edge['distance']
-        edge_id = edge['id']
+generated_lock = threading.Lock()
+
+def generated_dataset_path(num_nodes, seed=0, kind='grid'):
+    """
+    Path of a seeded synthetic road network in the database/*.txt format,
+    generating it (and its layout sidecar from the true node positions) on first use.
+    """
+    dataset_path = os.path.join(GENERATED_DIR, f'{kind}_{num_nodes}_{seed}.txt')
+    with generated_lock:
+        if os.path.exists(dataset_path):
+            return dataset_path
         
-        graph[source].append((weight, edge_id, source, target))
-        graph[target].append((weight, edge_id, target, source))
+        print(f"Generating {kind} road network with {num_nodes} nodes (seed {seed})...")
+        start_time = time.time()
+        sources, targets, weights, coordinates = road_network(num_nodes, seed, kind)
+        edges = EdgeTable(np.arange(len(sources), dtype=np.int64), sources, targets, weights)
         
-        nodes.add(source)
-        nodes.add(target)
-    
-    num_nodes = len(nodes)
-    visited = {node: False for node in nodes}
-    min_heap = []
-    steps = []
-    mst_edges = []
-    total_weight = 0
-    edges_processed = 0
-    
-    # Start from the first node in the graph
-    start_node = edges[0]['source']
-    visited[start_node] = True
-    
-    # Add edges from the starting node to the heap
-    for weight, edge_id, u, v in graph[start_node]:
-        heapq.heappush(min_heap, (weight, edge_id, u, v))
-    
-    # Run Prim's algorithm
-    while min_heap and len(mst_edges) < num_nodes - 1:
-        weight, edge_id, u, v = heapq.heappop(min_heap)
-        edges_processed += 1
-        
-        # Record checking step
-        steps.append({
-            'edge_id': edge_id,
-            'weight': weight,
-            'status': 'checking',
-            'total_weight': total_weight
-        })
+        os.makedirs(GENERATED_DIR, exist_ok=True)
+        temporary_path = dataset_path + '.tmp'
+        write_text_dataset(edges, temporary_path)
+        os.replace(temporary_path, dataset_path)
         
-        if visited[v]:
-            # If target node is already visited, skip this edge
-            steps.append({
-                'edge_id': edge_id,
-                'weight': weight,
-                'status': 'rejected',
-                'total_weight': total_weight
-            })
-            continue
-        
-        # Accept this edge
-        visited[v] = True
-        
-        # Find the actual edge object for the MST result
-        edge_obj = next((e for e in edges if e['id'] == edge_id), None)
-        if edge_obj:
-            mst_edges.append(edge_obj)
-            total_weight += weight
-            
-            steps.append({
-                'edge_id': edge_id,
-                'weight': weight,
-                'status': 'accepted',
-                'total_weight': total_weight
-            })
-            
-            # Add all edges from the newly added node
-            for next_weight, next_edge_id, v_from, v_to in graph[v]:
-                if not visited[v_to]:
-                    heapq.heappush(min_heap, (next_weight, next_edge_id, v_from, v_to))
+        # Every node has an edge, so the layout's node ids are simply 0..num_nodes-1
+        save_graph_layout(layout_path_for(dataset_path), layout_content_hash(dataset_path),
+                          np.arange(num_nodes, dtype=np.int64),
+                          normalize_edge_length(coordinates, sources, targets))
+        print(f"Wrote {len(edges)} edges to {dataset_path} in {time.time() - start_time:.2f} seconds")
+    return dataset_path
+
+def requested_dataset_path(dataset):
+    """
+    File behind a dataset request, or None for the small in-memory generated graph.
+
+    The generated dataset with ?size=N (nodes), ?seed= and ?kind=grid|geometric
+    is a synthetic road network written once to GENERATED_DIR and then served
+    like a bundled dataset. Raises ValueError for invalid parameters.
+    """
+    if dataset != 'generated':
+        return DATASETS[dataset]
+    seed = int(request.args.get('seed', 0))
+    if seed < 0:
+        raise ValueError(f"Invalid seed: {seed}")
+    if 'size' not in request.args:
+        return None
     
-    end_time = time.time()
-    print(f"Prim's Algorithm completed in {end_time - start_time:.2f} seconds")
-    print(f"Edges processed: {edges_processed}")
-    print(f"MST edges: {len(mst_edges)}, Total weight: {total_weight:.2f}")
-    print("="*50 + "\n")
+    num_nodes = int(request.args['size'])
+    if not 2 <= num_nodes <= GENERATED_MAX_NODES:
+        raise ValueError(f"size must be between 2 and {GENERATED_MAX_NODES} nodes")
+    kind = request.args.get('kind', 'grid')
+    if kind not in NETWORK_KINDS:
+        raise ValueError(f"Invalid kind: {kind}")
+    return generated_dataset_path(num_nodes, seed, kind)
+
+@app.before_request
+def start_request_timer():
+    """Time the stages of requests to METRICS_ENDPOINTS, and profile them when ?profile=1"""
+    if request.endpoint not in METRICS_ENDPOINTS:
+        return
+    stage_local.timer = StageTimer()
+    if request.args.get('profile') == '1':
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def finish_request_timer(response):
+    """Record the request's stage timings and attach them as a Server-Timing header"""
+    timer = getattr(stage_local, 'timer', None)
+    if timer is None:
+        return response
+    stage_local.timer = None
     
-    return {
-        'mst_edges': mst_edges,
-        'total_weight': total_weight,
-        'steps': steps
-    }
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profile_path = os.path.join(PROFILE_DIR, f"{request.endpoint}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.prof")
+        profiler.dump_stats(profile_path)
+        response.headers['X-Profile-Path'] = profile_path
+        print(f"Wrote request profile to {profile_path}")
+    
+    bytes_out = 0 if response.is_streamed else response.calculate_content_length() or 0
+    response.headers['Server-Timing'] = timer.server_timing()
+    request_metrics.observe(request.endpoint, timer, response.status_code, bytes_out)
+    return response
+
+@app.teardown_request
+def drop_request_timer(error=None):
+    """Never leak a timer into the next request handled by this thread"""
+    stage_local.timer = None
+
+@app.route('/metrics')
+def metrics():
+    """Per-stage request timings and response sizes in the Prometheus text format"""
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def index():
@@ -321,94 +771,623 @@ def get_graph_data(dataset):
     """Get graph data for visualization"""
     if dataset not in DATASETS:
         return jsonify({'error': 'Invalid dataset'}), 400
+    
+    try:
+        dataset_path = requested_dataset_path(dataset)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
     try:
-        # Handle generated dataset
-        if dataset == 'generated':
-            graph_data = generate_random_graph()
-            return jsonify(graph_data)
-        
-        # Handle regular datasets
-        graph_data = read_graph_data(DATASETS[dataset])
-        return jsonify(graph_data)
+        # Handle the small generated graph
+        if dataset_path is None:
+            graph_data = generate_random_graph(seed=request.args.get('seed', type=int))
+            with timed_stage('layout'):
+                layout = compute_graph_layout(graph_data['edges'])
+            with timed_stage('serialize'):
+                return jsonify(graph_to_json(graph_data, layout))
+        
+        # Handle regular and synthetic datasets, positioned by the precomputed layout
+        graph_data = read_graph_data(dataset_path)
+        layout = read_graph_layout(dataset_path)
+        with timed_stage('serialize'):
+            return jsonify(graph_to_json(graph_data, layout))
     except Exception as e:
         print(f"Error reading graph data: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/tiles/<dataset>')
+def get_graph_tile(dataset):
+    """Nodes and edges of the whole dataset inside a viewport (?x0=&y0=&x1=&y1=), at a detail level that fits max_nodes"""
+    if dataset not in DATASETS or dataset == 'generated':
+        return jsonify({'error': 'Invalid dataset'}), 400
+    
+    try:
+        tiles = read_graph_tiles(DATASETS[dataset])
+        bounds = tiles.bounds
+        x0, y0, x1, y1 = (float(request.args.get(name, default))
+                          for name, default in zip(('x0', 'y0', 'x1', 'y1'), bounds))
+        max_nodes = int(request.args.get('max_nodes', TILE_MAX_NODES))
+        level = int(request.args['level']) if 'level' in request.args else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Error building graph tiles: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+    
+    if level is not None and level < 0:
+        return jsonify({'error': f"Invalid level: {level}"}), 400
+    if max_nodes <= 0:
+        return jsonify({'error': f"Invalid max_nodes: {max_nodes}"}), 400
+    if not all(math.isfinite(bound) for bound in (x0, y0, x1, y1)):
+        return jsonify({'error': 'Viewport bounds must be finite numbers'}), 400
+    
+    try:
+        return jsonify(tiles.tile(x0, y0, x1, y1, max_nodes, level))
+    except Exception as e:
+        print(f"Error building graph tiles: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/cache_stats')
+def cache_stats():
+    """Report parsed-graph cache and MST result store counters"""
+    stats = graph_cache.stats()
+    stats['mst_store'] = mst_store.stats()
+    return jsonify(stats)
+
+def print_external_progress(stage, done, total=None):
+    """Default progress reporter for external_kruskal_mst"""
+    if total:
+        print(f"[external kruskal] {stage}: {done}/{total} ({100.0 * done / total:.1f}%)")
+    else:
+        print(f"[external kruskal] {stage}: {done}")
+
+def iter_sorted_run(records, node_ids, block_records):
+    """Yield (weight, id, source, target, dense source, dense target) from sorted records, block_records at a time"""
+    for lo in range(0, len(records), block_records):
+        block = np.asarray(records[lo:lo + block_records])
+        yield from zip(block['weight'].tolist(), block['id'].tolist(),
+                       block['source'].tolist(), block['target'].tolist(),
+                       np.searchsorted(node_ids, block['source']).tolist(),
+                       np.searchsorted(node_ids, block['target']).tolist())
+
+def iter_edge_chunks(dataset_path, chunk_size):
+    """
+    Yield the dataset's edges as EdgeTable chunks of at most chunk_size() edges,
+    sliced from the memory-mapped binary sidecar when there is one and parsed
+    from the text file otherwise
+    """
+    resolved_path = resolve_dataset_file(dataset_path)
+    if resolved_path != dataset_path:
+        records = load_binary_records(resolved_path)[1]
+        lo = 0
+        while lo < len(records):
+            block = records[lo:lo + chunk_size()]
+            lo += len(block)
+            yield EdgeTable(block['id'], block['source'], block['target'], block['weight'])
+        return
+    
+    with open(dataset_path, 'rb') as f:
+        first_line = 0
+        columns = None
+        while True:
+            block = b''.join(itertools.islice(f, chunk_size()))
+            if not block:
+                break
+            if columns is None:
+                columns = detect_text_columns(block[:COLUMN_SAMPLE_BYTES].splitlines())
+            chunk, line_count = parse_edge_block(block, first_line, columns)
+            first_line += line_count
+            del block
+            yield chunk
+
+def external_kruskal_mst(dataset_path, memory_budget=EXTERNAL_MEMORY_BUDGET,
+                         progress=print_external_progress, progress_every=1000000):
+    """
+    Out-of-core Kruskal: stream the dataset in chunks sized to what memory_budget
+    leaves after the node-id map, sort each chunk by (weight, id) and spill it to
+    a temporary binary run, then k-way merge the runs into a single Union-Find
+    pass. Only the sorted node ids, the Union-Find and the MST itself are held in
+    memory at once, and all of them are counted against the budget. A binary
+    sidecar is read through its memory map, and one pre-sorted by weight is
+    merged directly without spilling runs.
+    """
+    start_time = time.time()
+    node_ids = np.zeros(0, dtype=np.int64)
+    total_edges = 0
+    
+    def node_bytes():
+        return len(node_ids) * EXTERNAL_BYTES_PER_NODE
+    
+    def chunk_size():
+        free = memory_budget - node_bytes()
+        if free < EXTERNAL_BYTES_PER_EDGE:
+            raise MemoryError(f"Memory budget of {memory_budget} bytes is too small for the "
+                              f"{len(node_ids)} nodes seen so far")
+        return free // EXTERNAL_BYTES_PER_EDGE
+    
+    with tempfile.TemporaryDirectory(prefix='mst_runs_') as run_dir:
+        # Phase 1: sorted runs, unless the binary sidecar already is one sorted run
+        resolved_path = resolve_dataset_file(dataset_path)
+        presorted = None
+        if resolved_path != dataset_path:
+            flags, records = load_binary_records(resolved_path)
+            if flags & BINARY_FLAG_SORTED:
+                presorted = records
+        
+        runs = []
+        if presorted is not None:
+            while total_edges < len(presorted):
+                block = presorted[total_edges:total_edges + chunk_size()]
+                node_ids = np.union1d(node_ids, np.concatenate([block['source'], block['target']]))
+                total_edges += len(block)
+                progress('node index', total_edges)
+            if len(presorted):
+                runs.append(presorted)
+        else:
+            for chunk in iter_edge_chunks(dataset_path, chunk_size):
+                order = np.lexsort((chunk.ids, chunk.weights))
+                records = np.empty(len(chunk), dtype=BINARY_RECORD)
+                records['id'] = chunk.ids[order]
+                records['source'] = chunk.sources[order]
+                records['target'] = chunk.targets[order]
+                records['weight'] = chunk.weights[order]
+                
+                run_path = os.path.join(run_dir, f'run_{len(runs)}.bin')
+                records.tofile(run_path)
+                runs.append(np.memmap(run_path, dtype=BINARY_RECORD, mode='r'))
+                node_ids = np.union1d(node_ids, np.concatenate([chunk.sources, chunk.targets]))
+                total_edges += len(chunk)
+                progress('sorted runs', total_edges)
+                del chunk, order, records
+        
+        # Phase 2: k-way merge feeding one Union-Find pass over dense node indices
+        num_nodes = len(node_ids)
+        uf = DenseUnionFind(num_nodes)
+        find = uf.find
+        merge_budget = memory_budget - node_bytes()
+        if merge_budget < max(1, len(runs)) * BINARY_RECORD.itemsize:
+            raise MemoryError(f"Memory budget of {memory_budget} bytes is too small to merge "
+                              f"{len(runs)} runs over {num_nodes} nodes")
+        block_records = max(1, (merge_budget // 2) // (max(1, len(runs)) * BINARY_RECORD.itemsize))
+        
+        mst_ids = []
+        mst_sources = []
+        mst_targets = []
+        mst_weights = []
+        total_weight = 0
+        processed = 0
+        
+        merged = heapq.merge(*(iter_sorted_run(run, node_ids, block_records) for run in runs))
+        for weight, edge_id, source, target, dense_source, dense_target in merged:
+            processed += 1
+            if processed % progress_every == 0:
+                progress('merge', processed, total_edges)
+            
+            root_u = find(dense_source)
+            root_v = find(dense_target)
+            if root_u != root_v:
+                uf.union(root_u, root_v)
+                mst_ids.append(edge_id)
+                mst_sources.append(source)
+                mst_targets.append(target)
+                mst_weights.append(weight)
+                total_weight += weight
+                if len(mst_ids) == num_nodes - 1:
+                    break
+        progress('merge', processed, total_edges)
+        spilled = 0 if presorted is not None else len(runs)
+        del merged, runs, presorted
+    
+    print(f"External Kruskal: {len(mst_ids)} MST edges from {total_edges} edges in "
+          f"{spilled} runs, {time.time() - start_time:.2f} seconds")
+    return {
+        'mst_edges': EdgeTable(mst_ids, mst_sources, mst_targets, mst_weights),
+        'total_weight': total_weight,
+        'edges_processed': processed,
+        'total_edges': total_edges,
+        'runs': spilled
+    }
+
+def complete_kruskal_result(dataset_path, result):
+    """Replace a visualization-subset Kruskal result's MST with the exact MST of the whole dataset"""
+    try:
+        # Reuse the cached parse instead of re-reading the file
+        graph = graph_cache.get(dataset_path)
+        total_lines = graph['total_lines']
+        
+        # If we have more data than our visualization subset
+        if total_lines > VISUALIZATION_EDGE_LIMIT:
+            print(f"Dataset has {total_lines} edges. Processing all of them without visualization steps...")
+            
+            # One global pass; the steps already computed for the subset are kept for display
+            full_result = full_kruskal_mst(graph['edges'])
+            result['mst_edges'] = full_result['mst_edges']
+            result['total_weight'] = full_result['total_weight']
+            print(f"Final MST weight after processing all edges: {full_result['total_weight']:.2f}")
+    
+    except Exception as e:
+        print(f"Warning: Couldn't process the entire dataset: {str(e)}. Using subset result.")
+    
+    return result
+
+def complete_prim_result(dataset_path, result):
+    """Recompute a visualization-subset Prim's result over the whole dataset, without steps"""
+    try:
+        # The cached parse knows the line count, so the remaining edges are never copied
+        total_lines = graph_cache.get(dataset_path)['total_lines']
+        
+        # If we have more data than our visualization subset
+        if total_lines > VISUALIZATION_EDGE_LIMIT:
+            print(f"Dataset has {total_lines} edges. Processing the rest without visualization steps...")
+            
+            # For Prim's, we need to reconstruct the complete graph and reprocess
+            # The cached full dataset already holds both sets of edges and their indexes
+            all_edges = read_all_edges(dataset_path)
+            node_index = all_edges.node_index()
+            row_index = all_edges.row_index()
+            adjacency = all_edges.adjacency()
+            offsets = adjacency.offsets.tolist()
+            neighbors = adjacency.neighbors.tolist()
+            adjacency_weights = adjacency.weights.tolist()
+            adjacency_ids = adjacency.edge_ids.tolist()
+            num_nodes = len(node_index)
+            
+            # Process the full graph but don't overwrite the visualization steps
+            visited = [False] * num_nodes
+            mst_rows = []
+            total_weight = 0
+            
+            # Start from a node we already visited
+            start_node = int(node_index.to_dense(result['mst_edges'].sources[0]))
+            visited[start_node] = True
+            
+            # Use the same priority queue algorithm
+            min_heap = []
+            for slot in range(offsets[start_node], offsets[start_node + 1]):
+                heapq.heappush(min_heap, (adjacency_weights[slot], adjacency_ids[slot],
+                                          start_node, neighbors[slot]))
+            
+            while min_heap:
+                weight, edge_id, u, v = heapq.heappop(min_heap)
+                
+                if visited[v]:
+                    continue
+                
+                # Accept this edge
+                visited[v] = True
+                
+                # Look up the row of the edge
+                mst_rows.append(int(row_index[edge_id]))
+                total_weight += weight
+                
+                # Add all edges from the newly added node
+                for slot in range(offsets[v], offsets[v + 1]):
+                    v_to = neighbors[slot]
+                    if not visited[v_to]:
+                        heapq.heappush(min_heap, (adjacency_weights[slot], adjacency_ids[slot], v, v_to))
+            
+            # Get only the visualized subset of edges for UI display
+            mst_edges = all_edges.take(np.array(mst_rows, dtype=np.int64))
+            viz_mst_edges = mst_edges.take(mst_edges.ids < VISUALIZATION_EDGE_LIMIT)
+            
+            # Update result with correct total weight but keep viz steps
+            result['total_weight'] = total_weight
+            result['mst_edges'] = viz_mst_edges
+            print(f"Final MST weight after processing all edges: {total_weight:.2f}")
+    
+    except Exception as e:
+        print(f"Warning: Couldn't process the entire dataset: {str(e)}. Using subset result.")
+    
+    return result
+
+def complete_boruvka_result(dataset_path, result, workers=BORUVKA_WORKERS):
+    """Replace a visualization-subset Boruvka result's MST with a parallel Boruvka pass over the whole dataset"""
+    try:
+        # Reuse the cached parse instead of re-reading the file
+        graph = graph_cache.get(dataset_path)
+        total_lines = graph['total_lines']
+        
+        if total_lines > VISUALIZATION_EDGE_LIMIT:
+            print(f"Dataset has {total_lines} edges. Processing all of them with {workers} workers...")
+            start_time = time.time()
+            edges = graph['edges']
+            node_index = edges.node_index()
+            rows = boruvka_mst(node_index.sources, node_index.targets, edges.weights,
+                               len(node_index), workers=workers)
+            mst_edges = edges.take(rows)
+            result['mst_edges'] = mst_edges
+            result['total_weight'] = float(mst_edges.weights.sum())
+            print(f"Final MST weight after processing all edges: {result['total_weight']:.2f} "
+                  f"({time.time() - start_time:.2f} seconds)")
+    
+    except Exception as e:
+        print(f"Warning: Couldn't process the entire dataset: {str(e)}. Using subset result.")
+    
+    return result
+
+# Per-dataset MSTs kept in memory and updated by the /mst/<dataset>/... endpoints
+dynamic_msts = {}
+dynamic_mst_lock = threading.Lock()
+
+def get_dynamic_mst(dataset):
+    """Return the dataset's DynamicMST, building it from a whole-dataset Kruskal MST on first use (caller holds the lock)"""
+    if dataset not in dynamic_msts:
+        all_edges = read_all_edges(DATASETS[dataset])
+        result = full_kruskal_mst(all_edges)
+        dynamic_msts[dataset] = DynamicMST(
+            zip(all_edges.ids.tolist(), all_edges.sources.tolist(),
+                all_edges.targets.tolist(), all_edges.weights.tolist()),
+            result['mst_edges'].ids.tolist()
+        )
+    return dynamic_msts[dataset]
+
+def finite_distance(value):
+    """Parse a road distance from a request payload, rejecting NaN and infinities"""
+    distance = float(value)
+    if not math.isfinite(distance):
+        raise ValueError(f"Invalid distance: {value}")
+    return distance
+
+def update_dynamic_mst(dataset, operation):
+    """Apply operation(mst, payload) to the dataset's DynamicMST and report the change as JSON"""
+    if dataset not in DATASETS or dataset == 'generated':
+        return jsonify({'error': 'Invalid dataset'}), 400
+    
+    payload = request.get_json(silent=True) or {}
+    try:
+        with dynamic_mst_lock:
+            mst = get_dynamic_mst(dataset)
+            changes = operation(mst, payload)
+            changes.update(mst.summary())
+        return jsonify(changes)
+    except KeyError as e:
+        return jsonify({'error': f'Missing field: {str(e)}'}), 400
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Error updating MST: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+def requested_engine(engines):
+    """Return the step generator named by the ?engine= query parameter, or None if unknown"""
+    return engines.get(request.args.get('engine', 'heap'))
+
+def trace_interval(args):
+    """(keyframe interval, error message): the interval for ?trace=keyframes[&keyframe_every=N], 0 for ?trace=full"""
+    trace = args.get('trace', 'full')
+    if trace == 'full':
+        return 0, None
+    if trace != 'keyframes':
+        return None, f"Invalid trace: {trace}"
+    keyframe_every = args.get('keyframe_every', TRACE_KEYFRAME_INTERVAL)
+    try:
+        interval = int(keyframe_every)
+    except ValueError:
+        interval = 0
+    if interval <= 0:
+        return None, f"Invalid keyframe_every: {keyframe_every}"
+    return interval, None
+
+def requested_memory_budget():
+    """Byte budget from the ?memory_mb= query parameter, or None if it is not a positive number"""
+    try:
+        memory_mb = float(request.args.get('memory_mb', EXTERNAL_MEMORY_BUDGET / 2**20))
+    except ValueError:
+        return None
+    return int(memory_mb * 2**20) if math.isfinite(memory_mb) and memory_mb > 0 else None
+
+def requested_workers():
+    """Worker count from the ?workers= query parameter, or None if it is not a positive integer"""
+    try:
+        workers = int(request.args.get('workers', BORUVKA_WORKERS))
+    except ValueError:
+        return None
+    return workers if workers > 0 else None
+
+def stream_mst_steps(step_generator, complete=None):
+    """Yield newline-delimited JSON: one line per step, then one line holding the MST result"""
+    try:
+        stream = StepStream(step_generator)
+        batch = []
+        for step in stream:
+            batch.append(json.dumps(step))
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield '\n'.join(batch) + '\n'
+                batch = []
+        if batch:
+            yield '\n'.join(batch) + '\n'
+        
+        result = stream.result
+        if complete is not None:
+            result = complete(result)
+        yield json.dumps(result_to_json(result)) + '\n'
+    except Exception as e:
+        print(f"Error streaming MST steps: {str(e)}")
+        yield json.dumps({'error': str(e)}) + '\n'
+
+def mst_run(dataset_path, algorithm, workers=BORUVKA_WORKERS):
+    """Step generator over the visualization subset, and the function completing its result, for an algorithm key"""
+    family, _, engine = algorithm.partition(':')
+    edges = read_graph_data(dataset_path)['edges']
+    if family == 'kruskal':
+        return KRUSKAL_ENGINES[engine](edges), lambda result: complete_kruskal_result(dataset_path, result)
+    if family == 'prims':
+        return PRIM_ENGINES[engine](edges), lambda result: complete_prim_result(dataset_path, result)
+    if family == 'boruvka':
+        return boruvka_steps(edges), lambda result: complete_boruvka_result(dataset_path, result, workers)
+    raise ValueError(f"Unknown algorithm: {algorithm}")
+
+def compute_mst_result(dataset_path, algorithm, workers=BORUVKA_WORKERS):
+    """Run an algorithm key over a dataset: steps for the visualization subset, MST for the whole file"""
+    with timed_stage('mst'):
+        step_generator, complete = mst_run(dataset_path, algorithm, workers)
+        return complete(collect_steps(step_generator))
+
+# Algorithm keys understood by compute_mst_result and the result store
+MST_ALGORITHMS = ([f'kruskal:{engine}' for engine in KRUSKAL_ENGINES] +
+                  [f'prims:{engine}' for engine in PRIM_ENGINES] +
+                  ['boruvka'])
+
+def stored_mst_result(dataset_path, algorithm, compute=None):
+    """Serve a result from the persistent store, computing and storing it on a miss"""
+    with timed_stage('store'):
+        result = mst_store.get(dataset_path, algorithm)
+    if result is None:
+        with timed_stage('mst'):
+            result = compute() if compute is not None else compute_mst_result(dataset_path, algorithm)
+        with timed_stage('store'):
+            mst_store.put(dataset_path, algorithm, result)
+    return result
+
+def stored_steps(result):
+    """Replay a stored result as a step generator"""
+    yield from result['steps']
+    return {key: value for key, value in result.items() if key != 'steps'}
+
+def recorded_steps(step_generator, steps):
+    """Pass steps through while appending them to a list"""
+    stream = StepStream(step_generator)
+    for step in stream:
+        steps.append(step)
+        yield step
+    return stream.result
+
+def stream_result(result, keyframe_interval=0):
+    """NDJSON stream replaying a complete result's steps"""
+    return stream_mst_steps(keyframe_steps(stored_steps(result), keyframe_interval))
+
+def stream_stored_mst(dataset_path, algorithm, workers=BORUVKA_WORKERS, keyframe_interval=0):
+    """NDJSON stream of a stored result, or of a fresh run that is stored with its full trace once it completes"""
+    result = mst_store.get(dataset_path, algorithm)
+    if result is not None:
+        return stream_result(result, keyframe_interval)
+    
+    step_generator, complete = mst_run(dataset_path, algorithm, workers)
+    steps = []
+    def complete_and_store(result):
+        result = complete(result)
+        mst_store.put(dataset_path, algorithm, dict(result, steps=steps))
+        return result
+    return stream_mst_steps(keyframe_steps(recorded_steps(step_generator, steps), keyframe_interval),
+                            complete_and_store)
+
+def run_mst_job(job):
+    """Compute a /jobs result through the store, reporting visualization-subset progress on the job"""
+    dataset_path = DATASETS[job['dataset']]
+    algorithm = job['algorithm']
+    result = mst_store.get(dataset_path, algorithm)
+    components = len(read_graph_data(dataset_path)['edges'].node_index())
+    job['subset_components_remaining'] = components
+    if result is not None:
+        # Served from the store: report the subset run's final counts
+        statuses = [step['status'] for step in result['steps']]
+        job['subset_edges_processed'] = statuses.count('checking')
+        job['subset_components_remaining'] = components - statuses.count('accepted')
+    else:
+        step_generator, complete = mst_run(dataset_path, algorithm)
+        
+        stream = StepStream(step_generator)
+        steps = []
+        for step in stream:
+            steps.append(step)
+            if step['status'] == 'checking':
+                job['subset_edges_processed'] += 1
+            elif step['status'] == 'accepted':
+                components -= 1
+                job['subset_components_remaining'] = components
+        
+        # The whole-dataset pass reports no steps, only its final MST
+        job['status'] = 'completing'
+        result = stream.result
+        result['steps'] = steps
+        result = complete(result)
+        mst_store.put(dataset_path, algorithm, result)
+    return result
+
+mst_jobs = MSTJobQueue(run_mst_job, result_to_json)
+
 @app.route('/run_kruskal/<dataset>')
 def run_kruskal(dataset):
     """Run Kruskal's algorithm and return steps for visualization"""
     if dataset not in DATASETS:
         return jsonify({'error': 'Invalid dataset'}), 400
+    
+    kruskal = requested_engine(KRUSKAL_ENGINES)
+    if kruskal is None:
+        return jsonify({'error': f"Invalid engine: {request.args.get('engine')}"}), 400
+    
+    keyframe_interval, error = trace_interval(request.args)
+    if error is not None:
+        return jsonify({'error': error}), 400
+    
+    memory_budget = requested_memory_budget()
+    if memory_budget is None:
+        return jsonify({'error': f"Invalid memory_mb: {request.args.get('memory_mb')}"}), 400
+    
+    try:
+        dataset_path = requested_dataset_path(dataset)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
     try:
-        # Handle generated dataset
-        if dataset == 'generated':
-            graph_data = generate_random_graph()
-            result = kruskal_mst_with_steps(graph_data['edges'])
-            return jsonify(result)
-        
-        # Handle regular datasets - visualization subset
-        graph_data = read_graph_data(DATASETS[dataset])
-        
-        # Run algorithm on visualization subset (for step visualization)
-        result = kruskal_mst_with_steps(graph_data['edges'])
-        
-        # Check if we need to process more data
-        try:
-            with open(DATASETS[dataset], 'r') as f:
-                total_lines = sum(1 for _ in f)
+        # Handle the small generated graph
+        if dataset_path is None:
+            graph_data = generate_random_graph(seed=request.args.get('seed', type=int))
+            result = collect_steps(kruskal(graph_data['edges'], keyframe_interval=keyframe_interval))
+            return result_response(result)
+        
+        algorithm = f"kruskal:{request.args.get('engine', 'heap')}"
+        if request.args.get('mode') == 'external':
+            # Out-of-core mode: never hold the whole dataset in memory, and always run the
+            # spill/merge pass rather than serve the in-memory result from the store
+            graph_data = read_graph_head(dataset_path)
+            result = collect_steps(kruskal(graph_data['edges'], keyframe_interval=keyframe_interval))
             
-            # If we have more data than our visualization subset
-            if total_lines > 10000:
-                print(f"Dataset has {total_lines} edges. Processing the rest without visualization steps...")
-                
-                # Load the rest of the edges (starting from where we left off)
-                remaining_edges = []
-                with open(DATASETS[dataset], 'r') as f:
-                    # Skip the edges we've already processed
-                    for i in range(10000):
-                        next(f)
-                    
-                    # Read the rest
-                    for i, line in enumerate(f, start=10000):
-                        parts = line.strip().split()
-                        if len(parts) >= 3:
-                            source, target, weight = map(float, parts[:3])
-                            source = int(source)
-                            target = int(target)
-                            
-                            remaining_edges.append({
-                                'id': i,
-                                'source': source,
-                                'target': target,
-                                'distance': weight
-                            })
-                
-                # Continue the MST calculation from where we left off
-                if remaining_edges:
-                    # Get the current UnionFind state from the first phase
-                    uf = UnionFind()
-                    for edge in result['mst_edges']:
-                        uf.union(edge['source'], edge['target'])
-                    
-                    current_total_weight = result['total_weight']
-                    
-                    # Process remaining edges
-                    for edge in sorted(remaining_edges, key=lambda x: x['distance']):
-                        if uf.union(edge['source'], edge['target']):
-                            # Edge accepted into MST
-                            result['mst_edges'].append(edge)
-                            current_total_weight += edge['distance']
-                    
-                    # Update the total weight
-                    result['total_weight'] = current_total_weight
-                    print(f"Final MST weight after processing all edges: {current_total_weight:.2f}")
-        
-        except Exception as e:
-            print(f"Warning: Couldn't process the entire dataset: {str(e)}. Using subset result.")
-        
-        return jsonify(result)
+            try:
+                full_result = external_kruskal_mst(dataset_path, memory_budget=memory_budget)
+            except MemoryError as e:
+                return jsonify({'error': str(e)}), 400
+            result['mst_edges'] = full_result['mst_edges']
+            result['total_weight'] = full_result['total_weight']
+            return result_response(result)
+        
+        # Steps for the visualization subset and the whole-dataset MST, computed once per dataset version
+        result = stored_mst_result(dataset_path, algorithm)
+        
+        return result_response(traced_result(result, keyframe_interval))
+        
+    except Exception as e:
+        print(f"Error running Kruskal's algorithm: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/stream_kruskal/<dataset>')
+def stream_kruskal(dataset):
+    """Run Kruskal's algorithm and stream steps as newline-delimited JSON while they are generated"""
+    if dataset not in DATASETS:
+        return jsonify({'error': 'Invalid dataset'}), 400
+    
+    kruskal = requested_engine(KRUSKAL_ENGINES)
+    if kruskal is None:
+        return jsonify({'error': f"Invalid engine: {request.args.get('engine')}"}), 400
+    
+    keyframe_interval, error = trace_interval(request.args)
+    if error is not None:
+        return jsonify({'error': error}), 400
+    
+    try:
+        dataset_path = requested_dataset_path(dataset)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        if dataset_path is None:
+            edges = generate_random_graph(seed=request.args.get('seed', type=int))['edges']
+            return Response(stream_mst_steps(kruskal(edges, keyframe_interval=keyframe_interval)),
+                            mimetype='application/x-ndjson')
+        
+        algorithm = f"kruskal:{request.args.get('engine', 'heap')}"
+        return Response(stream_stored_mst(dataset_path, algorithm, keyframe_interval=keyframe_interval),
+                        mimetype='application/x-ndjson')
         
     except Exception as e:
         print(f"Error running Kruskal's algorithm: {str(e)}")
@@ -419,128 +1398,183 @@ def run_prims(dataset):
     """Run Prim's algorithm and return steps for visualization"""
     if dataset not in DATASETS:
         return jsonify({'error': 'Invalid dataset'}), 400
+    
+    prim = requested_engine(PRIM_ENGINES)
+    if prim is None:
+        return jsonify({'error': f"Invalid engine: {request.args.get('engine')}"}), 400
+    
+    keyframe_interval, error = trace_interval(request.args)
+    if error is not None:
+        return jsonify({'error': error}), 400
+    
+    try:
+        dataset_path = requested_dataset_path(dataset)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
     try:
-        # Handle generated dataset
-        if dataset == 'generated':
-            graph_data = generate_random_graph()
-            result = prim_mst_with_steps(graph_data['edges'])
-            return jsonify(result)
-        
-        # Handle regular datasets - visualization subset
-        graph_data = read_graph_data(DATASETS[dataset])
-        
-        # Run algorithm on visualization subset (for step visualization)
-        result = prim_mst_with_steps(graph_data['edges'])
-        
-        # Check if we need to process more data
-        try:
-            with open(DATASETS[dataset], 'r') as f:
-                total_lines = sum(1 for _ in f)
-            
-            # If we have more data than our visualization subset
-            if total_lines > 10000:
-                print(f"Dataset has {total_lines} edges. Processing the rest without visualization steps...")
-                
-                # Load the rest of the edges (starting from where we left off)
-                remaining_edges = []
-                with open(DATASETS[dataset], 'r') as f:
-                    # Skip the edges we've already processed
-                    for i in range(10000):
-                        next(f)
-                    
-                    # Read the rest
-                    for i, line in enumerate(f, start=10000):
-                        parts = line.strip().split()
-                        if len(parts) >= 3:
-                            source, target, weight = map(float, parts[:3])
-                            source = int(source)
-                            target = int(target)
-                            
-                            remaining_edges.append({
-                                'id': i,
-                                'source': source,
-                                'target': target,
-                                'distance': weight
-                            })
-                
-                # For Prim's, we need to reconstruct the complete graph and reprocess
-                if remaining_edges:
-                    # Combine both sets of edges
-                    all_edges = graph_data['edges'] + remaining_edges
-                    
-                    # Build adjacency list
-                    graph = defaultdict(list)
-                    nodes = set()
-                    
-                    for edge in all_edges:
-                        source = edge['source']
-                        target = edge['target']
-                        weight = edge['distance']
-                        edge_id = edge['id']
-                        
-                        graph[source].append((weight, edge_id, source, target))
-                        graph[target].append((weight, edge_id, target, source))
-                        
-                        nodes.add(source)
-                        nodes.add(target)
-                    
-                    # Get the currently visualized MST nodes
-                    visualized_nodes = set()
-                    for edge in result['mst_edges']:
-                        visualized_nodes.add(edge['source'])
-                        visualized_nodes.add(edge['target'])
-                    
-                    # Process the full graph but don't overwrite the visualization steps
-                    visited = {node: False for node in nodes}
-                    mst_edges = []
-                    total_weight = 0
-                    
-                    # Start from a node we already visited
-                    start_node = next(iter(visualized_nodes))
-                    visited[start_node] = True
-                    
-                    # Use the same priority queue algorithm
-                    min_heap = []
-                    for weight, edge_id, u, v in graph[start_node]:
-                        heapq.heappush(min_heap, (weight, edge_id, u, v))
-                    
-                    while min_heap:
-                        weight, edge_id, u, v = heapq.heappop(min_heap)
-                        
-                        if visited[v]:
-                            continue
-                        
-                        # Accept this edge
-                        visited[v] = True
-                        
-                        # Find the actual edge object
-                        edge_obj = next((e for e in all_edges if e['id'] == edge_id), None)
-                        if edge_obj:
-                            mst_edges.append(edge_obj)
-                            total_weight += weight
-                            
-                            # Add all edges from the newly added node
-                            for next_weight, next_edge_id, v_from, v_to in graph[v]:
-                                if not visited[v_to]:
-                                    heapq.heappush(min_heap, (next_weight, next_edge_id, v_from, v_to))
-                    
-                    # Get only the visualized subset of edges for UI display
-                    viz_mst_edges = [edge for edge in mst_edges if edge['id'] < 10000]
-                    
-                    # Update result with correct total weight but keep viz steps
-                    result['total_weight'] = total_weight
-                    result['mst_edges'] = viz_mst_edges
-                    print(f"Final MST weight after processing all edges: {total_weight:.2f}")
-        
-        except Exception as e:
-            print(f"Warning: Couldn't process the entire dataset: {str(e)}. Using subset result.")
-        
-        return jsonify(result)
+        # Handle the small generated graph
+        if dataset_path is None:
+            graph_data = generate_random_graph(seed=request.args.get('seed', type=int))
+            result = collect_steps(prim(graph_data['edges'], keyframe_interval=keyframe_interval))
+            return result_response(result)
+        
+        # Steps for the visualization subset and the whole-dataset MST, computed once per dataset version
+        result = stored_mst_result(dataset_path, f"prims:{request.args.get('engine', 'heap')}")
+        
+        return result_response(traced_result(result, keyframe_interval))
+        
+    except Exception as e:
+        print(f"Error running Prim's algorithm: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/stream_prims/<dataset>')
+def stream_prims(dataset):
+    """Run Prim's algorithm and stream steps as newline-delimited JSON while they are generated"""
+    if dataset not in DATASETS:
+        return jsonify({'error': 'Invalid dataset'}), 400
+    
+    prim = requested_engine(PRIM_ENGINES)
+    if prim is None:
+        return jsonify({'error': f"Invalid engine: {request.args.get('engine')}"}), 400
+    
+    keyframe_interval, error = trace_interval(request.args)
+    if error is not None:
+        return jsonify({'error': error}), 400
+    
+    try:
+        dataset_path = requested_dataset_path(dataset)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        if dataset_path is None:
+            edges = generate_random_graph(seed=request.args.get('seed', type=int))['edges']
+            return Response(stream_mst_steps(prim(edges, keyframe_interval=keyframe_interval)),
+                            mimetype='application/x-ndjson')
+        
+        algorithm = f"prims:{request.args.get('engine', 'heap')}"
+        return Response(stream_stored_mst(dataset_path, algorithm, keyframe_interval=keyframe_interval),
+                        mimetype='application/x-ndjson')
         
     except Exception as e:
         print(f"Error running Prim's algorithm: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/run_boruvka/<dataset>')
+def run_boruvka(dataset):
+    """Run Boruvka's algorithm and return steps for visualization"""
+    if dataset not in DATASETS:
+        return jsonify({'error': 'Invalid dataset'}), 400
+    
+    workers = requested_workers()
+    if workers is None:
+        return jsonify({'error': f"Invalid workers: {request.args.get('workers')}"}), 400
+    
+    try:
+        dataset_path = requested_dataset_path(dataset)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        # Handle the small generated graph
+        if dataset_path is None:
+            graph_data = generate_random_graph(seed=request.args.get('seed', type=int))
+            result = boruvka_mst_with_steps(graph_data['edges'])
+            return result_response(result)
+        
+        # The visualization subset runs in one process; the worker pool handles the whole dataset
+        result = stored_mst_result(dataset_path, 'boruvka',
+                                   lambda: compute_mst_result(dataset_path, 'boruvka', workers))
+        
+        return result_response(result)
+        
+    except Exception as e:
+        print(f"Error running Boruvka's algorithm: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/stream_boruvka/<dataset>')
+def stream_boruvka(dataset):
+    """Run Boruvka's algorithm and stream steps as newline-delimited JSON while they are generated"""
+    if dataset not in DATASETS:
+        return jsonify({'error': 'Invalid dataset'}), 400
+    
+    workers = requested_workers()
+    if workers is None:
+        return jsonify({'error': f"Invalid workers: {request.args.get('workers')}"}), 400
+    
+    try:
+        dataset_path = requested_dataset_path(dataset)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        if dataset_path is None:
+            edges = generate_random_graph(seed=request.args.get('seed', type=int))['edges']
+            return Response(stream_mst_steps(boruvka_steps(edges)), mimetype='application/x-ndjson')
+        
+        return Response(stream_stored_mst(dataset_path, 'boruvka', workers), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        print(f"Error running Boruvka's algorithm: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/mst/<dataset>')
+def dynamic_mst_summary(dataset):
+    """Report the total weight and size of the dataset's incrementally maintained MST"""
+    if dataset not in DATASETS or dataset == 'generated':
+        return jsonify({'error': 'Invalid dataset'}), 400
+    
+    try:
+        with dynamic_mst_lock:
+            return jsonify(get_dynamic_mst(dataset).summary())
+    except Exception as e:
+        print(f"Error building MST: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/mst/<dataset>/insert_edge', methods=['POST'])
+def dynamic_mst_insert_edge(dataset):
+    """Add a road {'source', 'target', 'distance', optional 'id'} and update the MST"""
+    return update_dynamic_mst(dataset, lambda mst, edge: mst.insert_edge(
+        int(edge['source']), int(edge['target']), finite_distance(edge['distance']),
+        int(edge['id']) if 'id' in edge else None
+    ))
+
+@app.route('/mst/<dataset>/update_weight', methods=['POST'])
+def dynamic_mst_update_weight(dataset):
+    """Change the distance of road {'id', 'distance'} and update the MST"""
+    return update_dynamic_mst(dataset, lambda mst, edge: mst.update_weight(
+        int(edge['id']), finite_distance(edge['distance'])
+    ))
+
+@app.route('/mst/<dataset>/delete_edge', methods=['POST'])
+def dynamic_mst_delete_edge(dataset):
+    """Remove road {'id'} and update the MST"""
+    return update_dynamic_mst(dataset, lambda mst, edge: mst.delete_edge(int(edge['id'])))
+
+@app.route('/jobs', methods=['POST'])
+def submit_mst_job():
+    """Start a background MST run for {'dataset', 'algorithm'} or join the identical one in progress"""
+    payload = request.get_json(silent=True) or {}
+    dataset = payload.get('dataset')
+    algorithm = payload.get('algorithm', 'kruskal:heap')
+    if dataset not in DATASETS or dataset == 'generated':
+        return jsonify({'error': 'Invalid dataset'}), 400
+    if algorithm not in MST_ALGORITHMS:
+        return jsonify({'error': f"Invalid algorithm: {algorithm}"}), 400
+    
+    job, created = mst_jobs.submit(dataset, algorithm)
+    response = mst_jobs.describe(job)
+    response['created'] = created
+    return jsonify(response), 202
+
+@app.route('/jobs/<job_id>')
+def mst_job_status(job_id):
+    """Report a job's progress, and its MST result once it is done"""
+    job = mst_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(mst_jobs.describe(job))
+
 if __name__ == '__main__':
     app.run(port=5001, debug=True) 
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+ASGI entry point for serving the app to many concurrent clients.
+
+    uvicorn asgi:application --port 5001
+
+The routes that parse datasets or run MSTs (/get_graph_data, /run_*, and
+/stream_*) are handled natively here. Dataset loading, result-store lookups
+and JSON encoding run on a thread pool. Cold MST computations run on a
+process pool, so one slow dataset never stalls the event loop or the other
+requests. Every other route (the page, static files, /cache_stats, /metrics,
+/mst, /jobs), plus the generated dataset, Kruskal's external mode and
+?profile=1 requests, is passed through to the Flask app unchanged. URLs, JSON
+shapes, Server-Timing headers and /metrics are the same in both serving modes.
+"""
+import asyncio
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from algorithm.boruvka import shutdown_executor
+from app import (
+    BORUVKA_WORKERS, DATASETS, METRICS_ENDPOINTS, app, compute_mst_result, encode_steps_binary,
+    graph_to_json, mst_store, read_graph_data, read_graph_layout, request_metrics, result_to_json,
+    stored_mst_result, stream_result, trace_interval
+)
+from stage_timing import StageTimer, run_timed, timed_stage
+from step_engines import KRUSKAL_ENGINES, PRIM_ENGINES, traced_result
+
+# Threads for file I/O, store lookups and JSON encoding
+ASGI_IO_WORKERS = 16
+
+# Processes for cold MST computations
+ASGI_CPU_WORKERS = os.cpu_count() or 1
+
+# /<route>/<dataset> paths handled here instead of by the Flask app
+NATIVE_ROUTE = re.compile(r'^/(get_graph_data|run_kruskal|run_prims|run_boruvka|'
+                          r'stream_kruskal|stream_prims|stream_boruvka)/([^/]+)$')
+
+ENGINES = {'kruskal': KRUSKAL_ENGINES, 'prims': PRIM_ENGINES}
+
+wsgi_application = WsgiToAsgi(app)
+io_executor = ThreadPoolExecutor(max_workers=ASGI_IO_WORKERS, thread_name_prefix='asgi-io')
+cpu_executor = None
+
+
+def compute_stored_result(dataset_path, algorithm, workers):
+    """Process-pool entry point: compute a result through the persistent store"""
+    return stored_mst_result(dataset_path, algorithm,
+                             lambda: compute_mst_result(dataset_path, algorithm, workers))
+
+
+def json_body(payload):
+    """Encode like Flask's jsonify outside debug mode"""
+    with timed_stage('serialize'):
+        return (app.json.dumps(payload, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def graph_body(graph_data, layout):
+    with timed_stage('serialize'):
+        return json_body(graph_to_json(graph_data, layout))
+
+
+def result_body(result, binary, keyframe_interval=0):
+    result = traced_result(result, keyframe_interval)
+    with timed_stage('serialize'):
+        return encode_steps_binary(result) if binary else json_body(result_to_json(result))
+
+
+@contextmanager
+def awaited_stage(timer, name):
+    """Charge the time spent awaiting the enclosed work to a stage of the request timer"""
+    if timer is None:
+        yield
+        return
+    timer.enter(name)
+    try:
+        yield
+    finally:
+        timer.exit()
+
+
+async def run_io(function, *args, timer=None):
+    """Run a blocking function on the I/O pool, charging its stages to the request timer"""
+    return await asyncio.get_running_loop().run_in_executor(io_executor, run_timed, timer, function, *args)
+
+
+async def run_cpu(function, *args):
+    global cpu_executor
+    if cpu_executor is None:
+        cpu_executor = ProcessPoolExecutor(max_workers=ASGI_CPU_WORKERS)
+    return await asyncio.get_running_loop().run_in_executor(cpu_executor, function, *args)
+
+
+async def send_response(send, status, body, content_type, cors, timer=None, route=None):
+    headers = [(b'content-type', content_type.encode('latin1')),
+               (b'content-length', str(len(body)).encode('latin1'))]
+    if cors:
+        headers.append((b'access-control-allow-origin', b'*'))
+    if timer is not None:
+        headers.append((b'server-timing', timer.server_timing().encode('latin1')))
+        request_metrics.observe(route, timer, status, len(body))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, status, payload, cors, timer=None, route=None):
+    body = await run_io(json_body, payload, timer=timer)
+    await send_response(send, status, body, 'application/json', cors, timer, route)
+
+
+async def send_stream(send, chunks, cors):
+    """Send a synchronous chunk generator, pulling every chunk on the I/O pool"""
+    headers = [(b'content-type', b'application/x-ndjson')]
+    if cors:
+        headers.append((b'access-control-allow-origin', b'*'))
+    await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+    while True:
+        chunk = await run_io(next, chunks, None)
+        if chunk is None:
+            break
+        await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+def request_algorithm(family, query):
+    """Algorithm key and Boruvka worker count for a request, or an error message"""
+    workers = BORUVKA_WORKERS
+    if family == 'boruvka':
+        try:
+            workers = int(query.get('workers', BORUVKA_WORKERS))
+        except ValueError:
+            workers = 0
+        if workers <= 0:
+            return None, None, f"Invalid workers: {query.get('workers')}"
+        return 'boruvka', workers, None
+
+    engine = query.get('engine', 'heap')
+    if engine not in ENGINES[family]:
+        return None, None, f"Invalid engine: {query.get('engine')}"
+    return f'{family}:{engine}', workers, None
+
+
+async def handle_native(route, dataset, query, send, cors):
+    # Same stage timings as the Flask hooks record for METRICS_ENDPOINTS
+    timer = StageTimer() if route in METRICS_ENDPOINTS else None
+    if dataset not in DATASETS:
+        await send_json(send, 400, {'error': 'Invalid dataset'}, cors, timer, route)
+        return
+    dataset_path = DATASETS[dataset]
+
+    if route == 'get_graph_data':
+        try:
+            graph_data = await run_io(read_graph_data, dataset_path, timer=timer)
+            layout = await run_io(read_graph_layout, dataset_path, timer=timer)
+            body = await run_io(graph_body, graph_data, layout, timer=timer)
+            await send_response(send, 200, body, 'application/json', cors, timer, route)
+        except Exception as e:
+            print(f"Error reading graph data: {str(e)}")
+            await send_json(send, 500, {'error': str(e)}, cors, timer, route)
+        return
+
+    kind, family = route.split('_', 1)
+    algorithm, workers, error = request_algorithm(family, query)
+    if error is not None:
+        await send_json(send, 400, {'error': error}, cors, timer, route)
+        return
+    # Boruvka never rejects an edge, so only Kruskal and Prim offer the keyframe trace
+    keyframe_interval, error = (0, None) if family == 'boruvka' else trace_interval(query)
+    if error is not None:
+        await send_json(send, 400, {'error': error}, cors, timer, route)
+        return
+
+    try:
+        with awaited_stage(timer, 'store'):
+            result = await run_io(mst_store.get, dataset_path, algorithm, timer=timer)
+        if result is None:
+            # The worker process cannot see this timer, so the whole cold run counts as mst
+            with awaited_stage(timer, 'mst'):
+                result = await run_cpu(compute_stored_result, dataset_path, algorithm, workers)
+
+        if kind == 'stream':
+            # Cold streams wait for the process pool instead of computing on an I/O thread,
+            # then replay the stored result like a warm one
+            await send_stream(send, stream_result(result, keyframe_interval), cors)
+            return
+
+        binary = query.get('format') == 'binary'
+        body = await run_io(result_body, result, binary, keyframe_interval, timer=timer)
+        await send_response(send, 200, body, 'application/octet-stream' if binary else 'application/json',
+                            cors, timer, route)
+    except Exception as e:
+        print(f"Error running {algorithm}: {str(e)}")
+        await send_json(send, 500, {'error': str(e)}, cors, timer, route)
+
+
+async def lifespan(receive, send):
+    global cpu_executor
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if cpu_executor is not None:
+                cpu_executor.shutdown(wait=False, cancel_futures=True)
+            io_executor.shutdown(wait=False, cancel_futures=True)
+            shutdown_executor()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI application: native async handlers for heavy routes, the Flask app for the rest"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+
+    match = NATIVE_ROUTE.match(scope['path'])
+    query = {key: values[-1] for key, values in parse_qs(scope.get('query_string', b'').decode('latin1')).items()}
+
+    # The generated graph, the out-of-core mode and profiled requests keep their Flask handlers
+    if (scope['type'] != 'http' or scope['method'] != 'GET' or match is None or
+            match.group(2) == 'generated' or query.get('mode') == 'external' or query.get('profile') == '1'):
+        await wsgi_application(scope, receive, send)
+        return
+
+    cors = any(name == b'origin' for name, _ in scope.get('headers', []))
+    await handle_native(match.group(1), match.group(2), query, send, cors)
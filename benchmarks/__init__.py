@@ -0,0 +1 @@
+"""Command-line benchmarks for the MST engines in app.py (run from the repository root)."""
@@ -0,0 +1,66 @@
+"""
+Scaling of the parallel Boruvka engine with 1, 2, 4 and 8 worker processes.
+
+The dataset is tiled into disjoint copies (see prims_scaling.tile_edges) so
+there is enough edge-scanning work per round for the shared process pool
+to pay for its shared-memory copies. Worker counts are capped at the pool
+size (one process per CPU), so counts above it re-measure the capped run.
+Every run must produce the same total weight as the single-process run.
+
+    python -m benchmarks.boruvka_scaling [dataset_path] [--copies 32] [--repeat 3]
+
+Measured (San_joa.txt x8, 190999 edges, 1 CPU, best of 2): 1 worker 536 ms,
+and every other count is capped to the same single-process run (410-575 ms,
+noise). Without a measured multi-CPU speedup the app defaults to
+BORUVKA_WORKERS = 1; re-run this on the deployment host before raising it.
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from algorithm.boruvka import POOL_WORKERS, boruvka_mst
+from app import parse_graph_file
+from benchmarks.prims_scaling import tile_edges
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def time_boruvka(edges, workers, repeat):
+    """Best-of-repeat wall time for a full Boruvka MST on the shared process pool"""
+    node_index = edges.node_index()
+    best = float('inf')
+    rows = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = boruvka_mst(node_index.sources, node_index.targets, edges.weights,
+                           len(node_index), workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best, float(edges.weights[rows].sum())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark parallel Boruvka worker scaling")
+    parser.add_argument('dataset', nargs='?', default='database/San_joa.txt')
+    parser.add_argument('--copies', type=int, default=32)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        edges = parse_graph_file(args.dataset)['edges']
+    edges = tile_edges(edges, args.copies)
+    print(f"{args.dataset} x{args.copies}: {len(edges)} edges, {os.cpu_count()} CPUs, best of {args.repeat}")
+
+    baseline = None
+    for workers in WORKER_COUNTS:
+        seconds, total_weight = time_boruvka(edges, workers, args.repeat)
+        if baseline is None:
+            baseline = (seconds, total_weight)
+        assert abs(total_weight - baseline[1]) <= 1e-9 * max(1.0, abs(baseline[1])), "MST weight mismatch"
+        print(f"  {workers} workers ({min(workers, POOL_WORKERS)} used) {seconds * 1000:9.1f} ms  speedup {baseline[0] / seconds:5.2f}x  "
+              f"total_weight={total_weight:.2f}")
+
+
+if __name__ == '__main__':
+    main()
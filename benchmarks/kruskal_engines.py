@@ -0,0 +1,49 @@
+"""
+Compare the Kruskal engines (heap, fast, filter) on a bundled dataset.
+
+    python -m benchmarks.kruskal_engines [dataset_path] [--repeat N]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from app import parse_graph_file
+from step_engines import KRUSKAL_ENGINES, collect_steps
+
+
+def time_engine(engine, edges, repeat):
+    """Best-of-repeat wall time for one step-generator engine, with its progress prints silenced"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = collect_steps(engine(edges))
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Kruskal engines")
+    parser.add_argument('dataset', nargs='?', default='database/San_joa.txt')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        edges = parse_graph_file(args.dataset)['edges']
+    print(f"{args.dataset}: {len(edges)} edges, best of {args.repeat}")
+
+    timings = {}
+    for name, engine in KRUSKAL_ENGINES.items():
+        seconds, result = time_engine(engine, edges, args.repeat)
+        timings[name] = seconds
+        print(f"  {name:<6} {seconds * 1000:9.1f} ms  total_weight={result['total_weight']:.2f}")
+
+    for name, seconds in timings.items():
+        if name != 'heap':
+            print(f"  speedup (heap / {name}): {timings['heap'] / seconds:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Concurrent-client load test against a running server.
+
+Each client repeatedly requests the paths in turn; the script reports
+throughput and latency percentiles per concurrency level. Run it against both
+serving modes to compare them:
+
+    python app.py                                   # Flask dev server on :5001
+    uvicorn asgi:application --port 5001            # ASGI mode
+
+    python -m benchmarks.load_test [--url http://127.0.0.1:5001] [--clients 1 4 16]
+                                   [--requests 200] [--path /run_kruskal/oldenburg ...]
+"""
+import argparse
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_PATHS = [
+    '/get_graph_data/oldenburg',
+    '/run_kruskal/oldenburg',
+    '/run_prims/san_joaquin',
+    '/run_kruskal/san_joaquin?format=binary',
+    '/cache_stats'
+]
+
+
+def fetch(url):
+    """Wall time of one GET, reading the whole body; errors count as failures"""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=300) as response:
+            response.read()
+            ok = response.status == 200
+    except OSError:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_level(base_url, paths, clients, total_requests):
+    """Throughput and latencies for total_requests spread over clients concurrent clients"""
+    urls = [base_url + paths[i % len(paths)] for i in range(total_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+    latencies = np.array([seconds for seconds, _ in results])
+    failures = sum(1 for _, ok in results if not ok)
+    return total_requests / elapsed, latencies, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the MST server with concurrent clients")
+    parser.add_argument('--url', default='http://127.0.0.1:5001')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--path', action='append', dest='paths', help="path to request (repeatable)")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or DEFAULT_PATHS
+    base_url = args.url.rstrip('/')
+
+    # One warm-up pass so the graph cache and result store are populated
+    for path in paths:
+        fetch(base_url + path)
+
+    print(f"{base_url}: {len(paths)} paths, {args.requests} requests per level")
+    for clients in args.clients:
+        throughput, latencies, failures = run_level(base_url, paths, clients, args.requests)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"  {clients:3d} clients {throughput:8.1f} req/s  p50 {p50:7.1f} ms  "
+              f"p95 {p95:7.1f} ms  p99 {p99:7.1f} ms  failures {failures}")
+
+
+if __name__ == '__main__':
+    main()
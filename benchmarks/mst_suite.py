@@ -0,0 +1,304 @@
+"""
+Benchmark suite over every MST implementation, dataset and scale.
+
+Each input is timed in four stages:
+
+    load       parse_graph_file on the text file
+    adjacency  dense node index, CSR adjacency and row index of a fresh table
+    mst        a whole-graph MST run per engine, on a table with the indexes
+               already built (steps are generated but not kept)
+    serialize  json.dumps of the engine's MST in the /run_* response shape
+
+The inputs are the bundled datasets plus seeded synthetic graphs of 10^3 up
+to 10^max-exponent edges. Every engine must agree with full_kruskal_mst on the
+total weight. Results are written as JSON together with the commit and the
+environment they were measured on. Pass a previous file as --baseline to
+compare per-stage times between commits.
+
+    python -m benchmarks.mst_suite [--max-exponent 6] [--repeat 3] [--output PATH]
+    python -m benchmarks.mst_suite --max-exponent 7 --baseline benchmarks/results/mst_suite-<commit>.json
+"""
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from algorithm.boruvka import boruvka_mst
+from algorithm.kruskal import kruskal_mst_with_steps as algorithm_kruskal
+from algorithm.kruskal_algo import Kruskal
+from algorithm.prims import prim_mst_with_steps as algorithm_prims
+from app import DATASETS, external_kruskal_mst, parse_graph_file, result_to_json, write_text_dataset
+from edge_table import EdgeTable
+from step_engines import KRUSKAL_ENGINES, PRIM_ENGINES, StepStream, boruvka_steps, full_kruskal_mst
+
+# Engines that keep every step in a Python list are skipped above this many edges
+STEP_LIST_MAX_EDGES = 10 ** 6
+
+# Relative tolerance when comparing total weights across engines
+WEIGHT_TOLERANCE = 1e-9
+
+RESULTS_DIR = 'benchmarks/results'
+
+
+def consume(step_generator):
+    """Drive a step generator to completion without keeping its steps, and return its result"""
+    stream = StepStream(step_generator)
+    for _ in stream:
+        pass
+    return stream.result
+
+
+def run_step_engine(engine, edges, dataset_path):
+    return consume(engine(edges))
+
+
+def run_boruvka_steps(workers, edges, dataset_path):
+    return consume(boruvka_steps(edges, workers))
+
+
+def run_boruvka_rounds(workers, edges, dataset_path):
+    node_index = edges.node_index()
+    rows = boruvka_mst(node_index.sources, node_index.targets, edges.weights, len(node_index), workers=workers)
+    mst_edges = edges.take(rows)
+    return {'mst_edges': mst_edges, 'total_weight': float(mst_edges.weights.sum())}
+
+
+def run_full_kruskal(edges, dataset_path):
+    return full_kruskal_mst(edges)
+
+
+def run_external_kruskal(edges, dataset_path):
+    return external_kruskal_mst(dataset_path)
+
+
+def run_algorithm_kruskal(edges, dataset_path):
+    result = algorithm_kruskal(edges)
+    del result['steps']
+    return result
+
+
+def run_algorithm_prims(edges, dataset_path):
+    result = algorithm_prims(edges)
+    del result['steps']
+    return result
+
+
+def run_kruskal_algo(edges, dataset_path):
+    node_index = edges.node_index()
+    triples = list(zip(edges.weights.tolist(), node_index.sources.tolist(), node_index.targets.tolist()))
+    mst_edges, total_weight = Kruskal(triples, len(node_index))
+    return {'mst_edges': mst_edges, 'total_weight': total_weight}
+
+
+def mst_engines(workers):
+    """Engine name -> (run(edges, dataset_path), max_edges or None)"""
+    engines = {'kruskal:full': (run_full_kruskal, None)}
+    for name, engine in KRUSKAL_ENGINES.items():
+        engines[f'kruskal:{name}'] = (functools.partial(run_step_engine, engine), None)
+    for name, engine in PRIM_ENGINES.items():
+        engines[f'prims:{name}'] = (functools.partial(run_step_engine, engine), None)
+    engines['boruvka:steps'] = (functools.partial(run_boruvka_steps, workers), None)
+    engines['boruvka:rounds'] = (functools.partial(run_boruvka_rounds, workers), None)
+    engines['kruskal:external'] = (run_external_kruskal, None)
+    engines['algorithm.kruskal'] = (run_algorithm_kruskal, STEP_LIST_MAX_EDGES)
+    engines['algorithm.prims'] = (run_algorithm_prims, STEP_LIST_MAX_EDGES)
+    engines['algorithm.kruskal_algo'] = (run_kruskal_algo, STEP_LIST_MAX_EDGES)
+    return engines
+
+
+def synthetic_edges(num_edges, seed=0):
+    """
+    Connected random graph with num_edges edges over about 0.8 * num_edges nodes.
+
+    A random recursive tree keeps it connected, so Prim's from any start node
+    spans it. The remaining edges join random node pairs.
+    """
+    rng = np.random.default_rng(seed)
+    num_nodes = max(2, min(num_edges + 1, int(num_edges * 0.8)))
+    tree_targets = np.arange(1, num_nodes, dtype=np.int64)
+    tree_sources = rng.integers(0, tree_targets)
+    extra = num_edges - len(tree_targets)
+    extra_sources = rng.integers(0, num_nodes, extra)
+    extra_targets = (extra_sources + rng.integers(1, num_nodes, extra)) % num_nodes
+    weights = np.round(rng.uniform(1.0, 100.0, num_edges), 6)
+    return EdgeTable(
+        np.arange(num_edges, dtype=np.int64),
+        np.concatenate([tree_sources, extra_sources])[:num_edges],
+        np.concatenate([tree_targets, extra_targets])[:num_edges],
+        weights
+    )
+
+
+def indexed_copy(edges):
+    """A fresh table sharing another table's columns and its node, row and adjacency indexes"""
+    table = EdgeTable(edges.ids, edges.sources, edges.targets, edges.weights)
+    table._node_index = edges.node_index()
+    table._row_index = edges.row_index()
+    table._adjacency = edges.adjacency()
+    return table
+
+
+def best_time(function, repeat):
+    """Best-of-repeat wall time of function() with its prints silenced, and its last return value"""
+    best = float('inf')
+    value = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            value = function()
+            best = min(best, time.perf_counter() - start)
+    return best, value
+
+
+def build_adjacency(edges):
+    table = EdgeTable(edges.ids, edges.sources, edges.targets, edges.weights)
+    table.node_index()
+    table.adjacency()
+    table.row_index()
+    return table
+
+
+def serialize(result):
+    """MST result in the JSON shape of the /run_* endpoints"""
+    if isinstance(result['mst_edges'], EdgeTable):
+        result = result_to_json(result)
+    return json.dumps(result)
+
+
+def benchmark_input(name, dataset_path, engines, repeat):
+    """Time every stage and engine on one text dataset; returns result rows"""
+    seconds, graph = best_time(lambda: parse_graph_file(dataset_path), repeat)
+    edges = graph['edges']
+    num_edges = len(edges)
+    adjacency_seconds, edges = best_time(lambda: build_adjacency(graph['edges']), repeat)
+    num_nodes = len(edges.node_index())
+
+    base = {'input': name, 'edges': num_edges, 'nodes': num_nodes}
+    rows = [
+        dict(base, stage='load', engine=None, seconds=seconds),
+        dict(base, stage='adjacency', engine=None, seconds=adjacency_seconds)
+    ]
+    print(f"{name}: {num_edges} edges, {num_nodes} nodes  load {seconds * 1000:.1f} ms  "
+          f"adjacency {adjacency_seconds * 1000:.1f} ms")
+
+    reference = None
+    for engine_name, (run, max_edges) in engines.items():
+        if max_edges is not None and num_edges > max_edges:
+            rows.append(dict(base, stage='mst', engine=engine_name, seconds=None, status='skipped'))
+            print(f"  {engine_name:<22} skipped (over {max_edges} edges)")
+            continue
+
+        seconds, result = best_time(lambda: run(indexed_copy(edges), dataset_path), repeat)
+        serialize_seconds, _ = best_time(lambda: serialize(result), repeat)
+        total_weight = float(result['total_weight'])
+        if reference is None:
+            reference = total_weight
+        weight_ok = abs(total_weight - reference) <= WEIGHT_TOLERANCE * max(1.0, abs(reference))
+
+        rows.append(dict(base, stage='mst', engine=engine_name, seconds=seconds,
+                         total_weight=total_weight, weight_ok=weight_ok, status='ok' if weight_ok else 'mismatch'))
+        rows.append(dict(base, stage='serialize', engine=engine_name, seconds=serialize_seconds))
+        print(f"  {engine_name:<22} mst {seconds * 1000:10.1f} ms  serialize {serialize_seconds * 1000:8.1f} ms  "
+              f"total_weight={total_weight:.2f}{'' if weight_ok else '  WEIGHT MISMATCH'}")
+    return rows
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(rows, baseline_path, max_regression):
+    """Print per-stage time ratios against a previous results file; returns the number of regressions"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(row['input'], row['stage'], row['engine']): row['seconds'] for row in baseline['results']}
+
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit')}):")
+    regressions = 0
+    for row in rows:
+        before = previous.get((row['input'], row['stage'], row['engine']))
+        if not before or not row['seconds']:
+            continue
+        ratio = row['seconds'] / before
+        flag = ''
+        if ratio > 1.0 + max_regression:
+            regressions += 1
+            flag = '  REGRESSION'
+        print(f"  {row['input']:<20} {row['stage']:<10} {row['engine'] or '':<22} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every MST engine across datasets and scales")
+    parser.add_argument('--min-exponent', type=int, default=3, help="smallest synthetic graph, 10^N edges")
+    parser.add_argument('--max-exponent', type=int, default=6, help="largest synthetic graph, 10^N edges (up to 7)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=1, help="Boruvka worker processes")
+    parser.add_argument('--engines', nargs='*', help="only these engine names")
+    parser.add_argument('--no-datasets', action='store_true', help="skip the bundled datasets")
+    parser.add_argument('--output', help=f"results file (default: {RESULTS_DIR}/mst_suite-<commit>.json)")
+    parser.add_argument('--baseline', help="previous results file to compare against")
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help="slowdown ratio over the baseline reported as a regression")
+    args = parser.parse_args(argv)
+
+    engines = mst_engines(args.workers)
+    if args.engines:
+        unknown = set(args.engines) - set(engines)
+        if unknown:
+            parser.error(f"unknown engines: {', '.join(sorted(unknown))}")
+        engines = {name: engines[name] for name in args.engines}
+
+    commit = git_commit()
+    rows = []
+    if not args.no_datasets:
+        for name, dataset_path in DATASETS.items():
+            if dataset_path and os.path.exists(dataset_path):
+                rows.extend(benchmark_input(f'dataset:{name}', dataset_path, engines, args.repeat))
+
+    with tempfile.TemporaryDirectory(prefix='mst_suite_') as data_dir:
+        for exponent in range(args.min_exponent, args.max_exponent + 1):
+            dataset_path = os.path.join(data_dir, f'synthetic_1e{exponent}.txt')
+            write_text_dataset(synthetic_edges(10 ** exponent, args.seed), dataset_path)
+            rows.extend(benchmark_input(f'synthetic:1e{exponent}', dataset_path, engines, args.repeat))
+            os.remove(dataset_path)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"mst_suite-{(commit or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'results': rows
+        }, f, indent=1)
+    print(f"\nWrote {len(rows)} results to {output}")
+
+    mismatches = sum(1 for row in rows if row.get('status') == 'mismatch')
+    if mismatches:
+        print(f"{mismatches} engine runs disagree on the MST weight")
+    regressions = compare(rows, args.baseline, args.max_regression) if args.baseline else 0
+    return 1 if mismatches or regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
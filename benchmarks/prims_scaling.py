@@ -0,0 +1,100 @@
+"""
+Regression check that Prim's stays near-linear on the bundled datasets.
+
+Each dataset is tiled into 1, 2, 4 and 8 disjoint copies chained together by
+one linking edge per copy, so Prim's explores proportionally more of the
+graph at every scale. The log-log slope of time against the number of edges
+Prim's examined must stay below the threshold (O(E log E) fits well below
+it; an O(V*E) lookup lands near 2), otherwise the script exits non-zero.
+
+    python -m benchmarks.prims_scaling [--max-slope 1.4] [--repeat 3]
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+
+from app import parse_graph_file
+from edge_table import EdgeTable
+from step_engines import prim_mst_with_steps
+
+DATASET_PATHS = ['database/Oldenburg.txt', 'database/San_joa.txt']
+COPY_COUNTS = [1, 2, 4, 8]
+
+
+def tile_edges(edges, copies):
+    """Disjoint copies of a table with offset ids, chained through each copy's start node"""
+    id_stride = int(edges.ids.max()) + 1
+    node_stride = int(max(edges.sources.max(), edges.targets.max())) + 1
+    tables = [
+        EdgeTable(edges.ids + c * id_stride, edges.sources + c * node_stride,
+                  edges.targets + c * node_stride, edges.weights)
+        for c in range(copies)
+    ]
+
+    # Prim's starts from the first source, so link that node across copies
+    start = int(edges.sources[0])
+    links = np.arange(copies - 1, dtype=np.int64)
+    tables.append(EdgeTable(
+        copies * id_stride + links,
+        start + links * node_stride,
+        start + (links + 1) * node_stride,
+        np.full(copies - 1, edges.weights.max())
+    ))
+    return EdgeTable.concat(tables)
+
+
+def time_prims(edges, repeat):
+    """Best-of-repeat wall time for Prim's on a fresh copy of the table, and the edges it examined"""
+    best = float('inf')
+    examined = 0
+    for _ in range(repeat):
+        # A new table per run so node/row index construction is timed as well
+        table = EdgeTable(edges.ids, edges.sources, edges.targets, edges.weights)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = prim_mst_with_steps(table)
+            best = min(best, time.perf_counter() - start)
+        examined = sum(1 for step in result['steps'] if step['status'] == 'checking')
+    return best, examined
+
+
+def scaling_slope(sizes, seconds):
+    """Least-squares slope of log(seconds) against log(sizes)"""
+    slope, _ = np.polyfit(np.log(sizes), np.log(seconds), 1)
+    return slope
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that Prim's scales near-linearly")
+    parser.add_argument('--max-slope', type=float, default=1.4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for dataset_path in DATASET_PATHS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            edges = parse_graph_file(dataset_path)['edges']
+
+        sizes = []
+        seconds = []
+        for copies in COPY_COUNTS:
+            tiled = tile_edges(edges, copies)
+            elapsed, examined = time_prims(tiled, args.repeat)
+            sizes.append(max(1, examined))
+            seconds.append(elapsed)
+            print(f"{dataset_path} x{copies}: {len(tiled):>7} edges, {examined:>7} examined  {elapsed * 1000:8.1f} ms")
+
+        slope = scaling_slope(sizes, seconds)
+        status = 'ok' if slope <= args.max_slope else 'FAIL'
+        print(f"{dataset_path}: log-log slope {slope:.2f} (max {args.max_slope}) {status}")
+        failed = failed or slope > args.max_slope
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
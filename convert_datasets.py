@@ -0,0 +1,55 @@
+"""
+Convert whitespace-separated road network datasets into binary sidecars.
+
+The app memory-maps database/<name>.bin instead of re-tokenizing
+database/<name>.txt whenever the binary file is present and not older than
+the text file. It also precomputes each dataset's layout sidecar
+(database/<name>.layout.npz), so the first /get_graph_data request does not
+pay for it. Run this once after adding or updating a dataset:
+
+    python convert_datasets.py                 # every configured dataset
+    python convert_datasets.py oldenburg       # selected datasets
+    python convert_datasets.py --sort          # pre-sort records by weight
+    python convert_datasets.py --no-layout     # skip the layout precomputation
+"""
+import argparse
+import os
+import sys
+
+from app import DATASETS, binary_path_for, parse_graph_file, read_graph_layout, write_binary_dataset
+
+
+def convert_dataset(dataset_path, sort_by_weight=False):
+    """Parse one text dataset and write its binary sidecar"""
+    binary_path = binary_path_for(dataset_path)
+    graph = parse_graph_file(dataset_path)
+    write_binary_dataset(graph, binary_path, sort_by_weight=sort_by_weight)
+    print(f"Wrote {len(graph['edges'])} edges to {binary_path} ({os.path.getsize(binary_path)} bytes)")
+    return binary_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert text datasets into memory-mappable binary files")
+    parser.add_argument('datasets', nargs='*', help="dataset keys from DATASETS (default: all present)")
+    parser.add_argument('--sort', action='store_true', help="store edge records pre-sorted by weight")
+    parser.add_argument('--no-layout', action='store_true', help="don't precompute the layout sidecars")
+    args = parser.parse_args(argv)
+
+    keys = args.datasets or [key for key in DATASETS if key != 'generated']
+    for key in keys:
+        if key not in DATASETS or key == 'generated':
+            print(f"Unknown dataset: {key}")
+            return 1
+        dataset_path = DATASETS[key]
+        if not os.path.exists(dataset_path):
+            print(f"Skipping {key}: {dataset_path} not found")
+            continue
+        convert_dataset(dataset_path, sort_by_weight=args.sort)
+        if not args.no_layout:
+            # The layout is keyed on the freshly written sidecar, so compute it afterwards
+            read_graph_layout(dataset_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Columnar edge storage and the indexes the MST engines share: a dense node
+index, CSR adjacency, an indexed d-ary heap and a dense-index Union-Find.
+EdgeTable builds each index on first use and keeps it with the table.
+"""
+import numpy as np
+
+from stage_timing import timed_stage
+
+# Fixed-width edge record of binary dataset sidecars, external-sort runs and stored MSTs
+BINARY_RECORD = np.dtype([
+    ('id', '<i8'),
+    ('source', '<i8'),
+    ('target', '<i8'),
+    ('weight', '<f8')
+])
+
+class DenseUnionFind:
+    """
+    Union-Find over dense node indices 0..n-1 backed by flat Python lists: the
+    engines call find() once per edge, and list indexing is faster than NumPy
+    element access there. roots() resolves every node at once in NumPy.
+    """
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+    
+    def find(self, x):
+        """Iterative find with path halving"""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    
+    def union(self, x, y):
+        """Union by size"""
+        px, py = self.find(x), self.find(y)
+        if px == py:
+            return False
+        
+        if self.size[px] < self.size[py]:
+            px, py = py, px
+        self.parent[py] = px
+        self.size[px] += self.size[py]
+        return True
+    
+    def roots(self):
+        """Root of every node as a NumPy array, found by pointer jumping instead of per-node finds"""
+        roots = np.array(self.parent, dtype=np.int64)
+        while True:
+            jumped = roots[roots]
+            if np.array_equal(jumped, roots):
+                return roots
+            roots = jumped
+
+class NodeIndex:
+    """Bidirectional mapping between original node ids and dense indices 0..V-1"""
+    def __init__(self, sources, targets):
+        num_edges = len(sources)
+        self.node_ids, endpoints = np.unique(np.concatenate([sources, targets]), return_inverse=True)
+        endpoints = endpoints.reshape(-1).astype(np.int64, copy=False)
+        
+        # Dense endpoints aligned with the rows of the edge table
+        self.sources = endpoints[:num_edges]
+        self.targets = endpoints[num_edges:]
+    
+    def __len__(self):
+        return len(self.node_ids)
+    
+    def to_dense(self, node_ids):
+        """Translate original node ids (all present in the index) to dense indices"""
+        return np.searchsorted(self.node_ids, node_ids)
+    
+    def to_original(self, dense_ids):
+        """Translate dense indices back to original node ids"""
+        return self.node_ids[dense_ids]
+
+class IndexedDaryHeap:
+    """Min-heap of vertex indices with a position index for O(log V) decrease-key"""
+    def __init__(self, capacity, arity=4):
+        self.arity = arity
+        self.heap = []  # vertices in heap order
+        self.heap_keys = []  # keys parallel to heap, so children compare without indirection
+        self.position = [-1] * capacity
+    
+    def __len__(self):
+        return len(self.heap)
+    
+    def push_or_decrease(self, vertex, key):
+        """Insert vertex or lower its key; returns False if its current key is not larger"""
+        pos = self.position[vertex]
+        if pos < 0:
+            self.heap.append(vertex)
+            self.heap_keys.append(key)
+            pos = len(self.heap) - 1
+        elif not key < self.heap_keys[pos]:
+            return False
+        self._sift_up(pos, vertex, key)
+        return True
+    
+    def pop(self):
+        """Remove and return (vertex, key) with the smallest key"""
+        heap, heap_keys = self.heap, self.heap_keys
+        top = heap[0]
+        top_key = heap_keys[0]
+        last = heap.pop()
+        last_key = heap_keys.pop()
+        self.position[top] = -1
+        if heap:
+            self._sift_down(0, last, last_key)
+        return top, top_key
+    
+    def _sift_up(self, pos, vertex, key):
+        heap, heap_keys, position = self.heap, self.heap_keys, self.position
+        arity = self.arity
+        while pos > 0:
+            parent = (pos - 1) // arity
+            if heap_keys[parent] <= key:
+                break
+            heap[pos] = heap[parent]
+            heap_keys[pos] = heap_keys[parent]
+            position[heap[pos]] = pos
+            pos = parent
+        heap[pos] = vertex
+        heap_keys[pos] = key
+        position[vertex] = pos
+    
+    def _sift_down(self, pos, vertex, key):
+        heap, heap_keys, position = self.heap, self.heap_keys, self.position
+        arity = self.arity
+        size = len(heap)
+        while True:
+            first_child = pos * arity + 1
+            if first_child >= size:
+                break
+            children = heap_keys[first_child:first_child + arity]
+            best_key = min(children)
+            if best_key >= key:
+                break
+            best = first_child + children.index(best_key)
+            heap[pos] = heap[best]
+            heap_keys[pos] = best_key
+            position[heap[pos]] = pos
+            pos = best
+        heap[pos] = vertex
+        heap_keys[pos] = key
+        position[vertex] = pos
+
+class CSRAdjacency:
+    """Compressed sparse row adjacency over dense node indices"""
+    def __init__(self, edges):
+        node_index = edges.node_index()
+        num_edges = len(edges)
+        
+        # Every undirected edge appears once in each endpoint's neighbor list
+        owners = np.concatenate([node_index.sources, node_index.targets])
+        order = np.argsort(owners, kind='stable')
+        rows = np.concatenate([np.arange(num_edges, dtype=np.int64)] * 2)[order]
+        
+        self.offsets = np.zeros(len(node_index) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=len(node_index)), out=self.offsets[1:])
+        self.neighbors = np.concatenate([node_index.targets, node_index.sources])[order]
+        self.weights = edges.weights[rows]
+        self.edge_ids = edges.ids[rows]
+        self.rows = rows
+
+class EdgeTable:
+    """Columnar edge storage: parallel id/source/target arrays and a float64 weight array"""
+    def __init__(self, ids, sources, targets, weights):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self._node_index = None
+        self._row_index = None
+        self._adjacency = None
+        self._weight_order = None
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    @classmethod
+    def from_dicts(cls, edges):
+        """Build a table from {'id', 'source', 'target', 'distance'} dictionaries"""
+        return cls(
+            [e['id'] for e in edges],
+            [e['source'] for e in edges],
+            [e['target'] for e in edges],
+            [e['distance'] for e in edges]
+        )
+    
+    @classmethod
+    def concat(cls, tables):
+        return cls(
+            np.concatenate([t.ids for t in tables]),
+            np.concatenate([t.sources for t in tables]),
+            np.concatenate([t.targets for t in tables]),
+            np.concatenate([t.weights for t in tables])
+        )
+    
+    def take(self, rows):
+        """Return a new table holding the given row indices (or boolean mask)"""
+        return EdgeTable(self.ids[rows], self.sources[rows], self.targets[rows], self.weights[rows])
+    
+    def head(self, count):
+        """Return the first count rows without copying"""
+        return EdgeTable(self.ids[:count], self.sources[:count], self.targets[:count], self.weights[:count])
+    
+    def node_index(self):
+        """Dense node index for this table, built on first use and kept with the table"""
+        if self._node_index is None:
+            with timed_stage('index'):
+                self._node_index = NodeIndex(self.sources, self.targets)
+        return self._node_index
+    
+    def row_index(self):
+        """Array mapping edge id to row (-1 where absent), built on first use and kept with the table"""
+        if self._row_index is None:
+            # Edge ids are line numbers, so a flat array indexed by id stays compact
+            with timed_stage('index'):
+                size = int(self.ids.max()) + 1 if len(self.ids) else 0
+                rows = np.full(size, -1, dtype=np.int64)
+                rows[self.ids] = np.arange(len(self.ids), dtype=np.int64)
+            self._row_index = rows
+        return self._row_index
+    
+    def adjacency(self):
+        """CSR adjacency for this table, built on first use and kept with the table"""
+        if self._adjacency is None:
+            with timed_stage('index'):
+                self._adjacency = CSRAdjacency(self)
+        return self._adjacency
+    
+    def weight_order(self):
+        """Row order by (weight, edge id), built on first use and kept with the table"""
+        if self._weight_order is None:
+            with timed_stage('index'):
+                self._weight_order = np.lexsort((self.ids, self.weights))
+        return self._weight_order
+    
+    def node_ids(self):
+        """Sorted array of distinct node ids touched by any edge"""
+        return self.node_index().node_ids
+    
+    def to_dicts(self):
+        """Render the rows in the JSON shape expected by the frontend"""
+        return [
+            {'id': edge_id, 'source': source, 'target': target, 'distance': weight}
+            for edge_id, source, target, weight in zip(
+                self.ids.tolist(), self.sources.tolist(), self.targets.tolist(), self.weights.tolist()
+            )
+        ]
@@ -0,0 +1,43 @@
+"""
+Compute the exact Kruskal MST of a dataset that does not fit in memory.
+
+The edge file is streamed in chunks sized to the memory budget; each chunk is
+sorted by weight and spilled to a temporary binary run, and the runs are
+k-way merged into a single Union-Find pass:
+
+    python external_kruskal.py oldenburg                 # dataset key
+    python external_kruskal.py path/to/edges.txt         # any edge file
+    python external_kruskal.py oldenburg --memory-mb 16  # smaller budget, more runs
+"""
+import argparse
+import os
+import sys
+
+from app import DATASETS, EXTERNAL_MEMORY_BUDGET, external_kruskal_mst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core Kruskal MST over a text edge file")
+    parser.add_argument('dataset', help="dataset key from DATASETS or a path to an edge file")
+    parser.add_argument('--memory-mb', type=float, default=EXTERNAL_MEMORY_BUDGET / 2**20,
+                        help="memory budget for sorting chunks (default: %(default)s)")
+    parser.add_argument('--progress-every', type=int, default=1000000,
+                        help="report merge progress every N edges")
+    args = parser.parse_args(argv)
+
+    dataset_path = DATASETS.get(args.dataset, args.dataset)
+    if not dataset_path or not os.path.exists(dataset_path):
+        print(f"Dataset not found: {args.dataset}")
+        return 1
+
+    result = external_kruskal_mst(dataset_path,
+                                  memory_budget=int(args.memory_mb * 2**20),
+                                  progress_every=args.progress_every)
+    print(f"MST weight: {result['total_weight']:.2f} "
+          f"({len(result['mst_edges'])} edges, {result['edges_processed']}/{result['total_edges']} "
+          f"edges merged from {result['runs']} runs)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
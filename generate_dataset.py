@@ -0,0 +1,50 @@
+"""
+Write a seeded synthetic road network in the database/*.txt format.
+
+The same network is served by the app as /<route>/generated?size=N&seed=S&kind=K,
+which generates it into database/generated/ on first use. Use this script to
+write one elsewhere or ahead of time:
+
+    python generate_dataset.py 1000000                           # grid, seed 0
+    python generate_dataset.py 200000 --kind geometric --seed 7
+    python generate_dataset.py 50000 --output database/Synthetic.txt
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from algorithm.generator import NETWORK_KINDS, road_network
+from app import generated_dataset_path, write_text_dataset
+from edge_table import EdgeTable
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic road network dataset")
+    parser.add_argument('nodes', type=int, help="number of intersections")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--kind', choices=NETWORK_KINDS, default='grid')
+    parser.add_argument('--output', help="text file to write (default: the app's database/generated/ path)")
+    args = parser.parse_args(argv)
+
+    if args.nodes < 2 or args.seed < 0:
+        parser.error("nodes must be at least 2 and seed non-negative")
+
+    if args.output is None:
+        dataset_path = generated_dataset_path(args.nodes, args.seed, args.kind)
+        print(f"{dataset_path}: {os.path.getsize(dataset_path)} bytes")
+        return 0
+
+    start_time = time.time()
+    sources, targets, weights, _ = road_network(args.nodes, args.seed, args.kind)
+    edges = EdgeTable(np.arange(len(sources), dtype=np.int64), sources, targets, weights)
+    write_text_dataset(edges, args.output)
+    print(f"Wrote {len(edges)} edges over {args.nodes} nodes to {args.output} "
+          f"in {time.time() - start_time:.2f} seconds")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Level-of-detail tiles over a laid-out dataset for /tiles: a spatial grid
+index per level, with coarser levels built by merging the nodes of each
+grid cell.
+"""
+import threading
+
+import numpy as np
+
+from algorithm.layout import csr_slots
+
+# Average number of nodes per cell of the finest /tiles spatial grid
+TILE_CELL_NODES = 16
+
+# /tiles switches to a coarser level of detail when a viewport holds more nodes than this
+TILE_MAX_NODES = 4000
+
+class SpatialGrid:
+    """Uniform grid index over 2D points: per-cell point lists in CSR order plus a summed-area table of counts"""
+    def __init__(self, points, cell_size):
+        self.points = points
+        self.cell_size = cell_size
+        self.origin = points.min(axis=0) if len(points) else np.zeros(2)
+        cells = np.floor((points - self.origin) / cell_size).astype(np.int64)
+        self.columns, self.rows = (cells.max(axis=0) + 1).tolist() if len(points) else (1, 1)
+        
+        keys = cells[:, 1] * self.columns + cells[:, 0]
+        self.order = np.argsort(keys, kind='stable')
+        counts = np.bincount(keys, minlength=self.columns * self.rows)
+        self.offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        
+        # prefix[r, c] = points in cells above-left of (r, c)
+        self.prefix = np.zeros((self.rows + 1, self.columns + 1), dtype=np.int64)
+        self.prefix[1:, 1:] = counts.reshape(self.rows, self.columns).cumsum(axis=0).cumsum(axis=1)
+    
+    def _cell_range(self, x0, y0, x1, y1):
+        """Inclusive column/row range of the cells overlapping a box, or None if it misses the grid"""
+        c0, r0 = np.floor((np.array([x0, y0]) - self.origin) / self.cell_size).astype(np.int64)
+        c1, r1 = np.floor((np.array([x1, y1]) - self.origin) / self.cell_size).astype(np.int64)
+        c0, r0 = max(int(c0), 0), max(int(r0), 0)
+        c1, r1 = min(int(c1), self.columns - 1), min(int(r1), self.rows - 1)
+        if c0 > c1 or r0 > r1:
+            return None
+        return c0, r0, c1, r1
+    
+    def count(self, x0, y0, x1, y1):
+        """Number of points in the cells overlapping a box (an upper bound for the box itself)"""
+        cells = self._cell_range(x0, y0, x1, y1)
+        if cells is None:
+            return 0
+        c0, r0, c1, r1 = cells
+        prefix = self.prefix
+        return int(prefix[r1 + 1, c1 + 1] - prefix[r0, c1 + 1] - prefix[r1 + 1, c0] + prefix[r0, c0])
+    
+    def query(self, x0, y0, x1, y1):
+        """Indices of the points inside a box"""
+        cells = self._cell_range(x0, y0, x1, y1)
+        if cells is None:
+            return np.zeros(0, dtype=np.int64)
+        c0, r0, c1, r1 = cells
+        
+        # Each grid row contributes one contiguous run of cells
+        candidates = np.concatenate([
+            self.order[self.offsets[row * self.columns + c0]:self.offsets[row * self.columns + c1 + 1]]
+            for row in range(r0, r1 + 1)
+        ])
+        x, y = self.points[candidates, 0], self.points[candidates, 1]
+        return candidates[(x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)]
+
+class TileLevel:
+    """One level of detail: node positions, edges between them and a spatial index over the nodes"""
+    def __init__(self, node_ids, points, node_counts, edge_ids, sources, targets, weights, edge_counts, cell_size):
+        self.node_ids = node_ids
+        self.points = points
+        self.node_counts = node_counts
+        self.edge_ids = edge_ids
+        self.sources = sources
+        self.targets = targets
+        self.weights = weights
+        self.edge_counts = edge_counts
+        self.grid = SpatialGrid(points, cell_size)
+        
+        # Incident edge rows of every node, CSR style
+        owners = np.concatenate([sources, targets])
+        order = np.argsort(owners, kind='stable')
+        self.incident_rows = np.concatenate([np.arange(len(sources), dtype=np.int64)] * 2)[order]
+        self.incident_offsets = np.zeros(len(points) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=len(points)), out=self.incident_offsets[1:])
+    
+    def viewport(self, x0, y0, x1, y1):
+        """Nodes inside a box plus the edges touching them; returns (node indices, edge rows)"""
+        inside = self.grid.query(x0, y0, x1, y1)
+        rows = np.unique(self.incident_rows[csr_slots(self.incident_offsets, inside)])
+        
+        # Edges leaving the box need their outer endpoint too
+        nodes = np.union1d(inside, np.concatenate([self.sources[rows], self.targets[rows]]))
+        return nodes, rows
+
+class GraphTiles:
+    """
+    Level-of-detail pyramid over a laid-out edge table. Level 0 holds the
+    original nodes and edges; level k merges the nodes of each grid cell
+    (cell size doubling per level) into one node at their centroid, with a
+    'count' of merged nodes, and keeps one edge per pair of merged nodes
+    carrying the lightest weight and a 'count' of merged edges.
+    """
+    def __init__(self, edges, coordinates):
+        node_index = edges.node_index()
+        self.coordinates = coordinates
+        self.bounds = np.concatenate([coordinates.min(axis=0), coordinates.max(axis=0)]).tolist()
+        width, height = np.maximum(coordinates.max(axis=0) - coordinates.min(axis=0), 1e-9)
+        cells = max(1.0, len(coordinates) / TILE_CELL_NODES)
+        # Cells of TILE_CELL_NODES nodes on average, without degenerate grids for long thin layouts
+        self.base_cell_size = float(max(np.sqrt(width * height / cells), max(width, height) / cells))
+        self.lock = threading.Lock()
+        self.levels = [TileLevel(
+            node_index.node_ids, coordinates, np.ones(len(coordinates), dtype=np.int64),
+            edges.ids, node_index.sources, node_index.targets, edges.weights,
+            np.ones(len(edges), dtype=np.int64), self.base_cell_size
+        )]
+    
+    def level(self, k):
+        """Return level k, building coarser levels on first use; levels past the first single-node one clamp to it"""
+        with self.lock:
+            while len(self.levels) <= k and len(self.levels[-1].points) > 1:
+                self.levels.append(self._coarsen(len(self.levels)))
+            return self.levels[min(k, len(self.levels) - 1)]
+    
+    def _coarsen(self, k):
+        base = self.levels[0]
+        # Level 1 merges about 4 nodes per cluster, and every further level 4 times as many
+        cell_size = self.base_cell_size * 2.0 ** (k - 2)
+        cells = np.floor((base.points - base.points.min(axis=0)) / cell_size).astype(np.int64)
+        keys = cells[:, 1] * (int(cells[:, 0].max()) + 1) + cells[:, 0]
+        cell_keys, cluster = np.unique(keys, return_inverse=True)
+        cluster = cluster.reshape(-1)
+        counts = np.bincount(cluster)
+        points = np.column_stack([
+            np.bincount(cluster, weights=base.points[:, 0]) / counts,
+            np.bincount(cluster, weights=base.points[:, 1]) / counts
+        ])
+        
+        # One edge per unordered pair of clusters, keeping the lightest weight
+        u, v = cluster[base.sources], cluster[base.targets]
+        crossing = u != v
+        low, high = np.minimum(u, v)[crossing], np.maximum(u, v)[crossing]
+        pair_keys, pair = np.unique(low * len(cell_keys) + high, return_inverse=True)
+        pair = pair.reshape(-1)
+        weights = np.full(len(pair_keys), np.inf)
+        np.minimum.at(weights, pair, base.weights[crossing])
+        return TileLevel(
+            np.arange(len(cell_keys), dtype=np.int64), points, counts,
+            np.arange(len(pair_keys), dtype=np.int64), pair_keys // len(cell_keys), pair_keys % len(cell_keys),
+            weights, np.bincount(pair, minlength=len(pair_keys)), cell_size
+        )
+    
+    def choose_level(self, x0, y0, x1, y1, max_nodes=TILE_MAX_NODES):
+        """Finest level whose node count inside the box stays within max_nodes"""
+        k = 0
+        while True:
+            level = self.level(k)
+            if level.grid.count(x0, y0, x1, y1) <= max_nodes or len(level.points) <= 1:
+                return k
+            k += 1
+    
+    def tile(self, x0, y0, x1, y1, max_nodes=TILE_MAX_NODES, k=None):
+        """JSON-ready nodes (with x, y) and edges inside a viewport at a zoom-dependent level of detail"""
+        if k is None:
+            k = self.choose_level(x0, y0, x1, y1, max_nodes)
+        level = self.level(k)
+        k = min(k, len(self.levels) - 1)
+        nodes, rows = level.viewport(x0, y0, x1, y1)
+        
+        node_ids = level.node_ids[nodes].tolist()
+        xs = level.points[nodes, 0].tolist()
+        ys = level.points[nodes, 1].tolist()
+        node_counts = level.node_counts[nodes].tolist()
+        json_nodes = [{'id': node_id, 'x': x, 'y': y} for node_id, x, y in zip(node_ids, xs, ys)]
+        
+        json_edges = [
+            {'id': edge_id, 'source': source, 'target': target, 'distance': weight}
+            for edge_id, source, target, weight in zip(
+                level.edge_ids[rows].tolist(), level.node_ids[level.sources[rows]].tolist(),
+                level.node_ids[level.targets[rows]].tolist(), level.weights[rows].tolist())
+        ]
+        if k > 0:
+            for node, count in zip(json_nodes, node_counts):
+                node['count'] = count
+            for edge, count in zip(json_edges, level.edge_counts[rows].tolist()):
+                edge['count'] = count
+        
+        return {
+            'level': k,
+            'bounds': self.bounds,
+            'viewport': [x0, y0, x1, y1],
+            'nodes': json_nodes,
+            'edges': json_edges
+        }
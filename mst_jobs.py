@@ -0,0 +1,110 @@
+"""
+Background MST jobs for /jobs: runs on a thread pool, shared by every client
+that asks for the same (dataset, algorithm) while it is in flight, and kept
+pollable for a while after they finish.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads executing background MST jobs, and how many finished jobs stay pollable
+MST_JOB_WORKERS = 2
+MST_JOB_HISTORY = 64
+
+class MSTJobQueue:
+    """
+    Background MST runs on a thread pool. Submitting a (dataset, algorithm)
+    pair that is already queued or running returns the existing job, so
+    concurrent clients share one computation; finished jobs stay pollable
+    until MST_JOB_HISTORY newer ones have finished.
+    
+    Progress counts cover the visualization subset only: the edges checked
+    and the components of its forest still to be joined. The whole-dataset
+    pass that follows (status 'completing') reports no progress.
+    
+    run_job(job) computes a job's result, updating those progress fields and
+    the 'completing' status as it goes; describe_result(result) renders a
+    finished result for describe().
+    """
+    def __init__(self, run_job, describe_result, max_workers=MST_JOB_WORKERS, history=MST_JOB_HISTORY):
+        self.run_job = run_job
+        self.describe_result = describe_result
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mst-job')
+        self.history = history
+        self.lock = threading.Lock()
+        self.jobs = OrderedDict()
+        self.active = {}
+    
+    def submit(self, dataset, algorithm):
+        """Return the queued or running job for this dataset and algorithm, or start a new one"""
+        key = (dataset, algorithm)
+        with self.lock:
+            job = self.active.get(key)
+            if job is not None:
+                return job, False
+            
+            job = {
+                'job_id': uuid.uuid4().hex,
+                'dataset': dataset,
+                'algorithm': algorithm,
+                'status': 'queued',
+                'submitted': time.time(),
+                'started': None,
+                'finished': None,
+                'subset_edges_processed': 0,
+                'subset_components_remaining': None,
+                'result': None,
+                'error': None
+            }
+            self.jobs[job['job_id']] = job
+            self.active[key] = job
+        
+        self.executor.submit(self._run, job)
+        return job, True
+    
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+    
+    def _run(self, job):
+        job['started'] = time.time()
+        job['status'] = 'running'
+        try:
+            job['result'] = self.run_job(job)
+            job['status'] = 'done'
+        except Exception as e:
+            print(f"Error in MST job {job['job_id']}: {str(e)}")
+            job['error'] = str(e)
+            job['status'] = 'error'
+        finally:
+            job['finished'] = time.time()
+            self._retire(job)
+    
+    def _retire(self, job):
+        with self.lock:
+            self.active.pop((job['dataset'], job['algorithm']), None)
+            finished = [job_id for job_id, other in self.jobs.items() if other['finished'] is not None]
+            for job_id in finished[:max(0, len(finished) - self.history)]:
+                del self.jobs[job_id]
+    
+    def describe(self, job):
+        """JSON view of a job: status and visualization-subset progress, plus the result or error once finished"""
+        end = job['finished'] or time.time()
+        view = {
+            'job_id': job['job_id'],
+            'dataset': job['dataset'],
+            'algorithm': job['algorithm'],
+            'status': job['status'],
+            'progress': {
+                'subset_edges_processed': job['subset_edges_processed'],
+                'subset_components_remaining': job['subset_components_remaining'],
+                'elapsed': round(end - (job['started'] or end), 3)
+            }
+        }
+        if job['status'] == 'done':
+            view['result'] = self.describe_result(job['result'])
+        elif job['status'] == 'error':
+            view['error'] = job['error']
+        return view
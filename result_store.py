@@ -0,0 +1,154 @@
+"""
+Persistent SQLite store of complete MST results, so each algorithm runs once
+per dataset version across requests, processes and server restarts.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from edge_table import BINARY_RECORD, EdgeTable
+from step_engines import STEP_STATUS_CODES
+
+# SQLite file holding precomputed MST results across server restarts
+MST_STORE_PATH = 'database/mst_results.sqlite'
+
+# Column layout of a stored step trace
+STEP_RECORD = np.dtype([('edge_id', '<i8'), ('weight', '<f8'), ('status', 'u1'), ('total_weight', '<f8')])
+
+class MSTResultStore:
+    """
+    Persistent store of complete MST results (MST edges, total weight and step
+    trace) in SQLite, keyed by dataset path, content hash, algorithm and the
+    visualization limit (step_limit) the steps were computed for. The hash
+    covers the file and the parser_version, so a changed dataset or parser
+    never serves a stale result.
+    """
+    def __init__(self, step_limit, parser_version, path=MST_STORE_PATH):
+        self.step_limit = step_limit
+        self.parser_version = parser_version
+        self.path = path
+        self.lock = threading.Lock()
+        self.hashes = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS mst_results (
+                dataset_path TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                step_limit INTEGER NOT NULL,
+                total_weight REAL NOT NULL,
+                mst_edges BLOB NOT NULL,
+                steps BLOB NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (dataset_path, content_hash, algorithm, step_limit)
+            )
+        """)
+        return connection
+    
+    def content_hash(self, dataset_path):
+        """SHA-256 of the dataset file and parser version, rehashed only when the file's mtime or size changes"""
+        stat = os.stat(dataset_path)
+        key = (dataset_path, stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            if key in self.hashes:
+                return self.hashes[key]
+        
+        digest = hashlib.sha256(f'parser-{self.parser_version}:'.encode())
+        with open(dataset_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        
+        with self.lock:
+            self.hashes[key] = digest.hexdigest()
+        return self.hashes[key]
+    
+    def get(self, dataset_path, algorithm):
+        """Return the stored result with its steps, or None"""
+        try:
+            key = (dataset_path, self.content_hash(dataset_path), algorithm, self.step_limit)
+            connection = self._connect()
+            try:
+                row = connection.execute(
+                    "SELECT total_weight, mst_edges, steps FROM mst_results "
+                    "WHERE dataset_path = ? AND content_hash = ? AND algorithm = ? AND step_limit = ?",
+                    key
+                ).fetchone()
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: MST result store unavailable: {str(e)}")
+            return None
+        
+        with self.lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        
+        total_weight, mst_blob, steps_blob = row
+        records = np.frombuffer(mst_blob, dtype=BINARY_RECORD)
+        steps = np.frombuffer(steps_blob, dtype=STEP_RECORD)
+        status_names = {code: status for status, code in STEP_STATUS_CODES.items()}
+        
+        # Engines start their running total at int 0; keep that so stored JSON matches a fresh run
+        return {
+            'mst_edges': EdgeTable(records['id'], records['source'], records['target'], records['weight']),
+            'total_weight': total_weight,
+            'steps': [
+                {'edge_id': edge_id, 'weight': weight, 'status': status_names[status], 'total_weight': total or 0}
+                for edge_id, weight, status, total in zip(
+                    steps['edge_id'].tolist(), steps['weight'].tolist(),
+                    steps['status'].tolist(), steps['total_weight'].tolist())
+            ]
+        }
+    
+    def put(self, dataset_path, algorithm, result):
+        """Persist a complete result that carries its steps"""
+        mst_edges = result['mst_edges']
+        records = np.empty(len(mst_edges), dtype=BINARY_RECORD)
+        records['id'] = mst_edges.ids
+        records['source'] = mst_edges.sources
+        records['target'] = mst_edges.targets
+        records['weight'] = mst_edges.weights
+        
+        steps = result['steps']
+        step_records = np.empty(len(steps), dtype=STEP_RECORD)
+        step_records['edge_id'] = [step['edge_id'] for step in steps]
+        step_records['weight'] = [step['weight'] for step in steps]
+        step_records['status'] = [STEP_STATUS_CODES[step['status']] for step in steps]
+        step_records['total_weight'] = [step['total_weight'] for step in steps]
+        
+        try:
+            row = (dataset_path, self.content_hash(dataset_path), algorithm, self.step_limit,
+                   float(result['total_weight']), records.tobytes(), step_records.tobytes(), time.time())
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute("INSERT OR REPLACE INTO mst_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: Couldn't store MST result: {str(e)}")
+    
+    def stats(self):
+        """Return hit/miss counters and the stored (dataset, algorithm) pairs"""
+        entries = []
+        try:
+            connection = self._connect()
+            try:
+                entries = [list(row) for row in connection.execute(
+                    "SELECT dataset_path, algorithm FROM mst_results ORDER BY dataset_path, algorithm")]
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            pass
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'path': self.path, 'results': entries}
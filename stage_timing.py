@@ -0,0 +1,66 @@
+"""
+Per-request stage timing. Work wrapped in timed_stage() is charged to the
+StageTimer of the request running on the current thread, if it is being
+timed; the Flask hooks and the ASGI handlers install that timer, and the
+data structures and engines below them only ever call timed_stage().
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+class StageTimer:
+    """Exclusive wall time per named stage of one request; entering a nested stage pauses the enclosing one"""
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.mark = self.start
+        self.stack = []
+        self.stages = {}
+    
+    def _charge(self):
+        now = time.perf_counter()
+        if self.stack:
+            name = self.stack[-1]
+            self.stages[name] = self.stages.get(name, 0.0) + now - self.mark
+        self.mark = now
+    
+    def enter(self, name):
+        self._charge()
+        self.stack.append(name)
+    
+    def exit(self):
+        self._charge()
+        self.stack.pop()
+    
+    def total(self):
+        return time.perf_counter() - self.start
+    
+    def server_timing(self):
+        """Server-Timing header value with every stage and the total in milliseconds"""
+        parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={self.total() * 1000:.2f}")
+        return ', '.join(parts)
+
+# Timer of the request being handled by the current thread, if it is being timed
+stage_local = threading.local()
+
+@contextmanager
+def timed_stage(name):
+    """Charge the enclosed work to a stage of the current thread's request timer (no-op when untimed)"""
+    timer = getattr(stage_local, 'timer', None)
+    if timer is None:
+        yield
+        return
+    timer.enter(name)
+    try:
+        yield
+    finally:
+        timer.exit()
+
+def run_timed(timer, function, *args):
+    """Call function with timer as the current thread's request timer"""
+    previous = getattr(stage_local, 'timer', None)
+    stage_local.timer = timer
+    try:
+        return function(*args)
+    finally:
+        stage_local.timer = previous
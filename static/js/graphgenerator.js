@@ -16,18 +16,35 @@ function initializeGraph(svg, width, height, zoom) {
     svg.append('g');
 }
 
-// Render a graph with nodes and edges
-function renderGraph(data, svg, width, height, zoom, transform) {
+// Point edge endpoints at their node objects and scale the server-side layout (x, y on
+// every node) once so the whole graph fits the SVG, centered, with its aspect ratio kept
+function fitLayoutToView(data, width, height, margin = 20) {
+    const nodeById = new Map(data.nodes.map(d => [d.id, d]));
+    data.edges.forEach(d => {
+        d.source = nodeById.get(typeof d.source === 'object' ? d.source.id : d.source);
+        d.target = nodeById.get(typeof d.target === 'object' ? d.target.id : d.target);
+    });
+    if (data.nodes.length === 0) return;
+    
+    const [minX, maxX] = d3.extent(data.nodes, d => d.x);
+    const [minY, maxY] = d3.extent(data.nodes, d => d.y);
+    const scale = Math.min((width - 2 * margin) / Math.max(maxX - minX, 1e-9),
+                           (height - 2 * margin) / Math.max(maxY - minY, 1e-9));
+    const offsetX = (width - (maxX - minX) * scale) / 2;
+    const offsetY = (height - (maxY - minY) * scale) / 2;
+    data.nodes.forEach(d => {
+        d.x = offsetX + (d.x - minX) * scale;
+        d.y = offsetY + (d.y - minY) * scale;
+    });
+}
+
+// Render a graph with nodes and edges at the positions of its server-side layout
+function renderGraph(data, svg, width, height, zoom) {
     // Determine if this is a generated/small graph
     const isSmallGraph = isGeneratedGraph(data.nodes);
     
-    // Create force simulation
-    const simulation = d3.forceSimulation(data.nodes)
-        .force('link', d3.forceLink(data.edges)
-            .id(d => d.id)
-            .distance(d => Math.min(150, d.distance * 0.2)))
-        .force('charge', d3.forceManyBody().strength(-120))
-        .force('center', d3.forceCenter(width / 2, height / 2));
+    fitLayoutToView(data, width, height);
+    svg.call(zoom.transform, d3.zoomIdentity);
 
     const g = svg.select('g');
 
@@ -84,26 +101,21 @@ function renderGraph(data, svg, width, height, zoom, transform) {
             .style('font-size', '5px');
     }
 
-    // Update positions on simulation tick
-    simulation.on('tick', () => {
-        // Update edge positions
-        edges.selectAll('line')
-            .attr('x1', d => d.source.x)
-            .attr('y1', d => d.source.y)
-            .attr('x2', d => d.target.x)
-            .attr('y2', d => d.target.y);
-
-        // Update edge label positions
-        edges.selectAll('.edge-label-group')
-            .attr('transform', d => {
-                const midX = (d.source.x + d.target.x) / 2;
-                const midY = (d.source.y + d.target.y) / 2;
-                return `translate(${midX},${midY})`;
-            });
-            
-        // Update node positions
-        nodeGroups.attr('transform', d => `translate(${d.x},${d.y})`);
-    });
+    // Place everything at the node positions
+    edges.selectAll('line')
+        .attr('x1', d => d.source.x)
+        .attr('y1', d => d.source.y)
+        .attr('x2', d => d.target.x)
+        .attr('y2', d => d.target.y);
+
+    edges.selectAll('.edge-label-group')
+        .attr('transform', d => {
+            const midX = (d.source.x + d.target.x) / 2;
+            const midY = (d.source.y + d.target.y) / 2;
+            return `translate(${midX},${midY})`;
+        });
+        
+    nodeGroups.attr('transform', d => `translate(${d.x},${d.y})`);
 
     // Add hover effect for edges
     edges.on('mouseover', function() {
@@ -142,133 +154,364 @@ function renderGraph(data, svg, width, height, zoom, transform) {
                 .style('font-weight', 'bold');
         });
     }
+}
+
+// Reset edge highlighting and show the status bar and MST list
+function resetMSTVisualization(svg, mstResults, mstEdgesList, statusBar) {
+    statusBar.style.display = 'block';
+    mstResults.style.display = 'block';
+    mstEdgesList.innerHTML = '';
+
+    // Reset all edges
+    svg.selectAll('.edge')
+        .classed('mst-edge', false)
+        .select('line')
+        .style('stroke', '#999')
+        .style('stroke-opacity', 0.6)
+        .style('stroke-width', 1);
+}
+
+// Determine visualization delays based on graph size and user preference
+function getVisualizationDelays(currentGraph) {
+    const isSmallGraph = isGeneratedGraph(currentGraph.nodes);
     
-    // Center and scale the graph
-    setTimeout(() => {
-        const bounds = g.node().getBBox();
-        const scale = 0.9 * Math.min(
-            width / bounds.width,
-            height / bounds.height
-        );
-        const tx = width / 2 - (bounds.x + bounds.width / 2) * scale;
-        const ty = height / 2 - (bounds.y + bounds.height / 2) * scale;
-        
-        svg.transition()
-            .duration(500)
-            .call(zoom.transform, d3.zoomIdentity
-                .translate(tx, ty)
-                .scale(scale));
-    }, 100);
+    // Get speed control value (0-100, where 100 is fastest)
+    const speedControl = document.getElementById('speedControl');
+    const speedValue = speedControl ? parseInt(speedControl.value) : 50;
+    
+    // Calculate delay - invert the speed value (100 = fast = low delay)
+    // For small graphs: between 500ms (slowest) and 50ms (fastest)
+    // For large graphs: between 50ms (slowest) and 0ms (fastest)
+    const maxDelay = isSmallGraph ? 500 : 50;
+    const minDelay = isSmallGraph ? 50 : 0;
+    const checkingDelay = maxDelay - ((speedValue / 100) * (maxDelay - minDelay));
+    
+    // For rejection highlight, use a bit longer delay
+    const rejectionDelay = checkingDelay * 1.5;
     
-    return simulation;
+    return { checkingDelay, rejectionDelay };
 }
 
-// Run Kruskal's algorithm visualization
-async function runKruskalVisualization(currentGraph, svg, mstResults, mstEdgesList, statusBar) {
-    if (!currentGraph) return;
+// Show a keyframe of the ?trace=keyframes mode: the edges rejected since the last one and the running total
+async function animateKeyframe(step, delays) {
+    document.getElementById('stepInfo').textContent = `Skipped ${step.rejected} edges that would form a cycle`;
     
-    try {
-        statusBar.style.display = 'block';
-        mstResults.style.display = 'block';
-        mstEdgesList.innerHTML = '';
-
-        // Reset all edges
-        svg.selectAll('.edge')
-            .classed('mst-edge', false)
-            .select('line')
-            .style('stroke', '#999')
-            .style('stroke-opacity', 0.6)
-            .style('stroke-width', 1);
+    const statusBarWeight = document.getElementById('statusBarWeight');
+    if (statusBarWeight) {
+        statusBarWeight.textContent = step.total_weight.toFixed(2);
+    }
+    
+    await new Promise(resolve => setTimeout(resolve, delays.checkingDelay));
+}
+
+// Animate a single checking/accepted/rejected step, or a keyframe
+async function animateStep(step, currentGraph, svg, mstEdgesList, delays) {
+    if (step.status === 'keyframe') {
+        await animateKeyframe(step, delays);
+        return;
+    }
+    
+    const edge = svg.select(`#edge-${step.edge_id}`);
+    if (edge.empty()) return;
+
+    const line = edge.select('line');
+    const edgeInfo = currentGraph.edges.find(e => e.id === step.edge_id);
+    
+    if (!edgeInfo) {
+        console.error('Could not find edge info for edge id:', step.edge_id);
+        return;
+    }
+    
+    // Make sure source and target are integers
+    const sourceId = typeof edgeInfo.source === 'object' ? edgeInfo.source.id : edgeInfo.source;
+    const targetId = typeof edgeInfo.target === 'object' ? edgeInfo.target.id : edgeInfo.target;
+    
+    // Update status bar (not the final results panel)
+    document.getElementById('stepInfo').textContent = 
+        `Checking edge ${step.edge_id} (${sourceId} → ${targetId}, weight: ${edgeInfo.distance.toFixed(2)})`;
+    
+    // Only update the status bar's total weight, not the final results panel
+    const statusBarWeight = document.getElementById('statusBarWeight');
+    if (statusBarWeight) {
+        statusBarWeight.textContent = step.total_weight.toFixed(2);
+    }
         
-        // Determine visualization speed based on graph size and user preference
-        const isSmallGraph = isGeneratedGraph(currentGraph.nodes);
+    if (step.status === 'checking') {
+        line.style('stroke', '#007bff')
+            .style('stroke-width', 2)
+            .style('stroke-opacity', 1);
+            
+        // Create checking edge element
+        const checkingElement = document.createElement('div');
+        checkingElement.className = 'mst-edge checking';
+        checkingElement.textContent = `${sourceId} → ${targetId} (${edgeInfo.distance.toFixed(2)})`;
+        checkingElement.id = `mst-edge-${step.edge_id}`;
+        mstEdgesList.appendChild(checkingElement);
+    } else if (step.status === 'accepted') {
+        edge.classed('mst-edge', true);
+        line.style('stroke', '#28a745')
+            .style('stroke-width', 2)
+            .style('stroke-opacity', 1);
         
-        // Get speed control value (0-100, where 100 is fastest)
-        const speedControl = document.getElementById('speedControl');
-        const speedValue = speedControl ? parseInt(speedControl.value) : 50;
+        // Update the existing edge element; keyframe traces send no checking step to create it
+        let existingEdge = document.getElementById(`mst-edge-${step.edge_id}`);
+        if (!existingEdge) {
+            existingEdge = document.createElement('div');
+            existingEdge.id = `mst-edge-${step.edge_id}`;
+            mstEdgesList.appendChild(existingEdge);
+        }
+        existingEdge.className = 'mst-edge accepted';
+        existingEdge.textContent = `${sourceId} → ${targetId} (${edgeInfo.distance.toFixed(2)})`;
+    } else if (step.status === 'rejected') {
+        line.style('stroke', '#dc3545')
+            .style('stroke-width', 2)
+            .style('stroke-opacity', 1);
         
-        // Calculate delay - invert the speed value (100 = fast = low delay)
-        // For small graphs: between 500ms (slowest) and 50ms (fastest)
-        // For large graphs: between 50ms (slowest) and 0ms (fastest)
-        const maxDelay = isSmallGraph ? 500 : 50;
-        const minDelay = isSmallGraph ? 50 : 0;
-        const checkingDelay = maxDelay - ((speedValue / 100) * (maxDelay - minDelay));
+        await new Promise(resolve => setTimeout(resolve, delays.rejectionDelay));
         
-        // For rejection highlight, use a bit longer delay
-        const rejectionDelay = checkingDelay * 1.5;
+        line.style('stroke', '#999')
+            .style('stroke-width', 1)
+            .style('stroke-opacity', 0.6);
+            
+        // Remove the rejected edge from the list
+        const existingEdge = document.getElementById(`mst-edge-${step.edge_id}`);
+        if (existingEdge) {
+            existingEdge.remove();
+        }
+    }
+    
+    // Wait between steps - use speed based on slider and graph size
+    await new Promise(resolve => setTimeout(resolve, delays.checkingDelay));
+}
 
-        // Process each step
-        for (const step of currentGraph.steps) {
-            const edge = svg.select(`#edge-${step.edge_id}`);
-            if (edge.empty()) continue;
+// Parse a newline-delimited JSON response body, yielding each object as soon as its line arrives
+async function* readNdjson(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        for (const line of lines) {
+            if (line.trim()) yield JSON.parse(line);
+        }
+    }
+    
+    buffer += decoder.decode();
+    if (buffer.trim()) yield JSON.parse(buffer);
+}
 
-            const line = edge.select('line');
-            const edgeInfo = currentGraph.edges.find(e => e.id === step.edge_id);
-            
-            if (!edgeInfo) {
-                console.error('Could not find edge info for edge id:', step.edge_id);
-                continue;
-            }
-            
-            // Make sure source and target are integers
-            const sourceId = typeof edgeInfo.source === 'object' ? edgeInfo.source.id : edgeInfo.source;
-            const targetId = typeof edgeInfo.target === 'object' ? edgeInfo.target.id : edgeInfo.target;
-            
-            // Update status bar (not the final results panel)
-            document.getElementById('stepInfo').textContent = 
-                `Checking edge ${step.edge_id} (${sourceId} → ${targetId}, weight: ${edgeInfo.distance.toFixed(2)})`;
-            
-            // Only update the status bar's total weight, not the final results panel
-            const statusBarWeight = document.getElementById('statusBarWeight');
-            if (statusBarWeight) {
-                statusBarWeight.textContent = step.total_weight.toFixed(2);
-            }
-                
-            if (step.status === 'checking') {
-                line.style('stroke', '#007bff')
-                    .style('stroke-width', 2)
-                    .style('stroke-opacity', 1);
-                    
-                // Create checking edge element
-                const checkingElement = document.createElement('div');
-                checkingElement.className = 'mst-edge checking';
-                checkingElement.textContent = `${sourceId} → ${targetId} (${edgeInfo.distance.toFixed(2)})`;
-                checkingElement.id = `mst-edge-${step.edge_id}`;
-                mstEdgesList.appendChild(checkingElement);
-            } else if (step.status === 'accepted') {
-                edge.classed('mst-edge', true);
-                line.style('stroke', '#28a745')
-                    .style('stroke-width', 2)
-                    .style('stroke-opacity', 1);
-                
-                // Update the existing edge element
-                const existingEdge = document.getElementById(`mst-edge-${step.edge_id}`);
-                if (existingEdge) {
-                    existingEdge.className = 'mst-edge accepted';
-                    existingEdge.textContent = `${sourceId} → ${targetId} (${edgeInfo.distance.toFixed(2)})`;
-                }
-            } else if (step.status === 'rejected') {
-                line.style('stroke', '#dc3545')
-                    .style('stroke-width', 2)
-                    .style('stroke-opacity', 1);
-                
-                await new Promise(resolve => setTimeout(resolve, rejectionDelay));
-                
-                line.style('stroke', '#999')
-                    .style('stroke-width', 1)
-                    .style('stroke-opacity', 0.6);
-                    
-                // Remove the rejected edge from the list
-                const existingEdge = document.getElementById(`mst-edge-${step.edge_id}`);
-                if (existingEdge) {
-                    existingEdge.remove();
+// Stream steps from a /stream_kruskal or /stream_prims URL and animate them as they arrive.
+// onResult is called with the final MST result as soon as it is received; the promise
+// resolves with the same result once the animation has finished.
+async function runStreamingVisualization(url, currentGraph, svg, mstResults, mstEdgesList, statusBar, onResult) {
+    const response = await fetch(url);
+    if (!response.ok) throw new Error('Network response was not ok');
+    
+    resetMSTVisualization(svg, mstResults, mstEdgesList, statusBar);
+    const delays = getVisualizationDelays(currentGraph);
+    
+    const queue = [];
+    let result = null;
+    let finished = false;
+    let readError = null;
+    let wake = null;
+    const notify = () => {
+        if (wake) {
+            wake();
+            wake = null;
+        }
+    };
+    
+    // Read ahead of the animation so the final result is known as soon as the server sends it
+    const reading = (async () => {
+        try {
+            for await (const message of readNdjson(response)) {
+                if (message.error) throw new Error(message.error);
+                if ('status' in message) {
+                    queue.push(message);
+                } else {
+                    result = message;
+                    if (onResult) onResult(result);
                 }
+                notify();
             }
-            
-            // Wait between steps - use speed based on slider and graph size
-            await new Promise(resolve => setTimeout(resolve, checkingDelay));
+        } catch (error) {
+            readError = error;
+        } finally {
+            finished = true;
+            notify();
+        }
+    })();
+    
+    // Animate steps in arrival order, waiting for more whenever the animation catches up
+    let next = 0;
+    while (true) {
+        if (next < queue.length) {
+            const step = queue[next];
+            queue[next++] = null;
+            await animateStep(step, currentGraph, svg, mstEdgesList, delays);
+        } else if (finished) {
+            break;
+        } else {
+            await new Promise(resolve => { wake = resolve; });
+        }
+    }
+    
+    await reading;
+    if (readError) throw readError;
+    return result;
+}
+
+// Status codes used by the compact binary step encoding (?format=binary)
+const STEP_STATUSES = ['checking', 'accepted', 'rejected', 'keyframe'];
+
+// Decode a ?format=binary response body: a 16-byte header (uint32 step count,
+// uint32 MST edge count, float64 total weight) followed by column arrays of
+// running totals (float64), edge ids (uint32), MST edge ids (uint32) and
+// status codes (uint8), all little-endian. Keyframes carry their rejection
+// count in the edge id column.
+function decodeBinarySteps(buffer) {
+    const header = new DataView(buffer, 0, 16);
+    const stepCount = header.getUint32(0, true);
+    const mstCount = header.getUint32(4, true);
+    const totalWeight = header.getFloat64(8, true);
+    
+    let offset = 16;
+    const totals = new Float64Array(buffer, offset, stepCount);
+    offset += stepCount * 8;
+    const edgeIds = new Uint32Array(buffer, offset, stepCount);
+    offset += stepCount * 4;
+    const mstEdgeIds = new Uint32Array(buffer, offset, mstCount);
+    offset += mstCount * 4;
+    const statuses = new Uint8Array(buffer, offset, stepCount);
+    
+    const steps = new Array(stepCount);
+    for (let i = 0; i < stepCount; i++) {
+        const status = STEP_STATUSES[statuses[i]];
+        steps[i] = status === 'keyframe'
+            ? { status: status, rejected: edgeIds[i], total_weight: totals[i] }
+            : { edge_id: edgeIds[i], status: status, total_weight: totals[i] };
+    }
+    
+    return {
+        steps: steps,
+        mst_edges: Array.from(mstEdgeIds, id => ({ id: id })),
+        total_weight: totalWeight
+    };
+}
+
+// Fetch an MST result from /run_kruskal or /run_prims in the compact binary encoding
+async function fetchBinarySteps(url) {
+    const separator = url.includes('?') ? '&' : '?';
+    const response = await fetch(`${url}${separator}format=binary`);
+    if (!response.ok) throw new Error('Network response was not ok');
+    return decodeBinarySteps(await response.arrayBuffer());
+}
+
+// Fetch a whole MST result from a /run_ URL in the compact binary encoding, then animate
+// its steps. Takes the same arguments and resolves like runStreamingVisualization.
+async function runBinaryVisualization(url, currentGraph, svg, mstResults, mstEdgesList, statusBar, onResult) {
+    const result = await fetchBinarySteps(url);
+    
+    resetMSTVisualization(svg, mstResults, mstEdgesList, statusBar);
+    if (onResult) onResult(result);
+    
+    const delays = getVisualizationDelays(currentGraph);
+    for (const step of result.steps) {
+        await animateStep(step, currentGraph, svg, mstEdgesList, delays);
+    }
+    return result;
+}
+
+// Render a whole dataset from server-side tiles at fixed coordinates, fetching
+// the visible viewport at a matching level of detail after every pan or zoom
+function renderTiledGraph(dataset, svg, width, height, zoom, onTile) {
+    const g = svg.select('g');
+    let layoutScale = null;
+    let pendingLoad = null;
+    let latestRequest = 0;
+
+    // Data-space rectangle visible under a zoom transform
+    function visibleBounds(zoomTransform) {
+        const [left, top] = zoomTransform.invert([0, 0]);
+        const [right, bottom] = zoomTransform.invert([width, height]);
+        return [
+            (left - layoutScale.tx) / layoutScale.s,
+            (top - layoutScale.ty) / layoutScale.s,
+            (right - layoutScale.tx) / layoutScale.s,
+            (bottom - layoutScale.ty) / layoutScale.s
+        ];
+    }
+
+    function drawTile(tile) {
+        const position = new Map(tile.nodes.map(node => [
+            node.id, [node.x * layoutScale.s + layoutScale.tx, node.y * layoutScale.s + layoutScale.ty]
+        ]));
+        g.selectAll('*').remove();
+
+        // Only level 0 edges are real roads that MST steps can highlight
+        const edges = g.selectAll('.edge')
+            .data(tile.edges)
+            .enter()
+            .append('g')
+            .attr('class', 'edge')
+            .attr('id', d => tile.level === 0 ? `edge-${d.id}` : null);
+
+        edges.append('line')
+            .attr('x1', d => position.get(d.source)[0])
+            .attr('y1', d => position.get(d.source)[1])
+            .attr('x2', d => position.get(d.target)[0])
+            .attr('y2', d => position.get(d.target)[1])
+            .style('stroke', '#999')
+            .style('stroke-opacity', 0.6)
+            .style('stroke-width', d => d.count ? Math.min(4, 1 + Math.log2(d.count) / 2) : 1)
+            .style('vector-effect', 'non-scaling-stroke');
+
+        g.selectAll('.node-group')
+            .data(tile.nodes)
+            .enter()
+            .append('g')
+            .attr('class', 'node-group')
+            .attr('transform', d => `translate(${position.get(d.id)[0]},${position.get(d.id)[1]})`)
+            .append('circle')
+            .attr('class', 'node')
+            .attr('r', d => d.count ? Math.min(6, 1.5 + Math.log2(d.count) / 2) : 2);
+    }
+
+    async function loadTile(bounds) {
+        const requestNumber = ++latestRequest;
+        const query = bounds ? `?x0=${bounds[0]}&y0=${bounds[1]}&x1=${bounds[2]}&y1=${bounds[3]}` : '';
+        const response = await fetch(`/tiles/${dataset}${query}`);
+        const tile = await response.json();
+        if (tile.error) throw new Error(tile.error);
+
+        // A newer viewport was requested while this one was loading
+        if (requestNumber !== latestRequest) return;
+
+        if (!layoutScale) {
+            const [x0, y0, x1, y1] = tile.bounds;
+            const s = 0.9 * Math.min(width / Math.max(x1 - x0, 1e-9), height / Math.max(y1 - y0, 1e-9));
+            layoutScale = {
+                s,
+                tx: (width - (x1 - x0) * s) / 2 - x0 * s,
+                ty: (height - (y1 - y0) * s) / 2 - y0 * s
+            };
         }
-    } catch (error) {
-        console.error('Error in Kruskal visualization:', error);
+        drawTile(tile);
+        onTile(tile);
     }
-} 
\ No newline at end of file
+
+    zoom.on('end.tiles', event => {
+        if (!layoutScale) return;
+        clearTimeout(pendingLoad);
+        pendingLoad = setTimeout(() => loadTile(visibleBounds(event.transform)), 150);
+    });
+
+    return loadTile(null);
+}
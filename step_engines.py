@@ -0,0 +1,687 @@
+"""
+MST step engines. Each engine is a generator over an EdgeTable that yields
+visualization steps ({'edge_id', 'weight', 'status', 'total_weight'}, or
+keyframes with a keyframe_interval) and returns the result dict holding
+'mst_edges' and 'total_weight'. KRUSKAL_ENGINES and PRIM_ENGINES map the
+?engine= names to them; full_kruskal_mst is the step-free whole-dataset pass.
+"""
+import heapq
+import time
+
+import numpy as np
+
+from algorithm.boruvka import boruvka_rounds
+from edge_table import DenseUnionFind, IndexedDaryHeap
+from stage_timing import timed_stage
+
+# Step statuses, and their codes in the binary step encoding and stored step traces
+STEP_STATUS_CODES = {'checking': 0, 'accepted': 1, 'rejected': 2, 'keyframe': 3}
+
+# Decided edges between keyframes in the ?trace=keyframes step mode
+TRACE_KEYFRAME_INTERVAL = 100
+
+# Filter-Kruskal segments at or below this many edges are sorted directly instead of partitioned
+FILTER_KRUSKAL_BASE_SIZE = 4096
+
+class StepStream:
+    """Iterate an MST step generator while capturing the result it returns"""
+    def __init__(self, step_generator):
+        self.step_generator = step_generator
+        self.result = None
+    
+    def __iter__(self):
+        self.result = yield from self.step_generator
+
+class KeyframeCounter:
+    """
+    Running state of a keyframe trace: counts decided edges and builds a
+    keyframe step every interval decisions, holding the number of edges
+    rejected since the previous one and the running total weight. With an
+    interval of 0 it never builds one.
+    """
+    def __init__(self, interval=0):
+        self.interval = interval
+        self.decided = 0
+        self.rejections = 0
+    
+    def accepted(self, total_weight):
+        """Count an accepted edge; return the keyframe now due, or None"""
+        return self._decide(total_weight) if self.interval else None
+    
+    def rejected(self, total_weight):
+        """Count a rejected edge; return the keyframe now due, or None"""
+        if not self.interval:
+            return None
+        self.rejections += 1
+        return self._decide(total_weight)
+    
+    def flush(self, total_weight):
+        """The keyframe for edges decided since the last one, or None"""
+        if not self.interval or not self.decided % self.interval:
+            return None
+        return self._keyframe(total_weight)
+    
+    def _decide(self, total_weight):
+        self.decided += 1
+        return None if self.decided % self.interval else self._keyframe(total_weight)
+    
+    def _keyframe(self, total_weight):
+        keyframe = {'status': 'keyframe', 'rejected': self.rejections, 'total_weight': total_weight}
+        self.rejections = 0
+        return keyframe
+
+def keyframe_steps(step_generator, interval=TRACE_KEYFRAME_INTERVAL):
+    """
+    Decimate a full MST step trace to its accepted steps plus a keyframe every
+    interval decided edges, as the engines emit directly when given a
+    keyframe_interval. Used for traces that are also stored. An interval of 0
+    keeps the full trace.
+    """
+    if not interval:
+        return (yield from step_generator)
+    
+    stream = StepStream(step_generator)
+    keyframes = KeyframeCounter(interval)
+    total_weight = 0
+    for step in stream:
+        status = step['status']
+        total_weight = step['total_weight']
+        if status == 'accepted':
+            yield step
+            keyframe = keyframes.accepted(total_weight)
+        elif status == 'rejected':
+            keyframe = keyframes.rejected(total_weight)
+        else:
+            continue
+        if keyframe is not None:
+            yield keyframe
+    
+    keyframe = keyframes.flush(total_weight)
+    if keyframe is not None:
+        yield keyframe
+    return stream.result
+
+def traced_result(result, interval):
+    """A stored MST result with its steps decimated by keyframe_steps; the full trace stays in the store"""
+    if not interval:
+        return result
+    return dict(result, steps=list(keyframe_steps(result['steps'], interval)))
+
+def collect_steps(step_generator):
+    """Run an MST step generator to completion and attach its steps to the result"""
+    stream = StepStream(step_generator)
+    with timed_stage('mst'):
+        steps = list(stream)
+    result = stream.result
+    result['steps'] = steps
+    return result
+
+def kruskal_steps(edges, keyframe_interval=0):
+    """Advanced implementation of Kruskal's algorithm optimized for large datasets; yields steps (accepted steps and keyframes only with a keyframe_interval), returns the MST"""
+    print("Starting Kruskal's Algorithm...")
+    start_time = time.time()
+    
+    # Work on dense node indices so the Union-Find can use flat arrays
+    node_index = edges.node_index()
+    num_nodes = len(node_index)
+    uf = DenseUnionFind(num_nodes)
+    
+    ids = edges.ids.tolist()
+    sources = node_index.sources.tolist()
+    targets = node_index.targets.tolist()
+    weights = edges.weights.tolist()
+    
+    # Create min-heap of edge rows sorted by weight
+    edge_heap = [(weights[row], ids[row], row) for row in range(len(edges))]
+    heapq.heapify(edge_heap)
+    
+    mst_rows = []
+    total_weight = 0
+    edges_processed = 0
+    keyframes = KeyframeCounter(keyframe_interval)
+    
+    # Process edges in order of increasing weight
+    while edge_heap and len(mst_rows) < num_nodes - 1:
+        weight, edge_id, row = heapq.heappop(edge_heap)
+        edges_processed += 1
+        
+        source = sources[row]
+        target = targets[row]
+        
+        # Add checking step
+        if not keyframe_interval:
+            yield {
+                'edge_id': edge_id,
+                'weight': weight,
+                'status': 'checking',
+                'total_weight': total_weight
+            }
+        
+        # Check if edge creates a cycle using Union-Find
+        if uf.union(source, target):
+            # Edge accepted - add to MST
+            mst_rows.append(row)
+            total_weight += weight
+            yield {
+                'edge_id': edge_id,
+                'weight': weight,
+                'status': 'accepted',
+                'total_weight': total_weight
+            }
+            keyframe = keyframes.accepted(total_weight)
+        elif not keyframe_interval:
+            # Edge rejected - would create cycle
+            yield {
+                'edge_id': edge_id,
+                'weight': weight,
+                'status': 'rejected',
+                'total_weight': total_weight
+            }
+            continue
+        else:
+            keyframe = keyframes.rejected(total_weight)
+        
+        if keyframe is not None:
+            yield keyframe
+    
+    keyframe = keyframes.flush(total_weight)
+    if keyframe is not None:
+        yield keyframe
+    
+    end_time = time.time()
+    print(f"Kruskal's Algorithm completed in {end_time - start_time:.2f} seconds")
+    print(f"Edges processed: {edges_processed}")
+    print(f"MST edges: {len(mst_rows)}, Total weight: {total_weight:.2f}")
+    print("="*50 + "\n")
+    
+    return {
+        'mst_edges': edges.take(np.array(mst_rows, dtype=np.int64)),
+        'total_weight': total_weight
+    }
+
+def fast_kruskal_steps(edges, keyframe_interval=0):
+    """Kruskal's algorithm using a NumPy argsort and a dense-index Union-Find; yields steps (accepted steps and keyframes only with a keyframe_interval), returns the MST"""
+    print("Starting Kruskal's Algorithm (fast engine)...")
+    start_time = time.time()
+    
+    # Dense node indices 0..V-1 let the Union-Find use flat arrays
+    node_index = edges.node_index()
+    num_nodes = len(node_index)
+    num_edges = len(edges)
+    
+    # Sort by weight, breaking ties by edge id to match the heap-based engine
+    order = edges.weight_order()
+    sources = node_index.sources[order].tolist()
+    targets = node_index.targets[order].tolist()
+    ids = edges.ids[order].tolist()
+    weights = edges.weights[order].tolist()
+    
+    uf = DenseUnionFind(num_nodes)
+    find = uf.find
+    mst_rows = []
+    total_weight = 0
+    edges_processed = 0
+    keyframes = KeyframeCounter(keyframe_interval)
+    
+    for i in range(num_edges):
+        if len(mst_rows) >= num_nodes - 1:
+            break
+        edge_id = ids[i]
+        weight = weights[i]
+        edges_processed += 1
+        
+        if not keyframe_interval:
+            yield {
+                'edge_id': edge_id,
+                'weight': weight,
+                'status': 'checking',
+                'total_weight': total_weight
+            }
+        
+        root_u = find(sources[i])
+        root_v = find(targets[i])
+        if root_u != root_v:
+            uf.union(root_u, root_v)
+            mst_rows.append(i)
+            total_weight += weight
+            yield {
+                'edge_id': edge_id,
+                'weight': weight,
+                'status': 'accepted',
+                'total_weight': total_weight
+            }
+            keyframe = keyframes.accepted(total_weight)
+        elif not keyframe_interval:
+            yield {
+                'edge_id': edge_id,
+                'weight': weight,
+                'status': 'rejected',
+                'total_weight': total_weight
+            }
+            continue
+        else:
+            keyframe = keyframes.rejected(total_weight)
+        
+        if keyframe is not None:
+            yield keyframe
+    
+    keyframe = keyframes.flush(total_weight)
+    if keyframe is not None:
+        yield keyframe
+    
+    end_time = time.time()
+    print(f"Kruskal's Algorithm completed in {end_time - start_time:.2f} seconds")
+    print(f"Edges processed: {edges_processed}")
+    print(f"MST edges: {len(mst_rows)}, Total weight: {total_weight:.2f}")
+    print("="*50 + "\n")
+    
+    return {
+        'mst_edges': edges.take(order[np.array(mst_rows, dtype=np.int64)]),
+        'total_weight': total_weight
+    }
+
+def filter_kruskal_steps(edges, base_size=FILTER_KRUSKAL_BASE_SIZE, keyframe_interval=0):
+    """Filter-Kruskal: partition around a pivot weight, solve the light half first, then drop heavy edges that already close a cycle before sorting them; yields steps (accepted steps and keyframes only with a keyframe_interval), returns the MST"""
+    print("Starting Kruskal's Algorithm (filter engine)...")
+    start_time = time.time()
+    
+    node_index = edges.node_index()
+    num_nodes = len(node_index)
+    dense_sources = node_index.sources
+    dense_targets = node_index.targets
+    edge_ids = edges.ids
+    edge_weights = edges.weights
+    
+    uf = DenseUnionFind(num_nodes)
+    find = uf.find
+    mst_rows = []
+    total_weight = 0
+    edges_processed = 0
+    keyframes = KeyframeCounter(keyframe_interval)
+    edges_filtered = 0
+    
+    # Segments of rows still to process, lightest on top; only the first one is unfiltered
+    segments = [np.arange(len(edges), dtype=np.int64)]
+    first = True
+    while segments and len(mst_rows) < num_nodes - 1:
+        rows = segments.pop()
+        if not first:
+            # Filter: edges inside one component can never join the MST
+            roots = uf.roots()
+            keep = roots[dense_sources[rows]] != roots[dense_targets[rows]]
+            edges_filtered += len(rows) - int(keep.sum())
+            rows = rows[keep]
+        first = False
+        
+        weights = edge_weights[rows]
+        if len(rows) > base_size:
+            # Partition around the median of a sample of the weights
+            sample = weights[::max(1, len(weights) // 64)]
+            pivot = np.median(sample)
+            light = weights <= pivot
+            if light.all():
+                light = weights < pivot
+            if light.any():
+                segments.append(rows[~light])
+                segments.append(rows[light])
+                first = True
+                continue
+        
+        # Base case: sort this segment by weight, ties by edge id, and run Kruskal over it
+        rows = rows[np.lexsort((edge_ids[rows], weights))]
+        sources = dense_sources[rows].tolist()
+        targets = dense_targets[rows].tolist()
+        ids = edge_ids[rows].tolist()
+        weights = edge_weights[rows].tolist()
+        rows = rows.tolist()
+        
+        for i in range(len(rows)):
+            if len(mst_rows) >= num_nodes - 1:
+                break
+            edge_id = ids[i]
+            weight = weights[i]
+            edges_processed += 1
+            
+            if not keyframe_interval:
+                yield {
+                    'edge_id': edge_id,
+                    'weight': weight,
+                    'status': 'checking',
+                    'total_weight': total_weight
+                }
+            
+            root_u = find(sources[i])
+            root_v = find(targets[i])
+            if root_u != root_v:
+                uf.union(root_u, root_v)
+                mst_rows.append(rows[i])
+                total_weight += weight
+                yield {
+                    'edge_id': edge_id,
+                    'weight': weight,
+                    'status': 'accepted',
+                    'total_weight': total_weight
+                }
+                keyframe = keyframes.accepted(total_weight)
+            elif not keyframe_interval:
+                yield {
+                    'edge_id': edge_id,
+                    'weight': weight,
+                    'status': 'rejected',
+                    'total_weight': total_weight
+                }
+                continue
+            else:
+                keyframe = keyframes.rejected(total_weight)
+            
+            if keyframe is not None:
+                yield keyframe
+    
+    keyframe = keyframes.flush(total_weight)
+    if keyframe is not None:
+        yield keyframe
+    
+    end_time = time.time()
+    print(f"Kruskal's Algorithm completed in {end_time - start_time:.2f} seconds")
+    print(f"Edges processed: {edges_processed}, filtered without sorting: {edges_filtered}")
+    print(f"MST edges: {len(mst_rows)}, Total weight: {total_weight:.2f}")
+    print("="*50 + "\n")
+    
+    return {
+        'mst_edges': edges.take(np.array(mst_rows, dtype=np.int64)),
+        'total_weight': total_weight
+    }
+
+# Kruskal step generators selectable with /run_kruskal/<dataset>?engine=<name>
+KRUSKAL_ENGINES = {
+    'heap': kruskal_steps,
+    'fast': fast_kruskal_steps,
+    'filter': filter_kruskal_steps
+}
+
+def prim_steps(edges, keyframe_interval=0):
+    """Implementation of Prim's algorithm with step tracking for visualization; yields steps (accepted steps and keyframes only with a keyframe_interval), returns the MST"""
+    print("Starting Prim's Algorithm...")
+    start_time = time.time()
+    
+    # Work on dense node indices with the table's cached CSR adjacency
+    node_index = edges.node_index()
+    num_nodes = len(node_index)
+    row_index = edges.row_index()
+    adjacency = edges.adjacency()
+    offsets = adjacency.offsets.tolist()
+    neighbors = adjacency.neighbors.tolist()
+    adjacency_weights = adjacency.weights.tolist()
+    adjacency_ids = adjacency.edge_ids.tolist()
+    
+    visited = [False] * num_nodes
+    min_heap = []
+    mst_rows = []
+    total_weight = 0
+    edges_processed = 0
+    keyframes = KeyframeCounter(keyframe_interval)
+    
+    # Start from the first node in the graph
+    start_node = int(node_index.sources[0])
+    visited[start_node] = True
+    
+    # Add edges from the starting node to the heap
+    for slot in range(offsets[start_node], offsets[start_node + 1]):
+        heapq.heappush(min_heap, (adjacency_weights[slot], adjacency_ids[slot], start_node, neighbors[slot]))
+    
+    # Run Prim's algorithm
+    while min_heap and len(mst_rows) < num_nodes - 1:
+        weight, edge_id, u, v = heapq.heappop(min_heap)
+        edges_processed += 1
+        
+        # Record checking step
+        if not keyframe_interval:
+            yield {
+                'edge_id': edge_id,
+                'weight': weight,
+                'status': 'checking',
+                'total_weight': total_weight
+            }
+        
+        if visited[v]:
+            # If target node is already visited, skip this edge
+            if not keyframe_interval:
+                yield {
+                    'edge_id': edge_id,
+                    'weight': weight,
+                    'status': 'rejected',
+                    'total_weight': total_weight
+                }
+                continue
+            keyframe = keyframes.rejected(total_weight)
+            if keyframe is not None:
+                yield keyframe
+            continue
+        
+        # Accept this edge
+        visited[v] = True
+        
+        # Look up the row of the edge for the MST result
+        mst_rows.append(int(row_index[edge_id]))
+        total_weight += weight
+        
+        yield {
+            'edge_id': edge_id,
+            'weight': weight,
+            'status': 'accepted',
+            'total_weight': total_weight
+        }
+        keyframe = keyframes.accepted(total_weight)
+        if keyframe is not None:
+            yield keyframe
+        
+        # Add all edges from the newly added node
+        for slot in range(offsets[v], offsets[v + 1]):
+            v_to = neighbors[slot]
+            if not visited[v_to]:
+                heapq.heappush(min_heap, (adjacency_weights[slot], adjacency_ids[slot], v, v_to))
+    
+    keyframe = keyframes.flush(total_weight)
+    if keyframe is not None:
+        yield keyframe
+    
+    end_time = time.time()
+    print(f"Prim's Algorithm completed in {end_time - start_time:.2f} seconds")
+    print(f"Edges processed: {edges_processed}")
+    print(f"MST edges: {len(mst_rows)}, Total weight: {total_weight:.2f}")
+    print("="*50 + "\n")
+    
+    return {
+        'mst_edges': edges.take(np.array(mst_rows, dtype=np.int64)),
+        'total_weight': total_weight
+    }
+
+def prim_mst_with_steps(edges):
+    """Run Prim's algorithm and return the MST with its full step list"""
+    return collect_steps(prim_steps(edges))
+
+def indexed_prim_steps(edges, keyframe_interval=0):
+    """Prim's algorithm over a CSR adjacency with an indexed d-ary heap (heap size stays O(V)); yields steps (accepted steps and keyframes only with a keyframe_interval), returns the MST"""
+    print("Starting Prim's Algorithm (indexed heap engine)...")
+    start_time = time.time()
+    
+    node_index = edges.node_index()
+    num_nodes = len(node_index)
+    adjacency = edges.adjacency()
+    offsets = adjacency.offsets.tolist()
+    neighbors = adjacency.neighbors.tolist()
+    weights = adjacency.weights.tolist()
+    edge_ids = adjacency.edge_ids.tolist()
+    rows = adjacency.rows.tolist()
+    
+    heap = IndexedDaryHeap(num_nodes)
+    in_tree = [False] * num_nodes
+    best_slot = [-1] * num_nodes  # CSR slot of each fringe vertex's cheapest known edge
+    mst_rows = []
+    total_weight = 0
+    edges_processed = 0
+    keyframes = KeyframeCounter(keyframe_interval)
+    
+    def scan(u):
+        """Relax every edge from a new tree vertex to the fringe"""
+        nonlocal edges_processed
+        for slot in range(offsets[u], offsets[u + 1]):
+            v = neighbors[slot]
+            if in_tree[v]:
+                continue
+            weight = weights[slot]
+            edge_id = edge_ids[slot]
+            edges_processed += 1
+            
+            if not keyframe_interval:
+                yield {
+                    'edge_id': edge_id,
+                    'weight': weight,
+                    'status': 'checking',
+                    'total_weight': total_weight
+                }
+            
+            previous = best_slot[v]
+            if heap.push_or_decrease(v, (weight, edge_id)):
+                best_slot[v] = slot
+                rejected = previous
+            else:
+                rejected = slot
+            
+            # The superseded or non-improving edge can never enter the MST
+            if rejected < 0:
+                continue
+            if not keyframe_interval:
+                yield {
+                    'edge_id': edge_ids[rejected],
+                    'weight': weights[rejected],
+                    'status': 'rejected',
+                    'total_weight': total_weight
+                }
+                continue
+            keyframe = keyframes.rejected(total_weight)
+            if keyframe is not None:
+                yield keyframe
+    
+    # Start from the first node in the graph
+    if num_nodes:
+        start_node = int(node_index.sources[0])
+        in_tree[start_node] = True
+        yield from scan(start_node)
+    
+    while len(heap) and len(mst_rows) < num_nodes - 1:
+        v, (weight, edge_id) = heap.pop()
+        in_tree[v] = True
+        mst_rows.append(rows[best_slot[v]])
+        total_weight += weight
+        
+        yield {
+            'edge_id': edge_id,
+            'weight': weight,
+            'status': 'accepted',
+            'total_weight': total_weight
+        }
+        keyframe = keyframes.accepted(total_weight)
+        if keyframe is not None:
+            yield keyframe
+        yield from scan(v)
+    
+    keyframe = keyframes.flush(total_weight)
+    if keyframe is not None:
+        yield keyframe
+    
+    end_time = time.time()
+    print(f"Prim's Algorithm completed in {end_time - start_time:.2f} seconds")
+    print(f"Edges processed: {edges_processed}")
+    print(f"MST edges: {len(mst_rows)}, Total weight: {total_weight:.2f}")
+    print("="*50 + "\n")
+    
+    return {
+        'mst_edges': edges.take(np.array(mst_rows, dtype=np.int64)),
+        'total_weight': total_weight
+    }
+
+# Prim's step generators selectable with /run_prims/<dataset>?engine=<name>
+PRIM_ENGINES = {
+    'heap': prim_steps,
+    'indexed': indexed_prim_steps
+}
+
+def boruvka_steps(edges, workers=1):
+    """Boruvka's algorithm over the table's dense node index; yields each round's accepted edges, returns the MST"""
+    print(f"Starting Boruvka's Algorithm ({workers} workers)...")
+    start_time = time.time()
+    
+    node_index = edges.node_index()
+    ids = edges.ids.tolist()
+    weights = edges.weights.tolist()
+    
+    mst_rows = []
+    total_weight = 0
+    rounds = 0
+    
+    for added in boruvka_rounds(node_index.sources, node_index.targets, edges.weights,
+                                len(node_index), workers=workers):
+        rounds += 1
+        # Within a round the picks are independent, so show them lightest first
+        for row in sorted(added.tolist(), key=lambda row: (weights[row], ids[row])):
+            yield {
+                'edge_id': ids[row],
+                'weight': weights[row],
+                'status': 'checking',
+                'total_weight': total_weight
+            }
+            mst_rows.append(row)
+            total_weight += weights[row]
+            yield {
+                'edge_id': ids[row],
+                'weight': weights[row],
+                'status': 'accepted',
+                'total_weight': total_weight
+            }
+    
+    end_time = time.time()
+    print(f"Boruvka's Algorithm completed in {end_time - start_time:.2f} seconds")
+    print(f"Rounds: {rounds}")
+    print(f"MST edges: {len(mst_rows)}, Total weight: {total_weight:.2f}")
+    print("="*50 + "\n")
+    
+    return {
+        'mst_edges': edges.take(np.array(mst_rows, dtype=np.int64)),
+        'total_weight': total_weight
+    }
+
+def boruvka_mst_with_steps(edges, workers=1):
+    """Run Boruvka's algorithm and return the MST with its full step list"""
+    return collect_steps(boruvka_steps(edges, workers))
+
+def full_kruskal_mst(edges):
+    """Exact Kruskal MST of a whole table in one pass over its cached weight order, without steps"""
+    start_time = time.time()
+    node_index = edges.node_index()
+    num_nodes = len(node_index)
+    order = edges.weight_order()
+    
+    uf = DenseUnionFind(num_nodes)
+    find = uf.find
+    sources = node_index.sources[order].tolist()
+    targets = node_index.targets[order].tolist()
+    weights = edges.weights[order].tolist()
+    accepted = []
+    total_weight = 0
+    
+    for i in range(len(order)):
+        root_u = find(sources[i])
+        root_v = find(targets[i])
+        if root_u != root_v:
+            uf.union(root_u, root_v)
+            accepted.append(i)
+            total_weight += weights[i]
+            if len(accepted) == num_nodes - 1:
+                break
+    
+    print(f"Full-dataset Kruskal: {len(accepted)} MST edges over {len(edges)} edges in {time.time() - start_time:.2f} seconds")
+    return {
+        'mst_edges': edges.take(order[np.array(accepted, dtype=np.int64)]),
+        'total_weight': total_weight
+    }
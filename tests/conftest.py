@@ -0,0 +1,54 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from algorithm.generator import road_network  # noqa: E402
+from edge_table import EdgeTable  # noqa: E402
+from result_store import MSTResultStore  # noqa: E402
+
+
+def network_table(num_nodes, seed=0, kind='grid'):
+    """Seeded synthetic road network as an EdgeTable whose edge ids are its rows"""
+    sources, targets, weights, _ = road_network(num_nodes, seed, kind)
+    return EdgeTable(np.arange(len(weights)), sources, targets, weights)
+
+
+@pytest.fixture
+def grid_edges():
+    return network_table(300, seed=1)
+
+
+@pytest.fixture
+def tied_edges():
+    """Connected network whose integer weights tie constantly, to check tie-breaking"""
+    edges = network_table(300, seed=2)
+    return EdgeTable(edges.ids, edges.sources, edges.targets, np.ceil(edges.weights * 3))
+
+
+@pytest.fixture
+def result_store(tmp_path, monkeypatch):
+    """A throwaway MST result store installed as the app's store"""
+    store = MSTResultStore(app_module.VISUALIZATION_EDGE_LIMIT, app_module.DATASET_PARSER_VERSION,
+                           str(tmp_path / 'mst_results.sqlite'))
+    monkeypatch.setattr(app_module, 'mst_store', store)
+    return store
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch, result_store):
+    """Name of a small text dataset registered with the app for the duration of a test"""
+    path = tmp_path / 'tiny.txt'
+    app_module.write_text_dataset(network_table(400, seed=3), str(path))
+    monkeypatch.setitem(app_module.DATASETS, 'tiny', str(path))
+    monkeypatch.setattr(app_module, 'dynamic_msts', {})
+    return 'tiny'
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
@@ -0,0 +1,112 @@
+import os
+import struct
+
+import numpy as np
+import pytest
+
+import app
+
+
+@pytest.fixture
+def text_dataset(tmp_path, grid_edges):
+    path = str(tmp_path / 'roads.txt')
+    app.write_text_dataset(grid_edges, path)
+    return path
+
+
+def make_binary_older(binary_path, text_path):
+    stat = os.stat(text_path)
+    os.utime(binary_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+
+
+@pytest.mark.parametrize('sort_by_weight', [False, True])
+def test_sidecar_round_trip(text_dataset, sort_by_weight):
+    graph = app.parse_graph_file(text_dataset)
+    binary_path = app.binary_path_for(text_dataset)
+    app.write_binary_dataset(graph, binary_path, sort_by_weight=sort_by_weight)
+
+    assert app.resolve_dataset_file(text_dataset) == binary_path
+    loaded = app.load_graph_file(text_dataset)
+    assert loaded['total_lines'] == graph['total_lines']
+    assert loaded['sorted_by_weight'] == sort_by_weight
+
+    edges, original = loaded['edges'], graph['edges']
+    order = np.argsort(edges.ids, kind='stable')
+    for column in ('ids', 'sources', 'targets', 'weights'):
+        assert np.array_equal(getattr(edges, column)[order], getattr(original, column))
+    if sort_by_weight:
+        assert np.all(np.diff(edges.weights) >= 0)
+        assert np.array_equal(edges.weight_order(), np.arange(len(edges)))
+    assert app.full_kruskal_mst(edges)['total_weight'] == pytest.approx(
+        app.full_kruskal_mst(original)['total_weight'])
+
+
+def test_stale_or_outdated_sidecars_fall_back_to_the_text_file(text_dataset):
+    graph = app.parse_graph_file(text_dataset)
+    binary_path = app.binary_path_for(text_dataset)
+    app.write_binary_dataset(graph, binary_path)
+
+    make_binary_older(binary_path, text_dataset)
+    assert app.resolve_dataset_file(text_dataset) == text_dataset
+
+    app.write_binary_dataset(graph, binary_path)
+    with open(binary_path, 'r+b') as f:
+        f.seek(8)
+        f.write(struct.pack('<I', app.BINARY_VERSION - 1))
+    assert app.resolve_dataset_file(text_dataset) == text_dataset
+
+
+def test_sidecar_without_text_file_is_served(tmp_path, text_dataset):
+    graph = app.parse_graph_file(text_dataset)
+    binary_only = str(tmp_path / 'only.txt')
+    app.write_binary_dataset(graph, app.binary_path_for(binary_only))
+    assert app.resolve_dataset_file(binary_only) == app.binary_path_for(binary_only)
+    assert len(app.load_graph_file(binary_only)['edges']) == len(graph['edges'])
+
+
+def test_invalid_sidecars_are_rejected(tmp_path):
+    truncated = tmp_path / 'truncated.bin'
+    truncated.write_bytes(b'RNMSTBIN')
+    with pytest.raises(ValueError, match='Truncated'):
+        app.load_binary_dataset(str(truncated))
+
+    foreign = tmp_path / 'foreign.bin'
+    foreign.write_bytes(app.BINARY_HEADER.pack(b'NOTMSTBN', app.BINARY_VERSION, 0, 0, 0))
+    with pytest.raises(ValueError, match='Unsupported'):
+        app.load_binary_dataset(str(foreign))
+
+
+def test_binary_step_encoding(grid_edges):
+    result = app.collect_steps(app.KRUSKAL_ENGINES['fast'](grid_edges))
+    body = app.encode_steps_binary(result)
+
+    count, mst_count, total_weight = app.BINARY_STEPS_HEADER.unpack_from(body)
+    assert (count, mst_count) == (len(result['steps']), len(result['mst_edges']))
+    assert total_weight == pytest.approx(result['total_weight'])
+
+    offset = app.BINARY_STEPS_HEADER.size
+    totals = np.frombuffer(body, '<f8', count, offset)
+    edge_ids = np.frombuffer(body, '<u4', count, offset + 8 * count)
+    mst_ids = np.frombuffer(body, '<u4', mst_count, offset + 12 * count)
+    statuses = np.frombuffer(body, 'u1', count, offset + 12 * count + 4 * mst_count)
+    assert len(body) == offset + 13 * count + 4 * mst_count
+    assert totals.tolist() == [step['total_weight'] for step in result['steps']]
+    assert edge_ids.tolist() == [step['edge_id'] for step in result['steps']]
+    assert mst_ids.tolist() == result['mst_edges'].ids.tolist()
+    assert statuses.tolist() == [app.STEP_STATUS_CODES[step['status']] for step in result['steps']]
+
+
+def test_result_store_round_trip(result_store, text_dataset, grid_edges):
+    result = app.collect_steps(app.PRIM_ENGINES['indexed'](grid_edges))
+    assert result_store.get(text_dataset, 'prims:indexed') is None
+    result_store.put(text_dataset, 'prims:indexed', result)
+
+    stored = result_store.get(text_dataset, 'prims:indexed')
+    assert stored['steps'] == result['steps']
+    assert stored['total_weight'] == pytest.approx(result['total_weight'])
+    assert stored['mst_edges'].ids.tolist() == result['mst_edges'].ids.tolist()
+
+    # A changed dataset file gets a new content hash, so the old result is not served
+    with open(text_dataset, 'a') as f:
+        f.write('999999 0 1 1.0\n')
+    assert result_store.get(text_dataset, 'prims:indexed') is None
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from algorithm.dynamic_mst import DynamicMST
+from edge_table import EdgeTable
+from step_engines import full_kruskal_mst
+
+
+def recomputed_weight(edges):
+    ids = list(edges)
+    table = EdgeTable(ids, [edges[i][0] for i in ids], [edges[i][1] for i in ids], [edges[i][2] for i in ids])
+    return full_kruskal_mst(table)['total_weight']
+
+
+@pytest.fixture
+def dynamic(grid_edges):
+    edges = {edge_id: (source, target, weight) for edge_id, source, target, weight in zip(
+        grid_edges.ids.tolist(), grid_edges.sources.tolist(), grid_edges.targets.tolist(),
+        grid_edges.weights.tolist())}
+    mst = DynamicMST(((edge_id,) + edge for edge_id, edge in edges.items()),
+                     full_kruskal_mst(grid_edges)['mst_edges'].ids.tolist())
+    return mst, edges
+
+
+def test_random_updates_match_recomputation(dynamic):
+    mst, edges = dynamic
+    rng = random.Random(7)
+    nodes = sorted({node for source, target, _ in edges.values() for node in (source, target)})
+
+    for _ in range(300):
+        operation = rng.random()
+        # Bias updates and deletions towards tree edges, where the forest actually changes
+        pool = mst.mst_edge_ids() if rng.random() < 0.7 else list(edges)
+        if operation < 0.3:
+            source, target, weight = rng.choice(nodes), rng.choice(nodes), rng.uniform(0, 3)
+            edges[mst.insert_edge(source, target, weight)['edge_id']] = (source, target, weight)
+        elif operation < 0.65:
+            edge_id, weight = rng.choice(pool), rng.uniform(0, 3)
+            mst.update_weight(edge_id, weight)
+            edges[edge_id] = edges[edge_id][:2] + (weight,)
+        else:
+            edge_id = rng.choice(pool)
+            mst.delete_edge(edge_id)
+            del edges[edge_id]
+        assert mst.total_weight == pytest.approx(recomputed_weight(edges))
+
+
+def test_changes_report_the_swapped_edges(dynamic):
+    mst, edges = dynamic
+    heaviest = max(mst.mst_edge_ids(), key=lambda edge_id: edges[edge_id][2])
+    source, target, weight = edges[heaviest]
+
+    # A parallel road just lighter than the heaviest tree edge replaces it
+    changes = mst.insert_edge(source, target, weight / 2)
+    assert changes['added'] == [changes['edge_id']]
+    assert changes['removed'] == [heaviest]
+
+    # Deleting the replacement brings the original road back
+    changes = mst.delete_edge(changes['edge_id'])
+    assert changes['added'] == [heaviest]
+
+
+def test_invalid_operations_raise(dynamic):
+    mst, edges = dynamic
+    with pytest.raises(ValueError):
+        mst.update_weight(max(edges) + 1, 1.0)
+    with pytest.raises(ValueError):
+        mst.delete_edge(max(edges) + 1)
+    with pytest.raises(ValueError):
+        mst.insert_edge(0, 1, 1.0, edge_id=min(edges))
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+import algorithm.boruvka as boruvka
+from algorithm.kruskal import kruskal_mst_with_steps
+from algorithm.prims import prim_mst_with_steps as algorithm_prim_mst_with_steps
+from edge_table import EdgeTable
+from step_engines import (
+    KRUSKAL_ENGINES, PRIM_ENGINES, boruvka_steps, collect_steps, full_kruskal_mst, prim_mst_with_steps
+)
+
+STEP_ENGINES = ([(f'kruskal:{name}', engine) for name, engine in KRUSKAL_ENGINES.items()] +
+                [(f'prims:{name}', engine) for name, engine in PRIM_ENGINES.items()] +
+                [('boruvka', boruvka_steps)])
+
+
+def assert_spanning_tree(edges, result, expected_weight):
+    mst_edges = result['mst_edges']
+    assert len(mst_edges) == len(edges.node_index()) - 1
+    assert result['total_weight'] == pytest.approx(expected_weight)
+    assert float(np.sum(mst_edges.weights)) == pytest.approx(expected_weight)
+
+
+@pytest.mark.parametrize('name, engine', STEP_ENGINES, ids=[name for name, _ in STEP_ENGINES])
+@pytest.mark.parametrize('edges_fixture', ['grid_edges', 'tied_edges'])
+def test_step_engines_agree_with_full_kruskal(name, engine, edges_fixture, request):
+    edges = request.getfixturevalue(edges_fixture)
+    expected = full_kruskal_mst(edges)['total_weight']
+    assert_spanning_tree(edges, collect_steps(engine(edges)), expected)
+
+
+def test_step_list_modules_agree_with_full_kruskal(grid_edges):
+    expected = full_kruskal_mst(grid_edges)['total_weight']
+    for run in (kruskal_mst_with_steps, algorithm_prim_mst_with_steps):
+        result = run(grid_edges)
+        assert len(result['mst_edges']) == len(grid_edges.node_index()) - 1
+        assert result['total_weight'] == pytest.approx(expected)
+    assert_spanning_tree(grid_edges, prim_mst_with_steps(grid_edges), expected)
+
+
+def test_kruskal_family_spans_every_component(grid_edges):
+    # Two disjoint copies of the network: the MST is a forest of two trees
+    offset = int(grid_edges.node_ids().max()) + 1
+    forest = EdgeTable.concat([grid_edges, EdgeTable(grid_edges.ids + len(grid_edges), grid_edges.sources + offset,
+                                                     grid_edges.targets + offset, grid_edges.weights)])
+    expected = 2 * full_kruskal_mst(grid_edges)['total_weight']
+    for engine in list(KRUSKAL_ENGINES.values()) + [boruvka_steps]:
+        result = collect_steps(engine(forest))
+        assert len(result['mst_edges']) == len(forest.node_index()) - 2
+        assert result['total_weight'] == pytest.approx(expected)
+
+
+def test_pooled_boruvka_matches_single_process(grid_edges, monkeypatch):
+    monkeypatch.setattr(boruvka, 'POOL_WORKERS', 2)
+    node_index = grid_edges.node_index()
+    args = (node_index.sources, node_index.targets, grid_edges.weights, len(node_index))
+    try:
+        pooled = boruvka.boruvka_mst(*args, workers=2, chunk_size=97)
+    finally:
+        boruvka.shutdown_executor()
+    assert sorted(pooled.tolist()) == sorted(boruvka.boruvka_mst(*args).tolist())
+
+
+def test_empty_tables():
+    empty = EdgeTable([], [], [], [])
+    for run in (kruskal_mst_with_steps, algorithm_prim_mst_with_steps):
+        assert run(empty) == {'steps': [], 'mst_edges': [], 'total_weight': 0}
+    assert len(full_kruskal_mst(empty)['mst_edges']) == 0
@@ -0,0 +1,43 @@
+import pytest
+
+from step_engines import KRUSKAL_ENGINES, PRIM_ENGINES, StepStream, keyframe_steps, traced_result
+
+ENGINES = ([(f'kruskal:{name}', engine) for name, engine in KRUSKAL_ENGINES.items()] +
+           [(f'prims:{name}', engine) for name, engine in PRIM_ENGINES.items()])
+ENGINE_IDS = [name for name, _ in ENGINES]
+
+
+def run(step_generator):
+    stream = StepStream(step_generator)
+    steps = list(stream)
+    return steps, stream.result
+
+
+@pytest.mark.parametrize('interval', [1, 7, 100])
+@pytest.mark.parametrize('name, engine', ENGINES, ids=ENGINE_IDS)
+def test_inline_keyframes_match_decimated_full_trace(name, engine, interval, tied_edges):
+    inline_steps, inline_result = run(engine(tied_edges, keyframe_interval=interval))
+    decimated_steps, decimated_result = run(keyframe_steps(engine(tied_edges), interval))
+    assert inline_steps == decimated_steps
+    assert inline_result['total_weight'] == decimated_result['total_weight']
+
+
+@pytest.mark.parametrize('name, engine', ENGINES, ids=ENGINE_IDS)
+def test_keyframes_account_for_every_rejection(name, engine, grid_edges):
+    full_steps, result = run(engine(grid_edges))
+    keyframes, _ = run(keyframe_steps(iter(full_steps), 10))
+
+    statuses = [step['status'] for step in full_steps]
+    assert sum(step['rejected'] for step in keyframes if step['status'] == 'keyframe') == statuses.count('rejected')
+    assert [step for step in keyframes if step['status'] == 'accepted'] == \
+        [step for step in full_steps if step['status'] == 'accepted']
+    assert keyframes[-1]['total_weight'] == pytest.approx(result['total_weight'])
+
+
+def test_traced_result_keeps_the_full_trace_without_an_interval(grid_edges):
+    steps, result = run(KRUSKAL_ENGINES['fast'](grid_edges))
+    result['steps'] = steps
+    assert traced_result(result, 0) is result
+    traced = traced_result(result, 5)
+    assert traced['steps'] == list(keyframe_steps(steps, 5))
+    assert result['steps'] is steps
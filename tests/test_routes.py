@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+
+BAD_GETS = [
+    ('/run_kruskal/nowhere', 'Invalid dataset'),
+    ('/stream_prims/nowhere', 'Invalid dataset'),
+    ('/run_kruskal/{dataset}?engine=bogus', 'Invalid engine: bogus'),
+    ('/stream_prims/{dataset}?engine=bogus', 'Invalid engine: bogus'),
+    ('/run_prims/{dataset}?trace=sometimes', 'Invalid trace: sometimes'),
+    ('/stream_kruskal/{dataset}?trace=keyframes&keyframe_every=0', 'Invalid keyframe_every: 0'),
+    ('/run_prims/{dataset}?trace=keyframes&keyframe_every=often', 'Invalid keyframe_every: often'),
+    ('/run_boruvka/{dataset}?workers=0', 'Invalid workers: 0'),
+    ('/stream_boruvka/{dataset}?workers=many', 'Invalid workers: many'),
+    ('/run_kruskal/{dataset}?mode=external&memory_mb=nan', 'Invalid memory_mb: nan'),
+    ('/run_kruskal/{dataset}?mode=external&memory_mb=-1', 'Invalid memory_mb: -1'),
+    ('/run_kruskal/{dataset}?mode=external&memory_mb=0.0001', 'Memory budget'),
+    ('/tiles/{dataset}?max_nodes=0', 'Invalid max_nodes: 0'),
+    ('/tiles/{dataset}?level=-1', 'Invalid level: -1'),
+    ('/tiles/{dataset}?x0=nan', 'Viewport bounds must be finite numbers'),
+    ('/tiles/generated', 'Invalid dataset'),
+    ('/run_kruskal/generated?size=1', 'size must be between'),
+    ('/run_prims/generated?size=10&kind=maze', 'Invalid kind: maze'),
+    ('/get_graph_data/generated?seed=-1', 'Invalid seed: -1'),
+]
+
+BAD_POSTS = [
+    ('/mst/{dataset}/insert_edge', {'source': 0, 'target': 1, 'distance': 'nan'}, 'Invalid distance: nan'),
+    ('/mst/{dataset}/insert_edge', {'source': 0, 'target': 1, 'distance': 'inf'}, 'Invalid distance: inf'),
+    ('/mst/{dataset}/insert_edge', {'source': 0, 'target': 1}, "Missing field: 'distance'"),
+    ('/mst/{dataset}/update_weight', {'id': 0, 'distance': '-Infinity'}, 'Invalid distance: -Infinity'),
+    ('/mst/{dataset}/update_weight', {'id': 10 ** 9, 'distance': 1.0}, 'Unknown edge'),
+    ('/mst/{dataset}/delete_edge', {'id': 10 ** 9}, 'Unknown edge'),
+    ('/mst/generated/delete_edge', {'id': 0}, 'Invalid dataset'),
+    ('/jobs', {'dataset': '{dataset}', 'algorithm': 'kruskal:bogus'}, 'Invalid algorithm: kruskal:bogus'),
+    ('/jobs', {'dataset': 'nowhere'}, 'Invalid dataset'),
+]
+
+
+@pytest.mark.parametrize('url, message', BAD_GETS)
+def test_invalid_requests_are_rejected(client, dataset, url, message):
+    response = client.get(url.format(dataset=dataset))
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
+
+
+@pytest.mark.parametrize('url, payload, message', BAD_POSTS)
+def test_invalid_updates_are_rejected(client, dataset, url, payload, message):
+    payload = {key: value.format(dataset=dataset) if key == 'dataset' else value for key, value in payload.items()}
+    response = client.post(url.format(dataset=dataset), json=payload)
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
+
+
+def test_algorithms_agree_over_http(client, dataset):
+    weights = [client.get(f'/run_{route}/{dataset}').get_json()['total_weight']
+               for route in ('kruskal', 'prims', 'boruvka')]
+    weights.append(client.get(f'/run_kruskal/{dataset}?mode=external').get_json()['total_weight'])
+    assert weights == pytest.approx([weights[0]] * len(weights))
+    assert client.get(f'/mst/{dataset}').get_json()['total_weight'] == pytest.approx(weights[0])
+
+
+def test_graph_data_has_a_layout(client, dataset):
+    data = client.get(f'/get_graph_data/{dataset}').get_json()
+    assert data['nodes'] and all('x' in node and 'y' in node for node in data['nodes'])
+    generated = client.get('/get_graph_data/generated?seed=3').get_json()
+    assert all('x' in node and 'y' in node for node in generated['nodes'])
+
+
+def asgi_get(asgi, path, query=b''):
+    """Status and body of one request through the ASGI application"""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'raw_path': path.encode(), 'query_string': query,
+             'headers': [], 'root_path': '', 'scheme': 'http', 'http_version': '1.1',
+             'server': ('testserver', 80), 'client': ('testclient', 1)}
+    asyncio.run(asgi.application(scope, receive, send))
+    status = next(message['status'] for message in messages if message['type'] == 'http.response.start')
+    return status, b''.join(message.get('body', b'') for message in messages
+                            if message['type'] == 'http.response.body')
+
+
+@pytest.mark.parametrize('path, query', [
+    ('/run_kruskal/{dataset}', b'trace=keyframes&keyframe_every=0'),
+    ('/stream_prims/{dataset}', b'trace=sometimes'),
+    ('/run_boruvka/{dataset}', b'workers=0'),
+    ('/run_kruskal/{dataset}', b'trace=keyframes&keyframe_every=5'),
+    ('/stream_kruskal/{dataset}', b''),
+])
+def test_asgi_matches_flask(client, dataset, path, query):
+    asgi = pytest.importorskip('asgi')
+    path = path.format(dataset=dataset)
+    response = client.get(f"{path}?{query.decode()}")
+    assert asgi_get(asgi, path, query) == (response.status_code, response.data)
@@ -0,0 +1,57 @@
+"""
+Precompute MST results into the persistent result store.
+
+/run_kruskal, /run_prims and /run_boruvka (and their /stream_ variants)
+serve results from database/mst_results.sqlite when the dataset file's
+content hash matches, so warming the store once makes first requests fast
+even right after a restart:
+
+    python warm_mst_store.py                          # every dataset and algorithm
+    python warm_mst_store.py oldenburg                # selected datasets
+    python warm_mst_store.py --algorithm kruskal:heap # selected algorithms
+    python warm_mst_store.py --force                  # recompute stored results
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+from app import DATASETS, MST_ALGORITHMS, compute_mst_result, mst_store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Populate the persistent MST result store")
+    parser.add_argument('datasets', nargs='*', help="dataset keys from DATASETS (default: all present)")
+    parser.add_argument('--algorithm', action='append', choices=MST_ALGORITHMS,
+                        help="algorithm key to compute (repeatable; default: all)")
+    parser.add_argument('--force', action='store_true', help="recompute results that are already stored")
+    args = parser.parse_args(argv)
+
+    keys = args.datasets or [key for key in DATASETS if key != 'generated']
+    algorithms = args.algorithm or MST_ALGORITHMS
+    for key in keys:
+        if key not in DATASETS or key == 'generated':
+            print(f"Unknown dataset: {key}")
+            return 1
+        dataset_path = DATASETS[key]
+        if not os.path.exists(dataset_path):
+            print(f"Skipping {key}: {dataset_path} not found")
+            continue
+
+        for algorithm in algorithms:
+            if not args.force and mst_store.get(dataset_path, algorithm) is not None:
+                print(f"{key} {algorithm}: already stored")
+                continue
+            start_time = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = compute_mst_result(dataset_path, algorithm)
+            mst_store.put(dataset_path, algorithm, result)
+            print(f"{key} {algorithm}: total weight {result['total_weight']:.2f}, "
+                  f"{len(result['steps'])} steps ({time.time() - start_time:.2f} seconds)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())